@@ -0,0 +1,882 @@
+import threading
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from zoom_client import ZoomClient, ZoomAPIError
+from metrics import Metrics
+from rate_limiter import BACKGROUND, RateLimitScheduler, request_priority, with_priority
+from user_cache import UserIDCache
+
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_BATCH_SIZE = 30
+
+# "threads" runs requests on a worker pool, "asyncio" on one event loop (needs aiohttp)
+ENGINES = ("threads", "asyncio")
+DEFAULT_ENGINE = "threads"
+# Requests allowed in flight at once by the asyncio engine
+DEFAULT_ASYNC_CONCURRENCY = 100
+# Seconds a prefetched user directory is used before it is paged again
+DEFAULT_DIRECTORY_TTL = 3600
+
+# Errors that depend on the request body; a failing batch is split to find the bad emails.
+# Not 404: that means the owner does not exist, which no split of the batch can fix.
+BISECT_STATUSES = (400, 409, 422)
+
+# status is "added", "present" (already an assistant, nothing written),
+# "planned" (dry run) or "failed"; sync adds "removed", "planned_removal",
+# "remove_failed" and "not_found" (the owner does not exist). attempts counts the write requests that carried the
+# pair (bisection sends it again) and latency is the last one's duration.
+PairResult = namedtuple("PairResult", ["owner_email", "assistant_email", "success", "error", "status",
+                                       "attempts", "latency"], defaults=(0, None))
+
+PAIR_MESSAGES = {
+    "added": "✓ Successfully added {assistant} as assistant to {owner}",
+    "present": "= {assistant} is already an assistant of {owner}",
+    "planned": "→ Would add {assistant} as assistant to {owner}",
+    "failed": "✗ Failed to add {assistant} as assistant to {owner}: {error}",
+    "removed": "✓ Removed {assistant} as assistant of {owner}",
+    "planned_removal": "→ Would remove {assistant} as assistant of {owner}",
+    "remove_failed": "✗ Failed to remove {assistant} as assistant of {owner}: {error}",
+    "not_found": "✗ {owner} not found; {assistant} not synced",
+}
+
+SUMMARY_LABELS = (("added", "added"), ("removed", "removed"), ("present", "already present"),
+                  ("planned", "planned"), ("planned_removal", "planned removals"),
+                  ("failed", "failed"), ("remove_failed", "failed removals"), ("not_found", "not found"))
+
+FAILED_STATUSES = ("failed", "remove_failed", "not_found")
+
+# One assistant of one owner in an inventory report. An owner with no
+# assistants gets a row without one; an owner that could not be read, a row
+# with the error.
+InventoryRow = namedtuple("InventoryRow", ["owner_email", "assistant_email", "assistant_id", "error"])
+# Most frequent assistants listed in an inventory summary
+INVENTORY_TOP_ASSISTANTS = 5
+
+
+def pair_result(owner_email, assistant_email, status, error=None, trace=None):
+    """PairResult; trace is the email's [attempts, latency] from add_assistants_batch"""
+    attempts, latency = trace or (0, None)
+    return PairResult(owner_email, assistant_email, status not in FAILED_STATUSES, error, status,
+                      attempts, latency)
+
+
+def trace_batch(trace, emails, started):
+    """Count one write request for each email and note how long it took"""
+    if trace is None:
+        return
+    elapsed = time.monotonic() - started
+    for email in emails:
+        entry = trace.setdefault(email, [0, None])
+        entry[0] += 1
+        entry[1] = elapsed
+
+
+def batch_outcome(emails, error, trace, started):
+    """Trace a write of emails that raised error (None on success)
+
+    Returns {email: error message or None}, or None when the batch should be
+    split and retried.
+    """
+    trace_batch(trace, emails, started)
+    if error is None:
+        return {email: None for email in emails}
+    if isinstance(error, ZoomAPIError) and len(emails) > 1 and error.status_code in BISECT_STATUSES:
+        return None
+    return {email: str(error) for email in emails}
+
+
+def describe_pair(result):
+    """Log line for a PairResult"""
+    return PAIR_MESSAGES[result.status].format(
+        owner=result.owner_email, assistant=result.assistant_email, error=result.error)
+
+
+def summarize(results):
+    """Summary line counts per status, e.g. 3 added, 2 already present, 0 failed"""
+    counts = {status: 0 for status, _ in SUMMARY_LABELS}
+    for result in results:
+        counts[result.status] += 1
+    return ", ".join(f"{counts[status]} {label}" for status, label in SUMMARY_LABELS
+                     if counts[status] or status in ("added", "failed"))
+
+
+class InventorySummary:
+    """Totals of an inventory report, updated as each owner's rows arrive"""
+
+    def __init__(self):
+        self.owners = 0
+        self.with_assistants = 0
+        self.without_assistants = 0
+        self.not_found = 0
+        self.failed = 0
+        self.assistants = 0
+        # Owners per assistant; grows with the number of distinct assistants only
+        self.delegations = Counter()
+        self.started = time.monotonic()
+        self.seconds = 0.0
+
+    def add(self, rows, not_found=False):
+        self.owners += 1
+        self.seconds = time.monotonic() - self.started
+        if rows and rows[0].error:
+            if not_found:
+                self.not_found += 1
+            else:
+                self.failed += 1
+            return
+        found = [row.assistant_email for row in rows if row.assistant_email]
+        if found:
+            self.with_assistants += 1
+        else:
+            self.without_assistants += 1
+        self.assistants += len(found)
+        self.delegations.update(email.lower() for email in found)
+
+    def as_dict(self):
+        return {
+            "owners": self.owners,
+            "with_assistants": self.with_assistants,
+            "without_assistants": self.without_assistants,
+            "not_found": self.not_found,
+            "failed": self.failed,
+            "assistants": self.assistants,
+            "distinct_assistants": len(self.delegations),
+            "top_assistants": dict(self.delegations.most_common(INVENTORY_TOP_ASSISTANTS)),
+            "seconds": round(self.seconds, 3),
+        }
+
+    def __str__(self):
+        text = (f"{self.owners} owners in {self.seconds:.1f}s: {self.assistants} assistants "
+                f"({len(self.delegations)} distinct), {self.without_assistants} owners without assistants")
+        if self.not_found or self.failed:
+            text += f", {self.not_found} not found, {self.failed} failed"
+        return text
+
+
+def inventory_rows(owner_email, assistants):
+    """InventoryRows for an owner's assistant list"""
+    rows = [InventoryRow(owner_email, a.get("email", ""), a.get("id", ""), None) for a in assistants]
+    return rows or [InventoryRow(owner_email, "", "", None)]
+
+
+class OrderedLog:
+    """Emits log lines slot by slot, in slot order, as soon as earlier slots are filled
+
+    Workers finish in any order; this keeps the log identical to a
+    sequential run while still showing results as they become available.
+    """
+
+    def __init__(self, log, size):
+        self.log = log
+        self._slots = [None] * size
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def set(self, index, lines):
+        with self._lock:
+            self._slots[index] = list(lines)
+            while self._next < len(self._slots) and self._slots[self._next] is not None:
+                for line in self._slots[self._next]:
+                    self.log(line)
+                self._slots[self._next] = ()
+                self._next += 1
+
+
+def chunks(items, size):
+    """items split into lists of at most size"""
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+class RunPlan:
+    """Log slots, results and Step 1 batching of one run(), shared by both engines
+
+    The engines only send the lookups and writes; they report each outcome
+    here from worker threads or coroutines. Log slots: validation warnings,
+    Step 1 header, Step 1 pairs, Step 2 header, Step 2 pairs.
+    """
+
+    def __init__(self, engine, target_email, count, dry_run, journal, target_existing):
+        self.engine = engine
+        self.target_email = target_email
+        self.count = count
+        self.dry_run = dry_run
+        self.journal = journal
+        self.target_existing = target_existing
+        self.step1_header = count
+        self.step2_header = 2 * count + 1
+        self.report = OrderedLog(engine.log, 3 * count + 2)
+        self.results = [None] * (2 * count)
+        self.remaining = count
+        self.valid = 0
+        # (index, email) pairs resolved but not yet sent in a Step 1 batch
+        self.step1_pending = []
+        self._lock = threading.Lock()
+
+    def record(self, slot, result_index, owner_email, assistant_email, status, error=None, trace=None):
+        result = pair_result(owner_email, assistant_email, status, error, trace)
+        self.results[result_index] = result
+        self.engine.emit_result(result)
+        if self.journal is not None:
+            self.journal.record(result)
+        self.report.set(slot, [describe_pair(result)])
+
+    def step1_done(self, batch, outcome, trace):
+        """Record a Step 1 batch given its {email: error} outcome"""
+        for index, email in batch:
+            error = outcome[email]
+            status = "failed" if error else "planned" if self.dry_run else "added"
+            self.record(self.step1_header + 1 + index, index, self.target_email, email, status, error,
+                        trace.get(email))
+
+    def step2_done(self, index, email, status, error=None, trace=None):
+        self.record(self.step2_header + 1 + index, self.count + index, email, self.target_email, status, error,
+                    trace.get(self.target_email) if trace else None)
+
+    def resolved(self, index, email, user_id, error):
+        """Record an assistant's lookup; returns the Step 1 batches now ready to send"""
+        if user_id:
+            self.report.set(index, [])
+            if email.lower() in self.target_existing:
+                self.record(self.step1_header + 1 + index, index, self.target_email, email, "present")
+        else:
+            self.report.set(index, [error, f"Warning: Assistant email not found: {email}"])
+            self.engine.journal_missing(self.journal, email)
+            self.report.set(self.step1_header + 1 + index, [])
+            self.report.set(self.step2_header + 1 + index, [])
+
+        batch_size = self.engine.batch_size
+        with self._lock:
+            self.remaining -= 1
+            if user_id:
+                self.valid += 1
+                if email.lower() not in self.target_existing:
+                    self.step1_pending.append((index, email))
+            done = self.remaining == 0
+            # Send a Step 1 batch once it is full, and whatever is left at the end
+            batches = []
+            while len(self.step1_pending) >= batch_size or (done and self.step1_pending):
+                batches.append(self.step1_pending[:batch_size])
+                del self.step1_pending[:batch_size]
+        if done:
+            if self.valid:
+                self.report.set(self.step1_header, [f"Step 1: Adding assistants to {self.target_email}"])
+                self.report.set(self.step2_header,
+                                [f"Step 2: Adding {self.target_email} as assistant to other users"])
+            else:
+                self.report.set(self.step1_header, ["No valid assistant emails found"])
+                self.report.set(self.step2_header, [])
+        return batches
+
+    def pair_results(self):
+        """The PairResults in log order"""
+        return [result for result in self.results if result is not None]
+
+
+class MeshPlan:
+    """Log slots, member IDs and results of one run_mesh(), shared by both engines
+
+    Log slots: validation warnings, mesh header, one block per owner.
+    """
+
+    def __init__(self, engine, member_emails, dry_run, journal):
+        self.engine = engine
+        self.members = unique_emails(member_emails)
+        self.count = len(self.members)
+        self.dry_run = dry_run
+        self.journal = journal
+        self.report = OrderedLog(engine.log, 2 * self.count + 1)
+        self.user_ids = [None] * self.count
+        self.existing = [set()] * self.count
+        self.results = [[] for _ in range(self.count)]
+
+    def resolved(self, index, user_id, error, existing=None):
+        """Record a member's lookup and, with skip_existing, its current assistants"""
+        email = self.members[index]
+        if not user_id:
+            self.engine.journal_missing(self.journal, email)
+            return self.report.set(index, [error, f"Warning: Member email not found: {email}"])
+        self.user_ids[index] = user_id
+        if existing is not None:
+            self.existing[index] = existing
+        self.report.set(index, [])
+
+    def owners(self):
+        """Once every member is resolved: [(index, assistant emails)] of the owners to write"""
+        count = self.count
+        valid = [i for i in range(count) if self.user_ids[i]]
+        if len(valid) < 2:
+            self.report.set(count, ["Mesh needs at least two valid member emails"])
+        else:
+            self.report.set(count, [f"Mesh: {len(valid)} members, {len(valid) * (len(valid) - 1)} pairs"])
+        owners = []
+        for index in range(count):
+            if len(valid) < 2 or not self.user_ids[index]:
+                self.report.set(count + 1 + index, [])
+                continue
+            owners.append((index, [self.members[j] for j in valid if j != index]))
+        return owners
+
+    def missing(self, index, assistants):
+        """The assistants an owner does not have yet"""
+        return [email for email in assistants if email.lower() not in self.existing[index]]
+
+    def owner_done(self, index, assistants, outcome, trace):
+        """Record an owner's pairs given the {email: error} outcome of its missing ones"""
+        owner_email = self.members[index]
+        for email in assistants:
+            if email not in outcome:
+                status, error = "present", None
+            else:
+                error = outcome[email]
+                status = "failed" if error else "planned" if self.dry_run else "added"
+            result = pair_result(owner_email, email, status, error, trace.get(email))
+            self.results[index].append(result)
+            self.engine.emit_result(result)
+            if self.journal is not None:
+                self.journal.record(result)
+        self.report.set(self.count + 1 + index, [describe_pair(result) for result in self.results[index]])
+
+    def pair_results(self):
+        return [result for owner_results in self.results for result in owner_results]
+
+
+class SyncPlan:
+    """Log slots, per-owner changes and results of one sync(), shared by both engines
+
+    Log slots: the sync header, one block per owner.
+    """
+
+    def __init__(self, engine, desired, dry_run, remove):
+        self.engine = engine
+        self.desired = desired
+        self.dry_run = dry_run
+        self.remove = remove
+        self.owners = list(desired)
+        self.report = OrderedLog(engine.log, len(self.owners) + 1)
+        self.report.set(0, [f"Sync: {len(self.owners)} owners"])
+        self.changes = [None] * len(self.owners)
+        self.results = [[] for _ in self.owners]
+
+    def writes(self, index, current):
+        """Plan an owner's changes from its current assistants
+
+        Returns (batches to add, (email, id) pairs to remove, remove_all);
+        a dry run writes nothing.
+        """
+        present, to_add, to_remove = plan_sync(current, self.desired[self.owners[index]], self.remove)
+        self.changes[index] = present, to_add, to_remove
+        if self.dry_run:
+            return [], [], False
+        return chunks(to_add, self.engine.batch_size), to_remove, not present and not to_add
+
+    def owner_done(self, index, outcome):
+        """Record an owner's pairs given the {email: error} outcome of its writes"""
+        owner_email = self.owners[index]
+        self.results[index] = sync_results(owner_email, *self.changes[index], outcome, self.dry_run)
+        for result in self.results[index]:
+            self.engine.emit_result(result)
+        self.report.set(1 + index, [describe_pair(result) for result in self.results[index]])
+
+    def unresolved(self, index, error):
+        owner_email = self.owners[index]
+        status = "not_found" if owner_email.lower() in self.engine.missing else "failed"
+        self._owner_failed(index, status, error, [error, f"Warning: Owner email not found: {owner_email}"])
+
+    def unreadable(self, index, error):
+        """Record an owner whose assistants could not be read"""
+        error = f"Failed to read assistants of {self.owners[index]}: {str(error)}"
+        self._owner_failed(index, "failed", error, [error])
+
+    def _owner_failed(self, index, status, error, lines):
+        # Every listed assistant gets the owner's error, so the results show it;
+        # an owner with an empty list gets one result without an assistant
+        owner_email = self.owners[index]
+        self.results[index] = [pair_result(owner_email, email, status, error)
+                               for email in unique_emails(self.desired[owner_email]) or [""]]
+        for result in self.results[index]:
+            self.engine.emit_result(result)
+        self.report.set(1 + index, lines)
+
+    def pair_results(self):
+        return [result for owner_results in self.results for result in owner_results]
+
+
+class InventoryPlan:
+    """Owners, summary and per-owner rows of one inventory(), shared by both engines
+
+    on_rows(rows) is called with each owner's InventoryRows, one owner at a time.
+    """
+
+    def __init__(self, engine, owner_emails, on_rows=None):
+        self.engine = engine
+        self.owners = unique_emails(owner_emails)
+        self.on_rows = on_rows
+        self.summary = InventorySummary()
+        self._lock = threading.Lock()
+        engine.log(f"Inventory: {len(self.owners)} owners")
+
+    def owner_read(self, owner_email, assistants):
+        self._add(owner_email, inventory_rows(owner_email, assistants))
+
+    def unresolved(self, owner_email, error):
+        self._add(owner_email, None, error)
+
+    def unreadable(self, owner_email, error):
+        """Record an owner whose assistants could not be read"""
+        self._add(owner_email, None, f"Failed to read assistants of {owner_email}: {str(error)}")
+
+    def _add(self, owner_email, rows, error=None):
+        if error:
+            self.engine.log(error)
+            rows = [InventoryRow(owner_email, "", "", error)]
+        not_found = owner_email.lower() in self.engine.missing
+        self.engine.emit("inventory", owner=owner_email,
+                         outcome="not_found" if not_found else "failed" if error else "ok",
+                         assistants=sum(1 for row in rows if row.assistant_email), error=error)
+        with self._lock:
+            self.summary.add(rows, not_found=not_found)
+            if self.on_rows is not None:
+                self.on_rows(rows)
+
+
+class AssistantEngine:
+    """Runs user lookups and assistant writes on a bounded worker pool"""
+
+    def __init__(self, client, user_cache=None, log=print, max_workers=DEFAULT_MAX_WORKERS,
+                 batch_size=DEFAULT_BATCH_SIZE, skip_existing=True, prefetch_directory=False,
+                 directory_ttl=DEFAULT_DIRECTORY_TTL, events=None):
+        self.client = client
+        self.user_cache = user_cache
+        self.log = log
+        self.max_workers = max_workers
+        self.batch_size = max(1, batch_size)
+        # Read each owner's current assistants first and only write missing pairs
+        self.skip_existing = skip_existing
+        # Resolve emails from one paged GET /users instead of a lookup per email
+        self.prefetch_directory = prefetch_directory
+        self.directory_ttl = directory_ttl
+        self.directory = None
+        self._directory_loaded_at = 0
+        # Lowercased emails the API answered 404 for, so journals can stop retrying them
+        self.missing = set()
+        # Structured event stream (an EventLog), if enabled
+        self.events = events
+
+    def emit(self, event, **fields):
+        """Record a structured event when an event log is attached"""
+        if self.events is not None:
+            self.events.emit(event, **fields)
+
+    def emit_result(self, result):
+        self.emit("pair", owner=result.owner_email, assistant=result.assistant_email, status=result.status,
+                  error=result.error, attempts=result.attempts,
+                  latency=round(result.latency, 4) if result.latency is not None else None)
+
+    def detach(self):
+        """Release resources owned by this engine, leaving the shared client open"""
+
+    def close(self):
+        """Release the engine and close its client's connections"""
+        self.detach()
+        self.client.close()
+
+    def directory_stale(self):
+        """True when directory prefetch is on and the index is missing or expired"""
+        return self.prefetch_directory and (
+            self.directory is None or time.monotonic() - self._directory_loaded_at > self.directory_ttl)
+
+    def load_directory(self):
+        """Page through GET /users and index every active user's email -> id
+
+        Pages after the first are fetched concurrently. Emails that are not
+        in the index (pending users, other accounts) still fall back to a
+        single lookup. The pages are fetched as background requests, behind
+        interactive and bulk ones. Returns the number of users indexed.
+        """
+        start = time.monotonic()
+        try:
+            with request_priority(BACKGROUND):
+                first = self.client.list_users()
+            pages = [first]
+            if first.get("page_count", 1) > 1:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    pages.extend(pool.map(with_priority(BACKGROUND, self.client.list_users),
+                                          range(2, first["page_count"] + 1)))
+        except Exception as e:
+            self.log(f"Directory prefetch failed, using single lookups: {str(e)}")
+            pages = []
+        return self._index_directory(pages, start)
+
+    def _index_directory(self, pages, start):
+        directory = {}
+        for page in pages:
+            for user in page.get("users", []):
+                if user.get("email") and user.get("id"):
+                    directory[user["email"].lower()] = user["id"]
+        # An empty index after a failure is kept too, so it is not retried before the TTL
+        self.directory = directory
+        self._directory_loaded_at = time.monotonic()
+        if pages:
+            self.log(f"Directory prefetch: {len(directory)} users indexed in "
+                     f"{time.monotonic() - start:.1f}s")
+        return len(directory)
+
+    def resolve_user_id(self, email):
+        """Return (user_id, error); user_id is None and error is set when the lookup fails"""
+        known = self._resolve_known(email)
+        if known is not None:
+            return known
+        started = time.monotonic()
+        try:
+            user_info = self.client.get_user(email)
+        except Exception as e:
+            return self._lookup_failed(email, e, started)
+        return self._lookup_answered(email, user_info, started)
+
+    def _resolve_known(self, email):
+        """(user_id, error) from the directory or the user cache, or None if the API must be asked"""
+        if self.directory:
+            user_id = self.directory.get(email.lower())
+            if user_id:
+                self.emit("lookup", email=email, outcome="directory")
+                return user_id, None
+
+        if self.user_cache is not None:
+            hit, user_id = self.user_cache.lookup(email)
+            if hit:
+                if not user_id:
+                    self.missing.add(email.lower())
+                self.emit("lookup", email=email, outcome="cached" if user_id else "cached_not_found")
+                return user_id, None if user_id else f"User not found: {email} (cached)"
+        return None
+
+    def _lookup_failed(self, email, error, started):
+        """Record a failed user lookup, caching a 404; returns (None, error message)"""
+        latency = round(time.monotonic() - started, 4)
+        if not isinstance(error, ZoomAPIError):
+            self.emit("lookup", email=email, outcome="error", error=str(error), latency=latency)
+            return None, f"Error getting user ID for {email}: {str(error)}"
+        if error.status_code == 404:
+            self.missing.add(email.lower())
+            if self.user_cache is not None:
+                self.user_cache.put_missing(email)
+        self.emit("lookup", email=email, outcome="not_found" if error.status_code == 404 else "error",
+                  error=str(error), latency=latency)
+        return None, f"User not found: {email} (Status: {error.status_code})"
+
+    def _lookup_answered(self, email, user_info, started):
+        """Record and cache a user lookup's answer; returns (user_id, error)"""
+        user_id = user_info.get("id")
+        if user_id:
+            self.missing.discard(email.lower())
+            if self.user_cache is not None:
+                self.user_cache.put(email, user_id)
+        self.emit("lookup", email=email, outcome="found" if user_id else "not_found",
+                  latency=round(time.monotonic() - started, 4))
+        return user_id, None if user_id else f"User not found: {email}"
+
+    def journal_missing(self, journal, email):
+        """Tell the journal a user does not exist, so resume skips its pairs"""
+        if journal is not None and email.lower() in self.missing:
+            journal.record_missing(email)
+
+    def current_assistants(self, user_id):
+        """{lowercased email: assistant ID} for a user's assistants; raises when they cannot be read"""
+        return {a.get("email", "").lower(): a.get("id") for a in self.client.list_assistants(user_id)}
+
+    def remove_assistants(self, owner_id, removals, remove_all=False):
+        """Delete (email, id) assistants from one owner; returns {email: error}
+
+        With remove_all the owner's whole list is cleared in one request.
+        """
+        if remove_all:
+            try:
+                self.client.delete_assistants(owner_id)
+                return {email: None for email, _ in removals}
+            except Exception as e:
+                return {email: str(e) for email, _ in removals}
+        outcome = {}
+        for email, assistant_id in removals:
+            try:
+                self.client.delete_assistant(owner_id, assistant_id)
+                outcome[email] = None
+            except Exception as e:
+                outcome[email] = str(e)
+        return outcome
+
+    def existing_assistants(self, user_id):
+        """Lowercased emails of a user's current assistants; empty if they cannot be read"""
+        try:
+            return {a.get("email", "").lower() for a in self.client.list_assistants(user_id)}
+        except Exception:
+            return set()
+
+    def add_assistants_batch(self, owner_id, assistant_emails, trace=None):
+        """Add assistants to one owner in a single request, bisecting on failure
+
+        Returns {email: error} where error is None for every email that was
+        added. A batch rejected because of its contents is split in half
+        until the failing emails are isolated; other errors, such as a 404
+        for an owner that does not exist, fail the whole batch at once. trace, if given, collects each email's [attempts,
+        latency] for its PairResult.
+        """
+        started = time.monotonic()
+        try:
+            self.client.add_assistants(owner_id, assistant_emails)
+            error = None
+        except Exception as e:
+            error = e
+        outcome = batch_outcome(assistant_emails, error, trace, started)
+        if outcome is not None:
+            return outcome
+
+        middle = len(assistant_emails) // 2
+        outcome = self.add_assistants_batch(owner_id, assistant_emails[:middle], trace)
+        outcome.update(self.add_assistants_batch(owner_id, assistant_emails[middle:], trace))
+        return outcome
+
+    def run(self, target_email, assistant_emails, dry_run=False, journal=None):
+        """Make every assistant email an assistant of the target and vice versa
+
+        Step 1 adds the assistants to the target in bulk requests of up to
+        batch_size emails, Step 2 adds the target to each assistant. Writes
+        are queued as soon as the lookups they depend on finish. With
+        skip_existing, pairs that already exist are reported as "present"
+        and not written; dry_run reports the remaining writes as "planned"
+        without sending them. Each PairResult is also recorded in journal,
+        if given, as soon as it is known. Returns the PairResults in log
+        order, or None when the target user cannot be resolved.
+        """
+        if self.directory_stale():
+            self.load_directory()
+
+        target_user_id, error = self.resolve_user_id(target_email)
+        if not target_user_id:
+            self.log(error)
+            self.log(f"Failed to get user ID for {target_email}")
+            self.journal_missing(journal, target_email)
+            return None
+
+        if not assistant_emails:
+            self.log("No valid assistant emails found")
+            return []
+
+        target_existing = self.existing_assistants(target_user_id) if self.skip_existing else set()
+        plan = RunPlan(self, target_email, len(assistant_emails), dry_run, journal, target_existing)
+
+        def add_step1_batch(batch):
+            trace = {}
+            if dry_run:
+                outcome = {email: None for _, email in batch}
+            else:
+                outcome = self.add_assistants_batch(target_user_id, [email for _, email in batch], trace)
+            plan.step1_done(batch, outcome, trace)
+
+        def add_step2_pair(index, user_id, email):
+            if self.skip_existing and target_email.lower() in self.existing_assistants(user_id):
+                return plan.step2_done(index, email, "present")
+            if dry_run:
+                return plan.step2_done(index, email, "planned")
+            trace = {}
+            error = self.add_assistants_batch(user_id, [target_email], trace)[target_email]
+            plan.step2_done(index, email, "failed" if error else "added", error, trace)
+
+        def resolve_assistant(index, email):
+            user_id, error = self.resolve_user_id(email)
+            if user_id:
+                pool.submit(add_step2_pair, index, user_id, email)
+            for batch in plan.resolved(index, email, user_id, error):
+                pool.submit(add_step1_batch, batch)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Lookups queue their writes, so wait for them before the pool shuts down
+            wait([pool.submit(resolve_assistant, i, email)
+                  for i, email in enumerate(assistant_emails)])
+
+        return plan.pair_results()
+
+    def run_mesh(self, member_emails, dry_run=False, journal=None):
+        """Make every member an assistant of every other member
+
+        Each member is resolved once and, with skip_existing, its current
+        assistants are read once; then every owner gets all of its missing
+        assistants in bulk requests of up to batch_size. A pod of N members
+        costs about 3N calls instead of N² lookups and writes. Returns the
+        PairResults in log order.
+        """
+        if self.directory_stale():
+            self.load_directory()
+        plan = MeshPlan(self, member_emails, dry_run, journal)
+
+        def resolve_member(index, email):
+            user_id, error = self.resolve_user_id(email)
+            existing = self.existing_assistants(user_id) if user_id and self.skip_existing else None
+            plan.resolved(index, user_id, error, existing)
+
+        def add_owner(index, assistants):
+            missing = plan.missing(index, assistants)
+            outcome = {email: None for email in missing}
+            trace = {}
+            if not dry_run:
+                for batch in chunks(missing, self.batch_size):
+                    outcome.update(self.add_assistants_batch(plan.user_ids[index], batch, trace))
+            plan.owner_done(index, assistants, outcome, trace)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            wait([pool.submit(resolve_member, i, email) for i, email in enumerate(plan.members)])
+            for index, assistants in plan.owners():
+                pool.submit(add_owner, index, assistants)
+
+        return plan.pair_results()
+
+    def sync(self, desired, dry_run=False, remove=True):
+        """Make each owner's assistants exactly the ones listed in desired
+
+        desired maps owner emails to assistant emails. Every owner's current
+        assistants are read concurrently and only the difference is written:
+        missing assistants are added in bulk requests of up to batch_size,
+        unlisted ones are deleted (in one request when the list is empty).
+        remove=False keeps unlisted assistants. An unchanged state costs only
+        reads. An owner that cannot be found or read gets a "not_found" or
+        "failed" result for each listed assistant. Returns the PairResults in
+        log order.
+        """
+        if self.directory_stale():
+            self.load_directory()
+        plan = SyncPlan(self, desired, dry_run, remove)
+
+        def sync_owner(index, owner_email):
+            owner_id, error = self.resolve_user_id(owner_email)
+            if not owner_id:
+                return plan.unresolved(index, error)
+            try:
+                current = self.current_assistants(owner_id)
+            except Exception as e:
+                return plan.unreadable(index, e)
+
+            batches, removals, remove_all = plan.writes(index, current)
+            outcome = {}
+            for batch in batches:
+                outcome.update(self.add_assistants_batch(owner_id, batch))
+            if removals:
+                outcome.update(self.remove_assistants(owner_id, removals, remove_all))
+            plan.owner_done(index, outcome)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            wait([pool.submit(sync_owner, i, owner) for i, owner in enumerate(plan.owners)])
+
+        return plan.pair_results()
+
+    def inventory(self, owner_emails, on_rows=None):
+        """Read the assistant lists of many owners concurrently
+
+        on_rows(rows) is called with each owner's InventoryRows as soon as
+        they arrive, one owner at a time, so a report can be streamed to
+        disk. Returns the InventorySummary.
+        """
+        plan = InventoryPlan(self, owner_emails, on_rows)
+        if self.directory_stale():
+            self.load_directory()
+
+        def read_owner(owner_email):
+            owner_id, error = self.resolve_user_id(owner_email)
+            if not owner_id:
+                return plan.unresolved(owner_email, error)
+            try:
+                assistants = self.client.list_assistants(owner_id)
+            except Exception as e:
+                return plan.unreadable(owner_email, e)
+            plan.owner_read(owner_email, assistants)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            wait([pool.submit(read_owner, email) for email in plan.owners])
+
+        return plan.summary
+
+
+def plan_sync(current, wanted, remove=True):
+    """Split one owner's desired state into (present, to_add, to_remove)
+
+    current maps lowercased assistant emails to assistant IDs; to_remove
+    lists (email, id) for current assistants that are not wanted.
+    """
+    wanted = unique_emails(wanted)
+    keys = {email.lower() for email in wanted}
+    present = [email for email in wanted if email.lower() in current]
+    to_add = [email for email in wanted if email.lower() not in current]
+    to_remove = [(email, assistant_id) for email, assistant_id in current.items()
+                 if email not in keys] if remove else []
+    return present, to_add, to_remove
+
+
+def sync_results(owner_email, present, to_add, to_remove, outcome, dry_run):
+    """PairResults for one synced owner; outcome maps emails to their error or None"""
+    results = [pair_result(owner_email, email, "present") for email in present]
+    for email in to_add:
+        error = outcome.get(email)
+        results.append(pair_result(owner_email, email,
+                                   "planned" if dry_run else "failed" if error else "added", error))
+    for email, _ in to_remove:
+        error = outcome.get(email)
+        results.append(pair_result(owner_email, email,
+                                   "planned_removal" if dry_run else "remove_failed" if error else "removed",
+                                   error))
+    return results
+
+
+def unique_emails(emails):
+    """Emails without case-insensitive duplicates, in first-seen order"""
+    seen = {}
+    for email in emails:
+        seen.setdefault(email.lower(), email)
+    return list(seen.values())
+
+
+def create_engine(settings, log, user_cache_path=None, events=None):
+    """Build the client, user cache and engine described by a Settings object
+
+    events is an EventLog that lookups, writes and retries are recorded in.
+    """
+    client = ZoomClient(
+        base_url=settings.api_base_url,
+        oauth_base_url=settings.oauth_base_url,
+        pool_size=settings.max_workers,
+        scheduler=RateLimitScheduler(settings.rate_limits, max_concurrency=settings.max_workers,
+                                     log=log, metrics=Metrics(), events=events,
+                                     shared_dir=settings.rate_budget_dir),
+    )
+    user_cache = UserIDCache(
+        user_cache_path,
+        ttl=settings.user_cache_ttl,
+        negative_ttl=settings.user_cache_negative_ttl,
+    )
+    return build_engine(settings, client, user_cache, log)
+
+
+def build_engine(settings, client, user_cache, log):
+    """Build the engine selected by settings.engine around an existing client and cache
+
+    The engine records events in the client scheduler's event log, if any.
+    """
+    events = client.scheduler.events
+    if settings.engine == "asyncio":
+        # Imported lazily: aiohttp is an optional dependency
+        from async_engine import AsyncAssistantEngine
+        return AsyncAssistantEngine(client, user_cache, log,
+                                    max_workers=settings.max_workers,
+                                    batch_size=settings.batch_size,
+                                    skip_existing=settings.skip_existing,
+                                    prefetch_directory=settings.prefetch_directory,
+                                    directory_ttl=settings.directory_ttl,
+                                    events=events,
+                                    concurrency=settings.async_concurrency)
+    return AssistantEngine(client, user_cache, log,
+                           max_workers=settings.max_workers,
+                           batch_size=settings.batch_size,
+                           skip_existing=settings.skip_existing,
+                           prefetch_directory=settings.prefetch_directory,
+                           directory_ttl=settings.directory_ttl,
+                           events=events)
@@ -0,0 +1,164 @@
+import asyncio
+import json
+
+try:
+    import aiohttp
+except ImportError:  # Optional: only needed for the asyncio engine
+    aiohttp = None
+
+from assistant_engine import DEFAULT_ASYNC_CONCURRENCY
+from metrics import endpoint_name
+from rate_limiter import AsyncRateLimitScheduler, current_priority
+from singleflight import AsyncSingleFlight
+from zoom_client import API_BASE_URL, USERS_PAGE_SIZE, ZoomAPIError
+
+
+class AsyncResponse:
+    """The parts of an aiohttp response the scheduler and client need, read eagerly"""
+
+    def __init__(self, status_code, headers, content, sent=0):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        # Request body size, for metrics
+        self.sent = sent
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncZoomClient:
+    """asyncio counterpart of ZoomClient built on one pooled aiohttp session
+
+    Must be used from a single event loop; the session is created on first use.
+    Sign-in and token refreshes stay on ZoomClient, whichever engine runs.
+    """
+
+    def __init__(self, access_token=None, base_url=API_BASE_URL, concurrency=DEFAULT_ASYNC_CONCURRENCY,
+                 scheduler=None):
+        if aiohttp is None:
+            raise RuntimeError("The asyncio engine needs aiohttp: pip install aiohttp")
+        self.access_token = access_token
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.scheduler = scheduler or AsyncRateLimitScheduler(max_concurrency=concurrency)
+        self.scheduler.transient_errors += (aiohttp.ClientConnectionError,)
+        self.inflight = AsyncSingleFlight(self.scheduler.metrics)
+        # Shared with the threaded client; refreshes run on a worker thread
+        self.token_manager = None
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """Close the pooled session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _send(self, method, url, **kwargs):
+        if "json" in kwargs:
+            # Serialized here so the body size is known
+            kwargs["data"] = json.dumps(kwargs.pop("json")).encode()
+        sent = len(kwargs["data"]) if isinstance(kwargs.get("data"), bytes) else 0
+        async with self._get_session().request(method, url, **kwargs) as response:
+            content = await response.read()
+            return AsyncResponse(response.status, response.headers, content, sent)
+
+    def _token(self):
+        # Follow the token manager so a background refresh applies mid-run
+        return self.token_manager.access_token if self.token_manager is not None else self.access_token
+
+    async def request(self, method, path, category="light", **kwargs):
+        """Send an authenticated request to the REST API and return the response
+
+        Concurrent identical GETs of the same priority share one request.
+        """
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        if method == "GET" and set(kwargs) <= {"params"}:
+            key = (url, tuple(sorted((kwargs.get("params") or {}).items())), current_priority())
+            return await self.inflight.do(key, lambda: self._request(method, url, path, category, **kwargs),
+                                          endpoint_name(method, path))
+        return await self._request(method, url, path, category, **kwargs)
+
+    async def _request(self, method, url, path, category, **kwargs):
+        extra_headers = kwargs.pop("headers", None) or {}
+
+        def send():
+            headers = {"Content-Type": "application/json"}
+            token = self._token()
+            if token:
+                headers["Authorization"] = f"Bearer {token}"
+            headers.update(extra_headers)
+            return self._send(method, url, headers=headers, **kwargs)
+
+        options = {"retry_server_errors": method != "POST", "endpoint": endpoint_name(method, path)}
+        token = self._token()
+        response = await self.scheduler.execute(category, send, **options)
+        if response.status_code == 401 and self.token_manager is not None:
+            refreshed = await asyncio.get_running_loop().run_in_executor(
+                None, self.token_manager.refresh, token)
+            if refreshed:
+                response = await self.scheduler.execute(category, send, **options)
+        return response
+
+    async def request_json(self, method, path, ok_statuses=(200,), **kwargs):
+        """Send a request and return the decoded body, raising ZoomAPIError on failure"""
+        response = await self.request(method, path, **kwargs)
+        if response.status_code not in ok_statuses:
+            raise ZoomAPIError(response.status_code, response.text)
+        if response.status_code == 204 or not response.content:
+            return {}
+        return response.json()
+
+    # Users and assistants
+
+    async def get_me(self):
+        """Get the authenticated user's profile"""
+        return await self.request_json("GET", "/users/me")
+
+    async def get_user(self, email):
+        """Get a user's profile by email address or user ID"""
+        return await self.request_json("GET", f"/users/{email}")
+
+    async def list_users(self, page_number=1, page_size=USERS_PAGE_SIZE, status="active"):
+        """Get one page of the account's users; page_count in the body gives the total"""
+        params = {"status": status, "page_size": page_size, "page_number": page_number}
+        return await self.request_json("GET", "/users", category="medium", params=params)
+
+    async def list_assistants(self, user_id):
+        """List the assistants of a user, following next_page_token if the list is paged"""
+        assistants, params = [], None
+        while True:
+            data = await self.request_json("GET", f"/users/{user_id}/assistants", category="medium",
+                                           params=params)
+            assistants.extend(data.get("assistants", []))
+            if not data.get("next_page_token"):
+                return assistants
+            params = {"next_page_token": data["next_page_token"]}
+
+    async def delete_assistant(self, user_id, assistant_id):
+        """Remove one assistant from a user"""
+        return await self.request_json("DELETE", f"/users/{user_id}/assistants/{assistant_id}",
+                                       category="medium", ok_statuses=(204,))
+
+    async def delete_assistants(self, user_id):
+        """Remove all assistants from a user"""
+        return await self.request_json("DELETE", f"/users/{user_id}/assistants", category="medium",
+                                       ok_statuses=(204,))
+
+    async def add_assistants(self, user_id, assistant_emails):
+        """Add one or more assistants to a user in a single request"""
+        data = {
+            "assistants": [{"email": email} for email in assistant_emails]
+        }
+        return await self.request_json("POST", f"/users/{user_id}/assistants", category="medium",
+                                       ok_statuses=(200, 201, 204), json=data)
@@ -0,0 +1,296 @@
+import asyncio
+import threading
+import time
+
+from assistant_engine import (AssistantEngine, InventoryPlan, MeshPlan, RunPlan, SyncPlan, batch_outcome, chunks,
+                              DEFAULT_MAX_WORKERS, DEFAULT_BATCH_SIZE, DEFAULT_ASYNC_CONCURRENCY,
+                              DEFAULT_DIRECTORY_TTL)
+from async_client import AsyncZoomClient
+from rate_limiter import BACKGROUND, AsyncRateLimitScheduler, current_priority, request_priority
+
+
+class AsyncAssistantEngine(AssistantEngine):
+    """AssistantEngine that runs every lookup and write as a coroutine on one event loop
+
+    Instead of a thread per in-flight request, up to `concurrency` requests
+    share a single event loop thread, bounded by the adaptive limiter. The
+    public methods are synchronous wrappers with the same signatures as
+    AssistantEngine, so callers can switch engines without changes.
+    """
+
+    def __init__(self, client, user_cache=None, log=print, max_workers=DEFAULT_MAX_WORKERS,
+                 batch_size=DEFAULT_BATCH_SIZE, skip_existing=True, prefetch_directory=False,
+                 directory_ttl=DEFAULT_DIRECTORY_TTL, events=None, concurrency=DEFAULT_ASYNC_CONCURRENCY):
+        super().__init__(client, user_cache, log, max_workers, batch_size, skip_existing,
+                         prefetch_directory, directory_ttl, events)
+        self.concurrency = concurrency
+        # Same rate limits as the threaded client, paced on the event loop
+        self.async_client = AsyncZoomClient(
+            base_url=client.base_url,
+            concurrency=concurrency,
+            scheduler=AsyncRateLimitScheduler(client.scheduler.rates, max_concurrency=concurrency,
+                                              log=log, metrics=client.scheduler.metrics,
+                                              events=client.scheduler.events,
+                                              shared_dir=client.scheduler.shared_dir,
+                                              gate=client.scheduler.gate),
+        )
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    def _get_loop(self):
+        # One long-lived loop keeps the aiohttp connection pool warm between runs
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, daemon=True).start()
+            return self._loop
+
+    def _call(self, coro):
+        """Run a coroutine on the engine's loop, with the caller's request priority, and wait for its result"""
+        self.async_client.access_token = self.client.access_token
+        self.async_client.token_manager = self.client.token_manager
+        return asyncio.run_coroutine_threadsafe(self._prioritized(coro, current_priority()), self._get_loop()).result()
+
+    @staticmethod
+    async def _prioritized(coro, priority):
+        with request_priority(priority):
+            return await coro
+
+    def detach(self):
+        """Close the aiohttp session and stop the event loop"""
+        if self._loop is not None:
+            self._call(self.async_client.close())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+    def load_directory(self):
+        return self._call(self.load_directory_async())
+
+    def resolve_user_id(self, email):
+        return self._call(self.resolve_user_id_async(email))
+
+    def add_assistants_batch(self, owner_id, assistant_emails, trace=None):
+        return self._call(self.add_assistants_batch_async(owner_id, assistant_emails, trace))
+
+    def existing_assistants(self, user_id):
+        return self._call(self.existing_assistants_async(user_id))
+
+    def run(self, target_email, assistant_emails, dry_run=False, journal=None):
+        return self._call(self.run_async(target_email, assistant_emails, dry_run, journal))
+
+    def run_mesh(self, member_emails, dry_run=False, journal=None):
+        return self._call(self.run_mesh_async(member_emails, dry_run, journal))
+
+    def current_assistants(self, user_id):
+        return self._call(self.current_assistants_async(user_id))
+
+    def remove_assistants(self, owner_id, removals, remove_all=False):
+        return self._call(self.remove_assistants_async(owner_id, removals, remove_all))
+
+    def sync(self, desired, dry_run=False, remove=True):
+        return self._call(self.sync_async(desired, dry_run, remove))
+
+    def inventory(self, owner_emails, on_rows=None):
+        return self._call(self.inventory_async(owner_emails, on_rows))
+
+    async def load_directory_async(self):
+        """Coroutine version of AssistantEngine.load_directory"""
+        start = time.monotonic()
+        try:
+            # The pages' tasks inherit the background priority
+            with request_priority(BACKGROUND):
+                first = await self.async_client.list_users()
+                pages = [first]
+                pages.extend(await asyncio.gather(*(self.async_client.list_users(page_number)
+                                                    for page_number in range(2, first.get("page_count", 1) + 1))))
+        except Exception as e:
+            self.log(f"Directory prefetch failed, using single lookups: {str(e)}")
+            pages = []
+        return self._index_directory(pages, start)
+
+    async def resolve_user_id_async(self, email):
+        """Coroutine version of AssistantEngine.resolve_user_id"""
+        known = self._resolve_known(email)
+        if known is not None:
+            return known
+        started = time.monotonic()
+        try:
+            user_info = await self.async_client.get_user(email)
+        except Exception as e:
+            return self._lookup_failed(email, e, started)
+        return self._lookup_answered(email, user_info, started)
+
+    async def existing_assistants_async(self, user_id):
+        """Coroutine version of AssistantEngine.existing_assistants"""
+        try:
+            return {a.get("email", "").lower() for a in await self.async_client.list_assistants(user_id)}
+        except Exception:
+            return set()
+
+    async def current_assistants_async(self, user_id):
+        """Coroutine version of AssistantEngine.current_assistants"""
+        return {a.get("email", "").lower(): a.get("id") for a in await self.async_client.list_assistants(user_id)}
+
+    async def remove_assistants_async(self, owner_id, removals, remove_all=False):
+        """Coroutine version of AssistantEngine.remove_assistants; single deletes run concurrently"""
+        if remove_all:
+            try:
+                await self.async_client.delete_assistants(owner_id)
+                return {email: None for email, _ in removals}
+            except Exception as e:
+                return {email: str(e) for email, _ in removals}
+
+        async def remove(assistant_id):
+            try:
+                await self.async_client.delete_assistant(owner_id, assistant_id)
+            except Exception as e:
+                return str(e)
+
+        errors = await asyncio.gather(*(remove(assistant_id) for _, assistant_id in removals))
+        return {email: error for (email, _), error in zip(removals, errors)}
+
+    async def add_assistants_batch_async(self, owner_id, assistant_emails, trace=None):
+        """Coroutine version of AssistantEngine.add_assistants_batch"""
+        started = time.monotonic()
+        try:
+            await self.async_client.add_assistants(owner_id, assistant_emails)
+            error = None
+        except Exception as e:
+            error = e
+        outcome = batch_outcome(assistant_emails, error, trace, started)
+        if outcome is not None:
+            return outcome
+
+        middle = len(assistant_emails) // 2
+        first, second = await asyncio.gather(
+            self.add_assistants_batch_async(owner_id, assistant_emails[:middle], trace),
+            self.add_assistants_batch_async(owner_id, assistant_emails[middle:], trace),
+        )
+        first.update(second)
+        return first
+
+    async def run_async(self, target_email, assistant_emails, dry_run=False, journal=None):
+        """Coroutine version of AssistantEngine.run with the same log output"""
+        if self.directory_stale():
+            await self.load_directory_async()
+
+        target_user_id, error = await self.resolve_user_id_async(target_email)
+        if not target_user_id:
+            self.log(error)
+            self.log(f"Failed to get user ID for {target_email}")
+            self.journal_missing(journal, target_email)
+            return None
+
+        if not assistant_emails:
+            self.log("No valid assistant emails found")
+            return []
+
+        target_existing = (await self.existing_assistants_async(target_user_id)
+                           if self.skip_existing else set())
+        plan = RunPlan(self, target_email, len(assistant_emails), dry_run, journal, target_existing)
+        writes = []
+
+        async def add_step1_batch(batch):
+            trace = {}
+            if dry_run:
+                outcome = {email: None for _, email in batch}
+            else:
+                outcome = await self.add_assistants_batch_async(target_user_id, [email for _, email in batch],
+                                                                trace)
+            plan.step1_done(batch, outcome, trace)
+
+        async def add_step2_pair(index, user_id, email):
+            if self.skip_existing and target_email.lower() in await self.existing_assistants_async(user_id):
+                return plan.step2_done(index, email, "present")
+            if dry_run:
+                return plan.step2_done(index, email, "planned")
+            trace = {}
+            error = (await self.add_assistants_batch_async(user_id, [target_email], trace))[target_email]
+            plan.step2_done(index, email, "failed" if error else "added", error, trace)
+
+        async def resolve_assistant(index, email):
+            user_id, error = await self.resolve_user_id_async(email)
+            if user_id:
+                writes.append(asyncio.ensure_future(add_step2_pair(index, user_id, email)))
+            for batch in plan.resolved(index, email, user_id, error):
+                writes.append(asyncio.ensure_future(add_step1_batch(batch)))
+
+        await asyncio.gather(*(resolve_assistant(i, email) for i, email in enumerate(assistant_emails)))
+        await asyncio.gather(*writes)
+
+        return plan.pair_results()
+
+    async def run_mesh_async(self, member_emails, dry_run=False, journal=None):
+        """Coroutine version of AssistantEngine.run_mesh with the same log output"""
+        if self.directory_stale():
+            await self.load_directory_async()
+        plan = MeshPlan(self, member_emails, dry_run, journal)
+
+        async def resolve_member(index, email):
+            user_id, error = await self.resolve_user_id_async(email)
+            existing = await self.existing_assistants_async(user_id) if user_id and self.skip_existing else None
+            plan.resolved(index, user_id, error, existing)
+
+        async def add_owner(index, assistants):
+            missing = plan.missing(index, assistants)
+            outcome = {email: None for email in missing}
+            trace = {}
+            if not dry_run:
+                batches = await asyncio.gather(*(self.add_assistants_batch_async(plan.user_ids[index], batch, trace)
+                                                 for batch in chunks(missing, self.batch_size)))
+                for batch in batches:
+                    outcome.update(batch)
+            plan.owner_done(index, assistants, outcome, trace)
+
+        await asyncio.gather(*(resolve_member(i, email) for i, email in enumerate(plan.members)))
+        await asyncio.gather(*(add_owner(index, assistants) for index, assistants in plan.owners()))
+
+        return plan.pair_results()
+
+    async def sync_async(self, desired, dry_run=False, remove=True):
+        """Coroutine version of AssistantEngine.sync with the same log output"""
+        if self.directory_stale():
+            await self.load_directory_async()
+        plan = SyncPlan(self, desired, dry_run, remove)
+
+        async def sync_owner(index, owner_email):
+            owner_id, error = await self.resolve_user_id_async(owner_email)
+            if not owner_id:
+                return plan.unresolved(index, error)
+            try:
+                current = await self.current_assistants_async(owner_id)
+            except Exception as e:
+                return plan.unreadable(index, e)
+
+            batches, removals, remove_all = plan.writes(index, current)
+            writes = [self.add_assistants_batch_async(owner_id, batch) for batch in batches]
+            if removals:
+                writes.append(self.remove_assistants_async(owner_id, removals, remove_all))
+            outcome = {}
+            for batch in await asyncio.gather(*writes):
+                outcome.update(batch)
+            plan.owner_done(index, outcome)
+
+        await asyncio.gather(*(sync_owner(i, owner) for i, owner in enumerate(plan.owners)))
+
+        return plan.pair_results()
+
+    async def inventory_async(self, owner_emails, on_rows=None):
+        """Coroutine version of AssistantEngine.inventory; on_rows runs on the event loop"""
+        plan = InventoryPlan(self, owner_emails, on_rows)
+        if self.directory_stale():
+            await self.load_directory_async()
+
+        async def read_owner(owner_email):
+            owner_id, error = await self.resolve_user_id_async(owner_email)
+            if not owner_id:
+                return plan.unresolved(owner_email, error)
+            try:
+                assistants = await self.async_client.list_assistants(owner_id)
+            except Exception as e:
+                return plan.unreadable(owner_email, e)
+            plan.owner_read(owner_email, assistants)
+
+        await asyncio.gather(*(read_owner(email) for email in plan.owners))
+
+        return plan.summary
@@ -0,0 +1,71 @@
+"""Compare the threaded and asyncio engines on the same workload
+
+Starts the mock Zoom API (mock_zoom.py) with a fixed per-request latency,
+then runs one target with N assistants through each engine and reports
+wall time and pairs per second. bench_suite.py is the fuller version.
+
+    python benchmarks/bench_engines.py --assistants 1000 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from assistant_engine import AssistantEngine  # noqa: E402
+from mock_zoom import start_server  # noqa: E402
+from rate_limiter import RateLimitScheduler  # noqa: E402
+from user_cache import UserIDCache  # noqa: E402
+from zoom_client import ZoomClient  # noqa: E402
+
+
+def bench(engine_name, server, args):
+    # Rate limits are lifted so the engines themselves are measured
+    rates = {"light": 1e6, "medium": 1e6, "heavy": 1e6}
+    client = ZoomClient("token", base_url=server.base_url, pool_size=args.workers,
+                        scheduler=RateLimitScheduler(rates, max_concurrency=args.workers))
+    engine_args = (client, UserIDCache(None), lambda message: None, args.workers, args.batch_size)
+    if engine_name == "asyncio":
+        from async_engine import AsyncAssistantEngine
+        engine = AsyncAssistantEngine(*engine_args, concurrency=args.concurrency)
+    else:
+        engine = AssistantEngine(*engine_args)
+
+    emails = [f"user{i}@example.com" for i in range(1, args.assistants + 1)]
+    server.state.reset()
+    start = time.perf_counter()
+    results = engine.run("owner@example.com", emails)
+    elapsed = time.perf_counter() - start
+    engine.close()
+    return elapsed, len(results), server.state.calls["total"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assistants", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock latency per request (s)")
+    parser.add_argument("--workers", type=int, default=8, help="threaded engine workers")
+    parser.add_argument("--concurrency", type=int, default=100, help="asyncio engine in-flight limit")
+    parser.add_argument("--batch-size", type=int, default=30)
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency)
+
+    print(f"{args.assistants} assistants, {args.latency * 1000:.0f} ms latency")
+    print(f"{'engine':<10}{'seconds':>10}{'pairs':>8}{'pairs/s':>10}{'calls':>8}")
+    for engine_name in ("threads", "asyncio"):
+        try:
+            elapsed, pairs, calls = bench(engine_name, server, args)
+        except RuntimeError as e:
+            print(f"{engine_name:<10}skipped: {e}")
+            continue
+        print(f"{engine_name:<10}{elapsed:>10.2f}{pairs:>8}{pairs / elapsed:>10.1f}{calls:>8}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
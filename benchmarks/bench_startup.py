@@ -0,0 +1,155 @@
+"""Startup time benchmark for the GUI and headless entry points
+
+Each measurement runs in a fresh interpreter. "cold" starts with an empty
+bytecode cache (as after an install or update), "warm" reuses the cache the
+cold run left behind. For every target it reports the in-process import
+time and the whole process wall time, median over --repeat runs, and
+checks the warm medians against a startup budget.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --save startup.json
+    python benchmarks/bench_startup.py --baseline startup.json --check
+
+gui_window opens the real window (needs a display) and also reports how
+long the engine, config and token cache take to be ready behind it.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+
+TARGETS = ("headless_import", "gui_import", "gui_window")
+# Warm-start budgets in milliseconds, per target and phase
+DEFAULT_BUDGETS_MS = {
+    ("headless_import", "import"): 250,
+    ("gui_import", "import"): 100,
+    ("gui_window", "window"): 300,
+}
+# Seconds gui_window waits for the engine before giving up
+READY_TIMEOUT = 30
+
+
+def run_target(target):
+    """Child process: time one target and print its phases in seconds as JSON"""
+    sys.path.insert(0, APP_DIR)
+    start = time.perf_counter()
+    phases = {}
+    if target == "headless_import":
+        import headless  # noqa: F401
+        phases["import"] = time.perf_counter() - start
+    elif target == "gui_import":
+        import zoom_gui  # noqa: F401
+        phases["import"] = time.perf_counter() - start
+    else:
+        import tkinter as tk
+        import zoom_gui
+        phases["import"] = time.perf_counter() - start
+        root = tk.Tk()
+        app = zoom_gui.ZoomAssistantManager(root)
+        root.update()
+        phases["window"] = time.perf_counter() - start
+        while app.engine is None and time.perf_counter() - start < READY_TIMEOUT:
+            root.update()
+            time.sleep(0.005)
+        phases["ready"] = time.perf_counter() - start
+        app.close()
+    print(json.dumps(phases))
+
+
+def has_display():
+    command = [sys.executable, "-c", "import tkinter; tkinter.Tk().destroy()"]
+    return subprocess.run(command, capture_output=True).returncode == 0
+
+
+def measure(target, cache_dir):
+    """Run target once with cache_dir as the bytecode cache; returns {phase: seconds}"""
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=cache_dir)
+    # Warm runs need the cold run to have written its bytecode
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = [sys.executable, os.path.abspath(__file__), "--worker", target]
+    start = time.perf_counter()
+    output = subprocess.run(command, check=True, capture_output=True, text=True, env=env, cwd=APP_DIR).stdout
+    phases = json.loads(output.strip().splitlines()[-1])
+    phases["process"] = time.perf_counter() - start
+    return phases
+
+
+def median_phases(runs):
+    return {phase: statistics.median(run[phase] for run in runs) for phase in runs[0]}
+
+
+def bench(target, repeat):
+    """Median phases of cold runs (fresh cache each) and warm runs (cache kept)"""
+    cold, warm = [], []
+    for _ in range(repeat):
+        cache_dir = tempfile.mkdtemp(prefix="bench-startup-")
+        try:
+            cold.append(measure(target, cache_dir))
+            warm.append(measure(target, cache_dir))
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    return {"cold": median_phases(cold), "warm": median_phases(warm)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", default=",".join(TARGETS), help="comma-separated targets")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per target and start type")
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--baseline", help="compare against a saved baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if a warm median is over budget")
+    # Internal: time a single target in this process
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_target(args.worker)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    print(f"median of {args.repeat} runs, milliseconds")
+    print(f"{'target':<17}{'phase':<9}{'cold':>8}{'warm':>8}{'budget':>8}{'vs base':>9}")
+    results = {}
+    over_budget = []
+    for target in args.targets.split(","):
+        if target == "gui_window" and not has_display():
+            print(f"{target:<17}skipped: no display")
+            continue
+        try:
+            result = results[target] = bench(target, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"{target:<17}failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        for phase, warm in result["warm"].items():
+            budget = DEFAULT_BUDGETS_MS.get((target, phase))
+            if budget is not None and warm * 1000 > budget:
+                over_budget.append(f"{target} {phase}")
+            base = baseline.get(target, {}).get("warm", {}).get(phase)
+            change = f"{warm / base - 1:+.0%}" if base else ""
+            print(f"{target:<17}{phase:<9}{result['cold'][phase] * 1000:>8.0f}{warm * 1000:>8.0f}"
+                  f"{budget if budget is not None else '':>8}{change:>9}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"Saved to {args.save}")
+    if over_budget:
+        print(f"Over budget: {', '.join(over_budget)}")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
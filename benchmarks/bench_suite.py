@@ -0,0 +1,147 @@
+"""Throughput benchmark suite against the mock Zoom API
+
+Runs every engine on workloads of 10, 1,000 and 10,000 pairs (one target,
+N assistants, both directions written) and reports pairs per second, API
+calls per pair and peak memory. Each workload runs in a fresh subprocess
+so its peak RSS is its own; the mock server runs in this process.
+
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --save baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json   # after a change
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from mock_zoom import add_server_arguments, server_options, start_server  # noqa: E402
+
+DEFAULT_WORKLOADS = (10, 1000, 10000)
+DEFAULT_ENGINES = ("threads", "asyncio")
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_workload(args):
+    """Child process: run one engine on one workload and print the result as JSON"""
+    from assistant_engine import create_engine
+    from settings import Settings
+
+    settings = Settings()
+    settings.api_base_url = args.base_url
+    settings.oauth_base_url = args.base_url.rsplit("/", 1)[0] + "/oauth"
+    settings.engine = args.engine
+    settings.max_workers = args.workers
+    settings.async_concurrency = args.concurrency
+    settings.prefetch_directory = args.prefetch_directory
+    # Client-side limits are lifted so the engine itself is measured
+    settings.rate_limits = {"light": 1e6, "medium": 1e6, "heavy": 1e6}
+
+    engine = create_engine(settings, lambda message: None)
+    engine.client.access_token = "benchmark"
+    emails = [f"user{i}@example.com" for i in range(1, args.pairs + 1)]
+
+    start = time.perf_counter()
+    results = engine.run("owner@example.com", emails)
+    elapsed = time.perf_counter() - start
+    engine.close()
+
+    failed = sum(1 for result in results if not result.success)
+    print(json.dumps({"seconds": elapsed, "results": len(results), "failed": failed,
+                      "peak_mb": peak_rss_mb()}))
+
+
+def control(server, path, method="GET"):
+    url = f"http://127.0.0.1:{server.server_port}{path}"
+    with urllib.request.urlopen(urllib.request.Request(url, method=method)) as response:
+        body = response.read()
+    return json.loads(body) if body else {}
+
+
+def measure(server, engine, pairs, args):
+    control(server, "/_reset", "POST")
+    command = [sys.executable, os.path.abspath(__file__), "--worker", "--engine", engine,
+               "--pairs", str(pairs), "--base-url", server.base_url,
+               "--workers", str(args.workers), "--concurrency", str(args.concurrency)]
+    if args.prefetch_directory:
+        command.append("--prefetch-directory")
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    calls = control(server, "/_stats").get("total", 0)
+    result.update(engine=engine, pairs=pairs, calls=calls,
+                  pairs_per_sec=pairs / result["seconds"], calls_per_pair=calls / pairs)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workloads", default=",".join(map(str, DEFAULT_WORKLOADS)),
+                        help="comma-separated pair counts")
+    parser.add_argument("--engines", default=",".join(DEFAULT_ENGINES), help="comma-separated engines")
+    parser.add_argument("--workers", type=int, default=8, help="threaded engine workers")
+    parser.add_argument("--concurrency", type=int, default=100, help="asyncio engine in-flight limit")
+    parser.add_argument("--prefetch-directory", action="store_true", help="resolve emails from GET /users")
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--baseline", help="compare against a saved baseline")
+    add_server_arguments(parser)
+    # Internal: run a single workload in this process
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--engine", help=argparse.SUPPRESS)
+    parser.add_argument("--pairs", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_workload(args)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {(r["engine"], r["pairs"]): r for r in json.load(f)["results"]}
+
+    server = start_server(**server_options(args))
+    print(f"mock latency {args.latency * 1000:.0f} ms, error rate {args.error_rate:.1%}, "
+          f"rate limit {args.rate_limit or 'off'}")
+    print(f"{'engine':<9}{'pairs':>7}{'seconds':>9}{'pairs/s':>10}{'calls/pair':>12}{'peak MB':>9}"
+          f"{'failed':>8}{'vs base':>9}")
+
+    results = []
+    for engine in args.engines.split(","):
+        for pairs in map(int, args.workloads.split(",")):
+            try:
+                result = measure(server, engine, pairs, args)
+            except subprocess.CalledProcessError as e:
+                print(f"{engine:<9}{pairs:>7}  failed: {e.stderr.strip().splitlines()[-1]}")
+                continue
+            results.append(result)
+            base = baseline.get((engine, pairs))
+            change = f"{result['pairs_per_sec'] / base['pairs_per_sec'] - 1:+.0%}" if base else ""
+            peak = f"{result['peak_mb']:.0f}" if result["peak_mb"] is not None else "n/a"
+            print(f"{engine:<9}{pairs:>7}{result['seconds']:>9.2f}{result['pairs_per_sec']:>10.1f}"
+                  f"{result['calls_per_pair']:>12.2f}{peak:>9}{result['failed']:>8}{change:>9}")
+
+    server.shutdown()
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({"settings": server_options(args), "results": results}, f, indent=2)
+        print(f"Saved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
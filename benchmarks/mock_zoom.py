@@ -0,0 +1,301 @@
+"""Local stand-in for the Zoom endpoints the app uses
+
+Serves the OAuth device flow (/oauth/devicecode, /oauth/token) and the
+REST endpoints under /v2 (/users, /users/{id}, /users/{id}/assistants,
+/users/{id}/assistants/{assistantId}) from memory, with configurable
+latency, error rate and per-category rate limits, so engines can be
+measured and tested without Zoom credentials.
+
+Every address of the form user<N>@example.com exists (id u<N>), as does
+owner@example.com; GET /users lists the first --directory-size of them.
+Anything else is a 404. Any bearer token is accepted unless --auth is set.
+
+    python benchmarks/mock_zoom.py --port 8080 --latency 0.05 --rate-limit 20
+
+Point the app at it with API_BASE_URL = "http://127.0.0.1:8080/v2" and
+OAUTH_BASE_URL = "http://127.0.0.1:8080/oauth" in config.py.
+GET /_stats returns request counts; POST /_reset clears state and counts.
+"""
+import argparse
+import json
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+USER_PATTERN = re.compile(r"user(\d+)@example\.com$")
+ID_PATTERN = re.compile(r"u(\d+)$")
+OWNER_EMAIL = "owner@example.com"
+OWNER_ID = "owner"
+# Assistant lists longer than this are paged with next_page_token
+ASSISTANTS_PAGE_SIZE = 100
+
+
+class MockZoomState:
+    """Users, assistants, tokens and counters shared by all handler threads"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit=0, directory_size=10000,
+                 require_auth=False, token_ttl=3600):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.directory_size = directory_size
+        self.require_auth = require_auth
+        self.token_ttl = token_ttl
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.assistants = {}
+            self.tokens = {}
+            self.refresh_tokens = set()
+            self.calls = Counter()
+            self._windows = {}
+
+    def user(self, key):
+        """(id, email) for an email or user ID, or None when no such user exists"""
+        if key in (OWNER_EMAIL, OWNER_ID, "me"):
+            return OWNER_ID, OWNER_EMAIL
+        match = USER_PATTERN.match(key) or ID_PATTERN.match(key)
+        if match:
+            return f"u{match.group(1)}", f"user{match.group(1)}@example.com"
+        return None
+
+    def throttled(self, category):
+        """Fixed one-second window per category; True once the window is used up"""
+        if not self.rate_limit:
+            return False
+        limit = self.rate_limit * {"light": 1.5, "medium": 1, "heavy": 0.5}[category]
+        with self.lock:
+            second = int(time.time())
+            window = self._windows.get(category)
+            if window is None or window[0] != second:
+                window = self._windows[category] = [second, 0]
+            window[1] += 1
+            return window[1] > limit
+
+    def issue_token(self):
+        access_token, refresh_token = uuid.uuid4().hex, uuid.uuid4().hex
+        with self.lock:
+            self.tokens[access_token] = time.time() + self.token_ttl
+            self.refresh_tokens.add(refresh_token)
+        return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer",
+                "expires_in": self.token_ttl, "scope": "user:read:admin user:write:admin"}
+
+    def token_valid(self, header):
+        if not self.require_auth:
+            return True
+        token = (header or "").replace("Bearer ", "", 1)
+        with self.lock:
+            return self.tokens.get(token, 0) > time.time()
+
+
+class MockZoomHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        data = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.headers.get("Content-Type", "").startswith("application/x-www-form-urlencoded"):
+            return {key: values[0] for key, values in parse_qs(data.decode()).items()}
+        return json.loads(data) if data else {}
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        state = self.state
+        body = self._body() if method in ("POST", "PATCH") else {}
+        if url.path.startswith("/_"):
+            return self._control(method, url.path)
+
+        with state.lock:
+            state.calls[f"{method} {url.path.split('/')[1]}"] += 1
+            state.calls["total"] += 1
+        if state.latency or state.jitter:
+            time.sleep(state.latency + random.uniform(0, state.jitter))
+
+        if url.path.startswith("/oauth/"):
+            return self._oauth(url.path, body, parse_qs(url.query))
+        if not url.path.startswith("/v2/"):
+            return self._reply(404, {"code": 404, "message": "Not found"})
+
+        category = "medium" if url.path == "/v2/users" or "/assistants" in url.path else "light"
+        if state.throttled(category):
+            return self._reply(429, {"code": 429, "message": "You have reached the maximum per-second rate limit"},
+                               {"Retry-After": "1", "X-RateLimit-Category": category.capitalize()})
+        if state.error_rate and random.random() < state.error_rate:
+            return self._reply(500, {"code": 500, "message": "Internal error"})
+        if not state.token_valid(self.headers.get("Authorization")):
+            return self._reply(401, {"code": 124, "message": "Invalid access token."})
+        return self._rest(method, url.path[3:], parse_qs(url.query), body)
+
+    def _oauth(self, path, body, query):
+        state = self.state
+        if path == "/oauth/devicecode":
+            return self._reply(200, {"device_code": uuid.uuid4().hex, "user_code": "MOCK-CODE",
+                                     "verification_uri": "http://127.0.0.1/mock-verify",
+                                     "expires_in": 900, "interval": 1})
+        if path == "/oauth/token":
+            grant_type = body.get("grant_type") or (query.get("grant_type") or [""])[0]
+            if grant_type == "refresh_token":
+                with state.lock:
+                    known = body.get("refresh_token") in state.refresh_tokens
+                    state.refresh_tokens.discard(body.get("refresh_token"))
+                if not known:
+                    return self._reply(400, {"reason": "Invalid Token!", "error": "invalid_request"})
+            return self._reply(200, state.issue_token())
+        return self._reply(404, {"code": 404, "message": "Not found"})
+
+    def _rest(self, method, path, query, body):
+        state = self.state
+        parts = path.strip("/").split("/")
+        if parts == ["users"] and method == "GET":
+            size = min(300, int((query.get("page_size") or ["30"])[0]))
+            number = int((query.get("page_number") or ["1"])[0])
+            start = (number - 1) * size
+            users = [{"id": f"u{i}", "email": f"user{i}@example.com", "status": "active"}
+                     for i in range(start, min(start + size, state.directory_size))]
+            return self._reply(200, {"page_count": (state.directory_size + size - 1) // size,
+                                     "page_number": number, "page_size": size,
+                                     "total_records": state.directory_size, "users": users})
+
+        user = state.user(parts[1]) if len(parts) > 1 and parts[0] == "users" else None
+        if user is None:
+            return self._reply(404, {"code": 1001, "message": "User does not exist."})
+        user_id, email = user
+
+        if len(parts) == 2 and method == "GET":
+            return self._reply(200, {"id": user_id, "email": email, "status": "active"})
+        if len(parts) == 3 and parts[2] == "assistants":
+            if method == "GET":
+                start = int((query.get("next_page_token") or ["0"])[0] or 0)
+                with state.lock:
+                    assistants = list(state.assistants.get(user_id, {}).values())
+                end = start + ASSISTANTS_PAGE_SIZE
+                return self._reply(200, {"assistants": assistants[start:end],
+                                         "next_page_token": str(end) if end < len(assistants) else ""})
+            if method == "POST":
+                emails = [a.get("email", "") for a in body.get("assistants", [])]
+                found = [state.user(e) for e in emails]
+                if not emails or None in found:
+                    return self._reply(400, {"code": 1001, "message": "User does not exist."})
+                with state.lock:
+                    current = state.assistants.setdefault(user_id, {})
+                    for assistant_id, assistant_email in found:
+                        current[assistant_id] = {"id": assistant_id, "email": assistant_email}
+                return self._reply(201, {"ids": ",".join(i for i, _ in found),
+                                         "add_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())})
+            if method == "DELETE":
+                with state.lock:
+                    state.assistants.pop(user_id, None)
+                return self._reply(204)
+        if len(parts) == 4 and parts[2] == "assistants" and method == "DELETE":
+            with state.lock:
+                removed = state.assistants.get(user_id, {}).pop(parts[3], None)
+            if removed is None:
+                return self._reply(404, {"code": 1001, "message": "Assistant does not exist."})
+            return self._reply(204)
+        return self._reply(404, {"code": 404, "message": "Not found"})
+
+    def _control(self, method, path):
+        state = self.state
+        if path == "/_stats":
+            with state.lock:
+                return self._reply(200, dict(state.calls))
+        if path == "/_reset" and method == "POST":
+            state.reset()
+            return self._reply(204)
+        return self._reply(404, {"code": 404, "message": "Not found"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class MockZoomServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Bursts of concurrent connects must not overflow the listen backlog
+    request_queue_size = 1024
+
+    def __init__(self, address=("127.0.0.1", 0), **options):
+        self.state = MockZoomState(**options)
+        handler = type("Handler", (MockZoomHandler,), {"state": self.state})
+        super().__init__(address, handler)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}/v2"
+
+    @property
+    def oauth_base_url(self):
+        return f"http://127.0.0.1:{self.server_port}/oauth"
+
+
+def start_server(port=0, **options):
+    """Start a MockZoomServer on a background thread and return it"""
+    server = MockZoomServer(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_server_arguments(parser):
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of API calls answered with 500")
+    parser.add_argument("--rate-limit", type=int, default=0,
+                        help="medium-category requests per second before 429 (0 = unlimited)")
+    parser.add_argument("--directory-size", type=int, default=10000, help="users listed by GET /users")
+
+
+def server_options(args):
+    return {"latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate,
+            "rate_limit": args.rate_limit, "directory_size": args.directory_size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--auth", action="store_true", help="require a token issued by /oauth/token")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockZoomServer(("127.0.0.1", args.port), require_auth=args.auth, **server_options(args))
+    print(f"Mock Zoom API on {server.base_url} (OAuth on {server.oauth_base_url})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -5,3 +5,46 @@
 # Get these from your Zoom App in the Zoom Marketplace
 CLIENT_ID = "your_client_id_here"
 CLIENT_SECRET = "your_client_secret_here"
+
+# Optional: how long resolved user IDs stay in .user_cache.json (seconds)
+# USER_CACHE_TTL = 86400
+# USER_CACHE_NEGATIVE_TTL = 600
+
+# Optional: number of concurrent API workers (also sizes the connection pool)
+# MAX_WORKERS = 8
+
+# Optional: assistants sent per bulk add request to the target user
+# BATCH_SIZE = 30
+
+# Optional: requests per second per Zoom rate-limit category
+# (defaults match Pro accounts; Business and above allow more)
+# RATE_LIMITS = {"light": 30, "medium": 20, "heavy": 10}
+
+# Optional: request engine, "threads" (default) or "asyncio" (needs aiohttp)
+# ENGINE = "threads"
+# ASYNC_CONCURRENCY = 100
+
+# Optional: lines kept in the GUI log (the full log is written to logs/)
+# LOG_MAX_LINES = 5000
+
+# Optional: read current assistants first and skip pairs that already exist
+# SKIP_EXISTING = True
+
+# Optional: list the account's users once and resolve emails from that index
+# (faster for large batches; needs the admin user-read scope)
+# PREFETCH_DIRECTORY = False
+# DIRECTORY_TTL = 3600
+
+# Optional: share one API rate budget with other processes (e.g. several
+# headless runs, or the GUI and a headless run) through files in this directory
+# RATE_BUDGET_DIR = "/tmp/zoom-rate-budget"
+
+# Optional: structured JSONL event log of every run in events/
+# (summarize a run with: python event_log.py)
+# EVENT_LOG = True
+# EVENT_LOG_MAX_BYTES = 10 * 1024 * 1024
+# EVENT_LOG_BACKUPS = 5
+
+# Optional: API endpoints, e.g. the local mock server in benchmarks/mock_zoom.py
+# API_BASE_URL = "https://api.zoom.us/v2"
+# OAUTH_BASE_URL = "https://zoom.us/oauth"
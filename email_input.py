@@ -0,0 +1,142 @@
+import csv
+import re
+
+
+# Deliberately loose: catches typos and stray text, not every RFC 5322 corner case
+EMAIL_PATTERN = re.compile(r"[a-z0-9.!#$%&'*+/=?^_`{|}~-]+"
+                           r"@[a-z0-9](?:[a-z0-9-]*[a-z0-9])?(?:\.[a-z0-9](?:[a-z0-9-]*[a-z0-9])?)+")
+# Entries in pasted text are separated by newlines, commas or semicolons,
+# except inside a quoted display name ("Doe, Jane" <jane@example.com>); an
+# entry without a bracketed address is also split on spaces
+ENTRY = re.compile(r'(?:"[^"]*"|[^"\r\n,;])+')
+# "Name <user@example.com>" keeps only the bracketed address
+BRACKETED = re.compile(r"<([^<>]*)>")
+# Stripped from both ends of an entry: whitespace, quotes, brackets and the
+# trailing separators Outlook and CSV exports leave behind
+ENTRY_NOISE = " \t\r\n<>\"',;"
+# Column names searched for the emails when a CSV file has a header
+EMAIL_COLUMNS = ("email", "assistant", "assistant_email", "user", "user_email", "owner", "owner_email", "member")
+# Malformed entries kept to show in the report; the rest are only counted
+MAX_SAMPLES = 5
+
+
+class InputReport:
+    """Counts of what normalization accepted and filtered out"""
+
+    def __init__(self):
+        self.accepted = 0
+        self.duplicates = 0
+        self.malformed = 0
+        self.self_assigned = 0
+        self.samples = []
+
+    @property
+    def filtered(self):
+        return self.duplicates + self.malformed + self.self_assigned
+
+    def reject_malformed(self, value):
+        self.malformed += 1
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(value)
+
+    def summary(self):
+        """One line, e.g. "120 accepted; filtered 3 duplicates, 1 malformed (bob@), 2 self-assignments" """
+        parts = []
+        if self.duplicates:
+            parts.append(f"{self.duplicates} duplicates")
+        if self.malformed:
+            more = ", ..." if self.malformed > len(self.samples) else ""
+            parts.append(f"{self.malformed} malformed ({', '.join(self.samples)}{more})")
+        if self.self_assigned:
+            parts.append(f"{self.self_assigned} self-assignments")
+        return f"{self.accepted} accepted" + (f"; filtered {', '.join(parts)}" if parts else "")
+
+
+def normalize_email(value):
+    """Lowercase an address and strip whitespace, quotes, brackets, separators and a mailto: prefix"""
+    email = value.strip(ENTRY_NOISE).lower()
+    return email[len("mailto:"):].strip(ENTRY_NOISE) if email.startswith("mailto:") else email
+
+
+def is_valid_email(email):
+    return EMAIL_PATTERN.fullmatch(email) is not None
+
+
+def split_entries(lines):
+    """Yield raw entries from lines of pasted or comma/semicolon-separated text"""
+    for line in lines:
+        for part in ENTRY.findall(line):
+            for entry in BRACKETED.findall(part) or part.split():
+                if entry.strip():
+                    yield entry
+
+
+def read_entries(path, column=None):
+    """Yield raw entries from a text or CSV file, one line at a time
+
+    If the first row is a header naming column (or a usual email column),
+    only that column is read; otherwise every cell is split like pasted text.
+    """
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        index = None
+        for row in reader:
+            if reader.line_num == 1 and not any("@" in cell for cell in row):
+                header = [cell.strip().lower() for cell in row]
+                names = (column.lower(),) if column else EMAIL_COLUMNS
+                index = next((header.index(name) for name in names if name in header), None)
+                if index is None and column:
+                    raise ValueError(f"No column named {column!r} in {path}")
+                continue
+            if index is not None:
+                if len(row) > index and row[index].strip():
+                    yield row[index]
+            else:
+                yield from split_entries(row)
+
+
+def normalize_emails(entries, exclude=(), report=None):
+    """Yield valid, lowercased, first-seen-unique emails from raw entries
+
+    Emails in exclude (e.g. the target user) are dropped as self-assignments.
+    Runs lazily: memory grows only with the number of distinct addresses.
+    """
+    report = report if report is not None else InputReport()
+    excluded = {normalize_email(email) for email in exclude}
+    seen = set()
+    for entry in entries:
+        email = normalize_email(entry)
+        if not email:
+            continue
+        if not is_valid_email(email):
+            report.reject_malformed(entry.strip())
+        elif email in excluded:
+            report.self_assigned += 1
+        elif email in seen:
+            report.duplicates += 1
+        else:
+            seen.add(email)
+            report.accepted += 1
+            yield email
+
+
+def normalize_pairs(pairs, report=None):
+    """Yield valid, lowercased, unique (target, assistant) pairs, dropping self-pairs
+
+    Pairs are written in both directions, so (a, b) after (b, a) is a duplicate.
+    """
+    report = report if report is not None else InputReport()
+    seen = set()
+    for target, assistant in pairs:
+        target, assistant = normalize_email(target), normalize_email(assistant)
+        malformed = [email for email in (target, assistant) if not is_valid_email(email)]
+        if malformed:
+            report.reject_malformed(malformed[0])
+        elif target == assistant:
+            report.self_assigned += 1
+        elif (assistant, target) in seen or (target, assistant) in seen:
+            report.duplicates += 1
+        else:
+            seen.add((target, assistant))
+            report.accepted += 1
+            yield target, assistant
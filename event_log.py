@@ -0,0 +1,241 @@
+"""Structured JSONL event stream of runs, lookups, writes, retries and auth events
+
+Every record is one JSON object per line with a timestamp, the run ID it
+belongs to and an event type, e.g.
+
+    {"ts": 1760668800.12, "run": "3f9c0a1b2d4e", "event": "pair", "owner": "...",
+     "assistant": "...", "status": "added", "attempts": 1, "latency": 0.182}
+
+Summarize a run from the command line:
+
+    python event_log.py                  # the latest run
+    python event_log.py --run 3f9c0a1b2d4e --json
+"""
+import argparse
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from file_lock import FileLock
+
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024   # Rotate the active file beyond this size
+DEFAULT_BACKUPS = 5                     # Rotated files kept: events.1.jsonl ... events.N.jsonl
+FLUSH_INTERVAL = 0.5                    # Seconds the writer waits to fill a batch
+EVENTS_FILE = "events.jsonl"
+
+# Field that distinguishes outcomes within each event type
+OUTCOME_FIELDS = {"pair": "status", "lookup": "outcome", "retry": "reason", "auth": "action",
+                  "inventory": "outcome", "control": "action"}
+
+
+class EventLog:
+    """Queues event records and writes them from one background thread
+
+    emit() only enqueues, so worker, event-loop and UI threads never touch
+    the disk. The writer drains the queue in batches, appends them to
+    events.jsonl and rotates it once it exceeds max_bytes. Several
+    processes (shard workers) may share the directory: each batch is
+    written and rotated under events.jsonl.lock, and a writer whose file
+    was rotated away by another process reopens the new one.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, backups=DEFAULT_BACKUPS):
+        self.directory = directory
+        self.path = os.path.join(directory, EVENTS_FILE)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        # Stamped on every record until the next begin_run()
+        self.run_id = None
+        self._queue = queue.SimpleQueue()
+        self._file = None
+        self._file_lock = FileLock(self.path + ".lock")
+        self._thread = threading.Thread(target=self._write_loop, name="event-log", daemon=True)
+        self._thread.start()
+
+    def emit(self, event, **fields):
+        """Queue one record; safe to call from any thread"""
+        self._queue.put({"ts": round(time.time(), 3), "run": self.run_id, "event": event, **fields})
+
+    def begin_run(self, kind, **fields):
+        """Start a new run ID for the records that follow; returns it"""
+        self.run_id = uuid.uuid4().hex[:12]
+        self.emit("run_start", kind=kind, **fields)
+        return self.run_id
+
+    def end_run(self, **fields):
+        self.emit("run_end", **fields)
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while batch[-1] is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            records = [record for record in batch if record is not None]
+            if records:
+                self._write(records)
+            if stop:
+                if self._file is not None:
+                    self._file.close()
+                self._file_lock.close()
+                return
+
+    def _write(self, records):
+        # json.dumps escapes non-ASCII, so characters are bytes
+        lines = [json.dumps(record, default=str) + "\n" for record in records]
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with self._file_lock:
+                size = self._open()
+                chunk = []
+                for line in lines:
+                    chunk.append(line)
+                    size += len(line)
+                    if size >= self.max_bytes:
+                        self._file.write("".join(chunk))
+                        self._rotate()
+                        size, chunk = self._open(), []
+                self._file.write("".join(chunk))
+                self._file.flush()
+        except Exception as e:
+            print(f"Error writing event log: {e}")
+
+    def _open(self):
+        """Open the active file if needed, or again if another process rotated it; returns its size"""
+        if self._file is not None:
+            try:
+                current = os.stat(self.path).st_ino == os.fstat(self._file.fileno()).st_ino
+            except FileNotFoundError:
+                current = False
+            if not current:
+                self._file.close()
+                self._file = None
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        # Other processes append too, so the position of this handle is not the size
+        return os.fstat(self._file.fileno()).st_size
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        root, ext = os.path.splitext(self.path)
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{root}.{index}{ext}"
+            if os.path.exists(older):
+                os.replace(older, f"{root}.{index + 1}{ext}")
+        if self.backups:
+            os.replace(self.path, f"{root}.1{ext}")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        """Write everything still queued and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+
+def event_files(directory):
+    """The active file and its rotations, oldest first"""
+    root, ext = os.path.splitext(os.path.join(directory, EVENTS_FILE))
+    rotated = sorted(glob.glob(f"{glob.escape(root)}.*{ext}"),
+                     key=lambda path: int(path[len(root) + 1:-len(ext)] or 0), reverse=True)
+    active = [f"{root}{ext}"] if os.path.exists(f"{root}{ext}") else []
+    return rotated + active
+
+
+def read_events(directory, run_id=None):
+    """Yield the records in directory, oldest first, optionally for one run only"""
+    for path in event_files(directory):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if run_id is None or record.get("run") == run_id:
+                    yield record
+
+
+def latest_run(directory):
+    """ID of the most recently started run, or None"""
+    run_id = None
+    for record in read_events(directory):
+        if record.get("event") == "run_start":
+            run_id = record.get("run")
+    return run_id
+
+
+def aggregate(records):
+    """Per event type and outcome: count and latency totals, plus the run's start and end"""
+    summary = {"run": None, "kind": None, "started": None, "ended": None, "events": {}}
+    groups = defaultdict(lambda: {"count": 0, "latency_sum": 0.0, "latency_max": 0.0, "timed": 0})
+    for record in records:
+        event = record.get("event")
+        summary["run"] = summary["run"] or record.get("run")
+        if event == "run_start":
+            summary["kind"], summary["started"] = record.get("kind"), record.get("ts")
+            continue
+        if event == "run_end":
+            summary["ended"] = record.get("ts")
+            continue
+        group = groups[(event, str(record.get(OUTCOME_FIELDS.get(event, ""), "")))]
+        group["count"] += 1
+        latency = record.get("latency")
+        if latency is not None:
+            group["timed"] += 1
+            group["latency_sum"] += latency
+            group["latency_max"] = max(group["latency_max"], latency)
+    for (event, outcome), group in sorted(groups.items()):
+        timed = group.pop("timed")
+        group["latency_avg"] = group["latency_sum"] / timed if timed else None
+        summary["events"].setdefault(event, {})[outcome or "-"] = group
+    if summary["started"] is not None and summary["ended"] is not None:
+        summary["seconds"] = summary["ended"] - summary["started"]
+    return summary
+
+
+def main(argv=None):
+    from settings import EVENT_LOG_DIR
+
+    parser = argparse.ArgumentParser(description="Summarize one run from the event log")
+    parser.add_argument("--dir", default=EVENT_LOG_DIR, help="event log directory")
+    parser.add_argument("--run", help="run ID (default: the latest run)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    run_id = args.run or latest_run(args.dir)
+    if run_id is None:
+        print(f"No runs in {args.dir}", file=sys.stderr)
+        return 1
+    summary = aggregate(read_events(args.dir, run_id))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    duration = f" in {summary['seconds']:.1f}s" if "seconds" in summary else ""
+    print(f"Run {run_id} ({summary['kind'] or 'unknown'}){duration}")
+    for event, outcomes in summary["events"].items():
+        for outcome, group in outcomes.items():
+            latency = (f"avg {group['latency_avg'] * 1000:.0f} ms, max {group['latency_max'] * 1000:.0f} ms"
+                       if group["latency_avg"] is not None else "")
+            print(f"  {event:<10}{outcome:<22}{group['count']:>8}  {latency}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import os
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Exclusive advisory lock on a file, shared by every process on the machine
+
+    The file is opened once and kept open; fd can be used to read and
+    write it while the lock is held. The lock belongs to the open file, not
+    to a thread, so threads of one process must also hold a thread lock
+    around it. It is not reentrant.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def acquire(self):
+        if self.fd is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            return
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                # Locks the first byte; LK_LOCK gives up after about 10 seconds
+                msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def release(self):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
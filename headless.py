@@ -0,0 +1,577 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+from assistant_engine import ENGINES, INVENTORY_TOP_ASSISTANTS, create_engine
+from email_input import InputReport, normalize_email, normalize_emails, normalize_pairs, read_entries
+from run_journal import RunJournal
+from event_log import EventLog
+from settings import EVENT_LOG_DIR, JOURNAL_DIR, TOKEN_CACHE_FILE, USER_CACHE_FILE, load_settings
+from token_manager import TokenManager
+import token_cache
+
+
+DEFAULT_CHUNK_SIZE = 1000
+# Worker processes started by the shard command
+DEFAULT_PROCESSES = 4
+# Outcomes that leave the exit code at 0
+OK_STATUSES = {"added", "present", "planned", "removed", "planned_removal"}
+
+# Column names accepted for the two sides of a pair
+TARGET_COLUMNS = ("target", "target_email", "owner", "owner_email", "user", "user_email")
+ASSISTANT_COLUMNS = ("assistant", "assistant_email")
+
+
+def log_message(message):
+    """Write a timestamped message to stderr, matching the GUI log format"""
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    print(f"[{timestamp}] {message}", file=sys.stderr, flush=True)
+
+
+def _open_input(path):
+    if path == "-":
+        return sys.stdin
+    return open(path, 'r', newline='', encoding='utf-8-sig')
+
+
+def _input_format(path, fmt):
+    if fmt:
+        return fmt
+    return "jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def _pick(row, names):
+    for name in names:
+        value = row.get(name)
+        if value:
+            return value.strip()
+    return ""
+
+
+def read_pairs(path, fmt=None):
+    """Yield (target_email, assistant_email) tuples lazily from a CSV or JSONL file
+
+    CSV files may have a header naming the target and assistant columns;
+    without one the first two columns are used.
+    """
+    fmt = _input_format(path, fmt)
+    f = _open_input(path)
+    try:
+        if fmt == "jsonl":
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                row = {k.lower(): v for k, v in json.loads(line).items() if isinstance(v, str)}
+                target, assistant = _pick(row, TARGET_COLUMNS), _pick(row, ASSISTANT_COLUMNS)
+                if target and assistant:
+                    yield target, assistant
+            return
+
+        reader = csv.reader(f)
+        target_col, assistant_col = 0, 1
+        for row in reader:
+            if not row or not any(cell.strip() for cell in row):
+                continue
+            header = [cell.strip().lower() for cell in row]
+            if reader.line_num == 1 and not any("@" in cell for cell in header):
+                target_col = next((header.index(c) for c in TARGET_COLUMNS if c in header), 0)
+                assistant_col = next((header.index(c) for c in ASSISTANT_COLUMNS if c in header), 1)
+                continue
+            if len(row) <= max(target_col, assistant_col):
+                continue
+            target, assistant = row[target_col].strip(), row[assistant_col].strip()
+            if target and assistant:
+                yield target, assistant
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def chunked(iterable, size):
+    """Yield lists of up to size items without materializing the whole input"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class RecordWriter:
+    """Streams records to CSV, a JSON document or JSONL, chosen by file extension
+
+    A .json file is {"<key>": [records...], ...extra}, with the extra fields
+    (e.g. a summary) given to close(); records are still written as they come.
+    """
+
+    def __init__(self, path, fields, key="records"):
+        self.path = path
+        self.fields = fields
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._csv = None
+        self._json = path.lower().endswith(".json")
+        self._count = 0
+        if path.lower().endswith(".csv"):
+            self._csv = csv.DictWriter(self._file, fieldnames=fields)
+            self._csv.writeheader()
+        elif self._json:
+            self._file.write(f'{{{json.dumps(key)}: [')
+
+    def write_record(self, record):
+        if self._csv:
+            self._csv.writerow(record)
+        elif self._json:
+            self._file.write(("," if self._count else "") + "\n  " + json.dumps(record))
+        else:
+            self._file.write(json.dumps(record) + "\n")
+        self._count += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self, extra=None):
+        if self._json and not self._file.closed:
+            self._file.write("\n]")
+            for name, value in (extra or {}).items():
+                self._file.write(f", {json.dumps(name)}: {json.dumps(value)}")
+            self._file.write("}\n")
+        self._file.close()
+
+
+class ResultWriter(RecordWriter):
+    """Writes one record per pair outcome and counts the outcomes"""
+
+    FIELDS = ("owner", "assistant", "status", "error")
+
+    def __init__(self, path):
+        super().__init__(path, self.FIELDS, key="results")
+        self.counts = Counter()
+
+    def write(self, owner, assistant, status, error=None):
+        self.counts[status] += 1
+        self.write_record({"owner": owner, "assistant": assistant, "status": status, "error": error})
+
+
+class InventoryWriter(RecordWriter):
+    """Writes the rows of an inventory report; the summary goes into .json files"""
+
+    FIELDS = ("owner", "assistant", "assistant_id", "error")
+
+    def __init__(self, path):
+        super().__init__(path, self.FIELDS, key="assistants")
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write_record({"owner": row.owner_email, "assistant": row.assistant_email,
+                               "assistant_id": row.assistant_id, "error": row.error})
+        self.flush()
+
+
+def run_pairs(engine, pairs, writer, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, journal=None):
+    """Process (target, assistant) pairs chunk by chunk, one engine run per target
+
+    Each target's pairs are planned in journal, if given, before they are written.
+    """
+    for chunk in chunked(pairs, chunk_size):
+        # Group by target, keeping first-seen order of targets and assistants
+        groups = {}
+        for target, assistant in chunk:
+            groups.setdefault(target, {})[assistant] = None
+
+        for target, assistants in groups.items():
+            emails = list(assistants)
+            if journal is not None:
+                journal.plan(target, emails)
+            results = engine.run(target, emails, dry_run, journal)
+            if results is None:
+                for email in emails:
+                    writer.write(target, email, "not_found", f"Target user not found: {target}")
+                continue
+
+            written = set()
+            for result in results:
+                writer.write(result.owner_email, result.assistant_email, result.status, result.error)
+                written.add(result.assistant_email if result.owner_email == target else result.owner_email)
+            for email in emails:
+                if email not in written:
+                    writer.write(target, email, "not_found", f"User not found: {email}")
+        writer.flush()
+        engine.user_cache.flush()
+
+
+def _open_engine(args):
+    """Engine and TokenManager set up from args and the cached token, or None after logging why"""
+    settings = load_settings()
+    if args.workers:
+        settings.max_workers = args.workers
+    if args.batch_size:
+        settings.batch_size = args.batch_size
+    if args.engine:
+        settings.engine = args.engine
+    if args.no_skip_existing:
+        settings.skip_existing = False
+    if args.prefetch_directory:
+        settings.prefetch_directory = True
+    if args.rate_budget:
+        settings.rate_budget_dir = args.rate_budget
+
+    token_data = token_cache.load_token()
+    if not token_data:
+        log_message("No valid cached token. Authenticate in the GUI first.")
+        return None
+
+    log = log_message if not args.quiet else (lambda message: None)
+    events = None
+    if settings.event_log:
+        events = EventLog(EVENT_LOG_DIR, settings.event_log_max_bytes, settings.event_log_backups)
+        events.begin_run(args.command, engine=settings.engine)
+    try:
+        engine = create_engine(settings, log, USER_CACHE_FILE, events)
+    except RuntimeError as e:
+        log_message(str(e))
+        if events is not None:
+            events.close()
+        return None
+    # Refresh the token in the background so long runs outlive it. The cache
+    # is shared, so parallel runs (see shard) refresh it only once between them.
+    tokens = TokenManager(engine.client, settings.client_id, settings.client_secret, log_message,
+                          events=events, cache_path=TOKEN_CACHE_FILE)
+    tokens.set_tokens(token_data.get('access_token'), token_data.get('refresh_token'),
+                      token_data.get('expires_at'))
+    if (token_data.get('expires_at') or 0) <= time.time() and not tokens.refresh(token_data.get('access_token')):
+        log_message("Cached token expired and could not be refreshed. Authenticate in the GUI again.")
+        _close_engine(engine, tokens, outcome="auth_failed")
+        return None
+    return engine, tokens
+
+
+def _close_engine(engine, tokens, **outcome):
+    """Stop the token refresh, close the engine and end the run in the event log"""
+    tokens.stop()
+    engine.close()
+    if engine.events is not None:
+        engine.events.end_run(**outcome)
+        engine.events.close()
+
+
+def _log_api_stats(args, engine):
+    saved = engine.client.scheduler.metrics.total("coalesced")
+    if saved:
+        log_message(f"{saved} duplicate lookups shared an in-flight request")
+    if args.metrics:
+        engine.client.scheduler.metrics.dump(args.metrics)
+        log_message(f"API metrics written to {args.metrics}")
+
+
+def _execute(args, work, output, open_journal=None, report=None):
+    """Set up the engine from args, call work(engine, writer, journal) and summarize the outcomes
+
+    open_journal, if given, is called only once the engine is ready, so a
+    bad config or expired login leaves no empty journal for resume to find;
+    without it journal is None. report is the InputReport of the input
+    being processed, if any.
+    """
+    opened = _open_engine(args)
+    if opened is None:
+        return 2
+    engine, tokens = opened
+    journal = open_journal() if open_journal is not None else None
+
+    writer = ResultWriter(output)
+    try:
+        work(engine, writer, journal)
+    finally:
+        writer.close()
+        _close_engine(engine, tokens, counts=dict(writer.counts))
+        if journal is not None:
+            journal.close()
+
+    if report is not None and report.filtered:
+        log_message(f"Input: {report.summary()}")
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(writer.counts.items()))
+    log_message(f"Process completed! {summary or 'no pairs'}")
+    log_message(f"Results written to {output}")
+    _log_api_stats(args, engine)
+    if journal is not None and journal.pending_count():
+        log_message(f"{journal.pending_count()} pairs pending; finish them with: resume --journal {journal.path}")
+    return 0 if set(writer.counts) <= OK_STATUSES else 1
+
+
+def cmd_run(args):
+    output = args.output or f"{os.path.splitext(args.input)[0] if args.input != '-' else 'stdin'}.results.jsonl"
+    # Malformed, duplicate and self-pairs are dropped before any request is made
+    report = InputReport()
+    pairs = normalize_pairs(read_pairs(args.input, args.format), report)
+
+    def open_journal():
+        journal = RunJournal(args.journal) if args.journal else RunJournal.create(JOURNAL_DIR)
+        log_message(f"Journal: {journal.path}")
+        return journal
+
+    return _execute(args, lambda engine, writer, journal: run_pairs(engine, pairs, writer, args.chunk_size,
+                                                                    args.dry_run, journal),
+                    output, None if args.dry_run else open_journal, report)
+
+
+def read_groups(path, report=None):
+    """Return [(group, [members])] from a file of emails, one per row
+
+    A row with two columns is read as group,email; rows without a group
+    form a single group. Members are normalized into report, if given.
+    """
+    groups = {}
+    f = _open_input(path)
+    try:
+        for row in csv.reader(f):
+            cells = [cell.strip() for cell in row if cell.strip()]
+            if not cells or not any("@" in cell for cell in cells):
+                continue
+            group, email = (cells[0], cells[1]) if len(cells) > 1 else ("", cells[0])
+            groups.setdefault(group, []).append(email)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    report = report if report is not None else InputReport()
+    return [(group, list(normalize_emails(members, report=report))) for group, members in groups.items()]
+
+
+def mesh_groups(engine, groups, writer, dry_run=False, journal=None):
+    """Mesh each (group, members) and write every pair's outcome"""
+    for group, members in groups:
+        engine.log(f"Mesh {group or 'group'}: {len(members)} members")
+        if journal is not None:
+            for email in members:
+                journal.plan(email, [other for other in members if other != email])
+        for result in engine.run_mesh(members, dry_run, journal):
+            writer.write(result.owner_email, result.assistant_email, result.status, result.error)
+        writer.flush()
+        engine.user_cache.flush()
+
+
+def read_state(path, fmt=None, report=None):
+    """Desired state {owner: [assistants]} from a JSON object or a CSV/JSONL pairs file
+
+    Only the JSON form can give an owner an empty list, i.e. remove all of
+    its assistants. Assistant lists are normalized into report, if given.
+    """
+    if path.lower().endswith(".json") and fmt is None:
+        f = _open_input(path)
+        try:
+            raw = json.load(f)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+    else:
+        raw = {}
+        for owner, assistant in read_pairs(path, fmt):
+            raw.setdefault(owner, []).append(assistant)
+    report = report if report is not None else InputReport()
+    state = {}
+    for owner, assistants in raw.items():
+        owner = normalize_email(owner)
+        state[owner] = state.get(owner, []) + list(normalize_emails(assistants, [owner], report))
+    return state
+
+
+def sync_state(engine, state, writer, dry_run=False, remove=True):
+    """Enforce the desired state and write every pair's outcome"""
+    for result in engine.sync(state, dry_run, remove):
+        writer.write(result.owner_email, result.assistant_email, result.status, result.error)
+    writer.flush()
+    engine.user_cache.flush()
+
+
+def cmd_sync(args):
+    output = args.output or f"{os.path.splitext(args.input)[0] if args.input != '-' else 'stdin'}.results.jsonl"
+    report = InputReport()
+    state = read_state(args.input, args.format, report)
+    return _execute(args, lambda engine, writer, journal: sync_state(engine, state, writer, args.dry_run,
+                                                                     not args.keep_unlisted), output, report=report)
+
+
+def cmd_mesh(args):
+    output = args.output or f"{os.path.splitext(args.input)[0] if args.input != '-' else 'stdin'}.results.jsonl"
+    report = InputReport()
+    groups = read_groups(args.input, report)
+    return _execute(args, lambda engine, writer, journal: mesh_groups(engine, groups, writer, args.dry_run, journal),
+                    output, None if args.dry_run else lambda: RunJournal.create(JOURNAL_DIR), report)
+
+
+def cmd_inventory(args):
+    output = args.output or f"{os.path.splitext(args.input)[0]}.inventory.csv"
+    report = InputReport()
+    owners = list(normalize_emails(read_entries(args.input, args.column), report=report))
+    if report.filtered:
+        log_message(f"Input: {report.summary()}")
+    opened = _open_engine(args)
+    if opened is None:
+        return 2
+    engine, tokens = opened
+
+    writer = InventoryWriter(output)
+    summary = None
+    try:
+        summary = engine.inventory(owners, writer.write_rows)
+    finally:
+        writer.close({"summary": summary.as_dict()} if summary is not None else None)
+        engine.user_cache.flush()
+        _close_engine(engine, tokens, summary=summary.as_dict() if summary is not None else None)
+
+    log_message(f"Inventory: {summary}")
+    for email, count in summary.delegations.most_common(INVENTORY_TOP_ASSISTANTS):
+        log_message(f"  {email} assists {count} owners")
+    log_message(f"Report written to {output}")
+    _log_api_stats(args, engine)
+    return 0 if not summary.not_found and not summary.failed else 1
+
+
+def cmd_resume(args):
+    if args.journal:
+        # RunJournal would create a missing file, and a typo would then look like a finished run
+        if not os.path.isfile(args.journal):
+            log_message(f"No journal at {args.journal}")
+            return 2
+        journal = RunJournal(args.journal)
+    else:
+        journal = RunJournal.latest_pending(JOURNAL_DIR)
+        if journal is None:
+            log_message(f"No journal with pending pairs in {JOURNAL_DIR}")
+            return 0
+    pending = journal.pending_count()
+    log_message(f"Resuming {journal.path}: {pending} pairs pending")
+    if not pending:
+        journal.close()
+        return 0
+
+    output = args.output or f"{os.path.splitext(journal.path)[0]}.results.jsonl"
+    pairs = [(target, email) for target, emails in journal.pending() for email in emails]
+    try:
+        return _execute(args, lambda engine, writer, journal: run_pairs(engine, pairs, writer, args.chunk_size,
+                                                                        journal=journal), output, lambda: journal)
+    finally:
+        # _execute closes it after a run, but not when the engine fails to open
+        journal.close()
+
+
+def cmd_shard(args):
+    # Imported here: shard_runner builds on this module
+    from shard_runner import run_sharded
+    return run_sharded(args)
+
+
+def _add_engine_arguments(parser):
+    parser.add_argument("--workers", type=int, help="concurrent API workers (default: MAX_WORKERS)")
+    parser.add_argument("--engine", choices=ENGINES, help="request engine (default: ENGINE)")
+    parser.add_argument("--batch-size", type=int, help="assistants per bulk add (default: BATCH_SIZE)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="input rows read ahead at a time")
+    parser.add_argument("--no-skip-existing", action="store_true",
+                        help="write every pair instead of first reading current assistants")
+    parser.add_argument("--prefetch-directory", action="store_true",
+                        help="resolve emails from one paged user listing (default: PREFETCH_DIRECTORY)")
+    parser.add_argument("--rate-budget", metavar="DIR",
+                        help="share the API rate budget with other processes using DIR (default: RATE_BUDGET_DIR)")
+    parser.add_argument("--metrics", help="write per-endpoint API metrics here (.json, or .prom for Prometheus text)")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m zoom_assistant_manager",
+        description="Headless batch mode for Zoom Assistant Manager",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser(
+        "run", help="add assistant pairs from a CSV or JSONL file",
+        description="Each row names a target and an assistant. The assistant is added to "
+                    "the target and the target is added to the assistant, as in the GUI.",
+    )
+    run.add_argument("--input", required=True, help="pairs file (CSV or JSONL), or - for stdin")
+    run.add_argument("--format", choices=("csv", "jsonl"), help="input format (default: by extension)")
+    run.add_argument("--output", help="results file, .jsonl or .csv (default: <input>.results.jsonl)")
+    run.add_argument("--dry-run", action="store_true",
+                     help="report the writes that would be made without making them")
+    run.add_argument("--journal", help="journal file to record progress in (default: a new file in journals/)")
+    _add_engine_arguments(run)
+    run.set_defaults(func=cmd_run)
+
+    shard = subparsers.add_parser(
+        "shard", help="run a large pairs file in several worker processes",
+        description="Splits the pairs by owner into one file per process and runs each as its "
+                    "own headless run. The processes share the token cache and one API rate "
+                    "budget, so more processes raise throughput up to the account's rate limit.",
+    )
+    shard.add_argument("--input", required=True, help="pairs file (CSV or JSONL), or - for stdin")
+    shard.add_argument("--format", choices=("csv", "jsonl"), help="input format (default: by extension)")
+    shard.add_argument("--output", help="merged results file, .jsonl or .csv (default: <input>.results.jsonl)")
+    shard.add_argument("--processes", type=int, default=DEFAULT_PROCESSES,
+                       help=f"worker processes (default: {DEFAULT_PROCESSES})")
+    shard.add_argument("--dry-run", action="store_true",
+                       help="report the writes that would be made without making them")
+    _add_engine_arguments(shard)
+    shard.set_defaults(func=cmd_shard)
+
+    mesh = subparsers.add_parser(
+        "mesh", help="make every member of a group an assistant of every other member",
+        description="Reads one email per row, or group,email rows for several groups. Each "
+                    "member is looked up once and gets its missing assistants in bulk requests.",
+    )
+    mesh.add_argument("--input", required=True, help="members file, or - for stdin")
+    mesh.add_argument("--output", help="results file, .jsonl or .csv (default: <input>.results.jsonl)")
+    mesh.add_argument("--dry-run", action="store_true",
+                      help="report the writes that would be made without making them")
+    _add_engine_arguments(mesh)
+    mesh.set_defaults(func=cmd_mesh)
+
+    sync = subparsers.add_parser(
+        "sync", help="make each owner's assistants exactly match a desired-state file",
+        description="Adds listed assistants that are missing and removes assistants that are "
+                    "not listed. The file is a JSON object {owner: [assistants]} or a CSV/JSONL "
+                    "pairs file as for run. An unchanged state only costs reads.",
+    )
+    sync.add_argument("--input", required=True, help="desired state file (JSON, CSV or JSONL)")
+    sync.add_argument("--format", choices=("csv", "jsonl"), help="pairs format (default: by extension)")
+    sync.add_argument("--output", help="results file, .jsonl or .csv (default: <input>.results.jsonl)")
+    sync.add_argument("--dry-run", action="store_true",
+                      help="report the adds and removals that would be made without making them")
+    sync.add_argument("--keep-unlisted", action="store_true", help="only add; never remove assistants")
+    _add_engine_arguments(sync)
+    sync.set_defaults(func=cmd_sync)
+
+    inventory = subparsers.add_parser(
+        "inventory", help="report the assistants of many owners",
+        description="Reads the assistant lists of every listed owner concurrently and streams "
+                    "one row per assistant to a CSV, JSON or JSONL report, then prints a summary.",
+    )
+    inventory.add_argument("--input", required=True,
+                           help="owners file: one email per line, comma-separated, or a CSV with an email column")
+    inventory.add_argument("--column", help="CSV column holding the owner emails (default: email, user, ...)")
+    inventory.add_argument("--output", help="report file, .csv, .json or .jsonl (default: <input>.inventory.csv)")
+    _add_engine_arguments(inventory)
+    inventory.set_defaults(func=cmd_inventory)
+
+    resume = subparsers.add_parser(
+        "resume", help="finish the pending and failed pairs of an interrupted run",
+        description="Reloads a run journal and runs only the pairs that were planned "
+                    "but not completed. Works for GUI and headless runs alike.",
+    )
+    resume.add_argument("--journal", help="journal file (default: the newest one with pending pairs)")
+    resume.add_argument("--output", help="results file, .jsonl or .csv (default: <journal>.results.jsonl)")
+    _add_engine_arguments(resume)
+    resume.set_defaults(func=cmd_resume, dry_run=False)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
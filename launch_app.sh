@@ -10,6 +10,11 @@ cd "$SCRIPT_DIR"
 echo "🚀 Starting Zoom Assistant Manager..."
 echo "📁 Working directory: $SCRIPT_DIR"
 
+# Records what the last successful dependency check saw; while it still
+# matches, later launches skip the pip and import checks. Set FULL_CHECK=1
+# to force them.
+STAMP_FILE=".venv/.deps_checked"
+
 # Function to check if Python is available
 check_python() {
     if command -v python3 &> /dev/null; then
@@ -84,6 +89,31 @@ install_requirements() {
     echo "✅ All requirements checked"
 }
 
+# Fingerprint of everything the dependency checks depend on
+deps_fingerprint() {
+    { python --version 2>&1; cat requirements.txt 2>/dev/null; } | cksum
+}
+
+# Remember a successful check so the next launch can take the fast path
+save_stamp() {
+    if python -c "import requests" 2>/dev/null; then
+        deps_fingerprint > "$STAMP_FILE"
+    fi
+}
+
+# Fast path: activate the existing venv and launch if nothing changed
+try_fast_path() {
+    if [ -n "$FULL_CHECK" ] || [ ! -f "$STAMP_FILE" ] || [ ! -f ".venv/bin/activate" ]; then
+        return 1
+    fi
+    source .venv/bin/activate || return 1
+    if [ "$(deps_fingerprint)" != "$(cat "$STAMP_FILE")" ]; then
+        return 1
+    fi
+    echo "✅ Dependencies unchanged since last check (FULL_CHECK=1 to re-check)"
+    return 0
+}
+
 # Function to run the application
 run_app() {
     echo "🎯 Launching Zoom Assistant Manager..."
@@ -94,6 +124,7 @@ run_app() {
     if [ $? -ne 0 ]; then
         echo ""
         echo "❌ Application exited with an error"
+        echo "   If a package is missing, relaunch with FULL_CHECK=1 ./launch_app.sh"
         read -p "Press Enter to exit..."
     fi
 }
@@ -104,10 +135,17 @@ echo "       Zoom Assistant Manager Launcher"
 echo "=================================================="
 echo ""
 
+if try_fast_path; then
+    echo ""
+    run_app
+    exit
+fi
+
 check_python
 setup_venv
 activate_venv
 setup_pip
 install_requirements
+save_stamp
 echo ""
 run_app
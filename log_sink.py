@@ -0,0 +1,63 @@
+import os
+import queue
+from datetime import datetime
+
+
+DEFAULT_MAX_LINES = 5000     # Lines kept in the log widget
+DRAIN_INTERVAL_MS = 100      # How often the Tk main loop drains the queue
+
+
+class LogSink:
+    """Thread-safe log queue that worker threads write to and the UI drains in batches
+
+    write() only enqueues, so logging never waits on Tk. drain() returns
+    everything queued since the last call, appends it to the history file,
+    and keeps only the most recent max_lines in memory for display.
+    """
+
+    def __init__(self, history_path=None, max_lines=DEFAULT_MAX_LINES):
+        self.history_path = history_path
+        self.max_lines = max_lines
+        self._queue = queue.SimpleQueue()
+        self._history = None
+
+    def write(self, message):
+        """Queue a timestamped message; safe to call from any thread"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self._queue.put(f"[{timestamp}] {message}")
+
+    def drain(self):
+        """Return (lines, dropped): the newest lines to show, and how many older ones were skipped"""
+        lines = []
+        try:
+            while True:
+                lines.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not lines:
+            return [], 0
+
+        self._write_history(lines)
+        if len(lines) > self.max_lines:
+            return lines[-self.max_lines:], len(lines) - self.max_lines
+        return lines, 0
+
+    def _write_history(self, lines):
+        """Append the full, untrimmed log to the history file"""
+        if not self.history_path:
+            return
+        try:
+            if self._history is None:
+                os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+                self._history = open(self.history_path, 'a', encoding='utf-8')
+            self._history.write("\n".join(lines) + "\n")
+            self._history.flush()
+        except Exception as e:
+            print(f"Error writing log history: {e}")
+            self.history_path = None
+
+    def close(self):
+        if self._history is not None:
+            self._history.close()
+            self._history = None
+
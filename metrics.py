@@ -0,0 +1,174 @@
+import json
+import random
+import threading
+from collections import Counter
+
+
+# Latency samples kept per endpoint for percentiles (reservoir sampling beyond this)
+RESERVOIR_SIZE = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def endpoint_name(method, path):
+    """Group a request under its endpoint template, e.g. GET /users/{id}/assistants"""
+    if path.startswith("http"):
+        path = "/" + path.split("://", 1)[1].split("/", 1)[-1]
+    parts = path.split("?", 1)[0].split("/")
+    for i in range(1, len(parts)):
+        if parts[i - 1] in ("users", "assistants") and parts[i] != "me":
+            parts[i] = "{id}"
+    # Drop the API version prefix so names do not depend on the base URL
+    if len(parts) > 1 and parts[1] == "v2":
+        del parts[1]
+    return f"{method} {'/'.join(parts)}"
+
+
+def response_sizes(response):
+    """(bytes sent, bytes received) for a requests or AsyncResponse object"""
+    request = getattr(response, "request", None)
+    body = getattr(request, "body", None) if request is not None else getattr(response, "sent", None)
+    sent = body if isinstance(body, int) else len(body or b"")
+    return sent, len(response.content or b"")
+
+
+def _quantile(sorted_samples, q):
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(q * len(sorted_samples)))]
+
+
+class EndpointMetrics:
+    """Counters and a latency sample for one endpoint"""
+
+    def __init__(self):
+        self.count = 0
+        self.statuses = Counter()
+        self.retries = 0
+        # Calls saved by joining an identical request already in flight
+        self.coalesced = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency_sum = 0.0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.samples = []
+
+    def observe(self, status, latency, wait, sent, received):
+        self.count += 1
+        self.statuses[str(status)] += 1
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.latency_sum += latency
+        self.wait_sum += wait
+        self.wait_max = max(self.wait_max, wait)
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(latency)
+        else:
+            index = random.randrange(self.count)
+            if index < RESERVOIR_SIZE:
+                self.samples[index] = latency
+
+    def summary(self):
+        samples = sorted(self.samples)
+        return {
+            "count": self.count,
+            "latency": {f"p{int(q * 100)}": _quantile(samples, q) for q in QUANTILES},
+            "latency_sum": self.latency_sum,
+            "statuses": dict(self.statuses),
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "queue_wait_avg": self.wait_sum / self.count if self.count else 0.0,
+            "queue_wait_sum": self.wait_sum,
+            "queue_wait_max": self.wait_max,
+        }
+
+
+class Metrics:
+    """Per-endpoint API call metrics, shared by every client and scheduler of a session
+
+    The scheduler records one observation per HTTP attempt: status (or
+    exception name), latency, time spent waiting for a rate-limit token
+    or concurrency slot, and bytes on the wire. Snapshots can be exported
+    as JSON or Prometheus text.
+    """
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint):
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def observe(self, endpoint, status, latency, wait=0.0, sent=0, received=0):
+        with self._lock:
+            self._endpoint(endpoint).observe(status, latency, wait, sent, received)
+
+    def retry(self, endpoint):
+        with self._lock:
+            self._endpoint(endpoint).retries += 1
+
+    def coalesced(self, endpoint):
+        with self._lock:
+            self._endpoint(endpoint).coalesced += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def snapshot(self):
+        """{endpoint: summary dict}, sorted by endpoint"""
+        with self._lock:
+            return {endpoint: metrics.summary() for endpoint, metrics in sorted(self._endpoints.items())}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        def label(endpoint, **extra):
+            labels = {"endpoint": endpoint, **extra}
+            return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+        family("zoom_api_request_duration_seconds", "summary", "Zoom API request latency per attempt",
+               [f"zoom_api_request_duration_seconds{label(e, quantile=str(q))} {s['latency'][f'p{int(q * 100)}']:.6f}"
+                for e, s in snapshot.items() for q in QUANTILES]
+               + [f"zoom_api_request_duration_seconds_sum{label(e)} {s['latency_sum']:.6f}" for e, s in snapshot.items()]
+               + [f"zoom_api_request_duration_seconds_count{label(e)} {s['count']}" for e, s in snapshot.items()])
+        family("zoom_api_requests_total", "counter", "Zoom API attempts by response status",
+               [f"zoom_api_requests_total{label(e, status=status)} {count}"
+                for e, s in snapshot.items() for status, count in sorted(s["statuses"].items())])
+        family("zoom_api_retries_total", "counter", "Zoom API attempts that were retried",
+               [f"zoom_api_retries_total{label(e)} {s['retries']}" for e, s in snapshot.items()])
+        family("zoom_api_coalesced_total", "counter", "Calls saved by sharing an identical in-flight request",
+               [f"zoom_api_coalesced_total{label(e)} {s['coalesced']}" for e, s in snapshot.items()])
+        family("zoom_api_sent_bytes_total", "counter", "Request body bytes sent",
+               [f"zoom_api_sent_bytes_total{label(e)} {s['bytes_sent']}" for e, s in snapshot.items()])
+        family("zoom_api_received_bytes_total", "counter", "Response body bytes received",
+               [f"zoom_api_received_bytes_total{label(e)} {s['bytes_received']}" for e, s in snapshot.items()])
+        family("zoom_api_queue_wait_seconds", "summary", "Time waiting for a rate-limit token or slot",
+               [f"zoom_api_queue_wait_seconds_sum{label(e)} {s['queue_wait_sum']:.6f}" for e, s in snapshot.items()]
+               + [f"zoom_api_queue_wait_seconds_count{label(e)} {s['count']}" for e, s in snapshot.items()])
+        return "\n".join(lines) + "\n"
+
+    def total(self, field):
+        """Sum of one summary counter across all endpoints"""
+        return sum(summary[field] for summary in self.snapshot().values())
+
+    def dump(self, path):
+        """Write the metrics to path: Prometheus text for .prom/.txt, JSON otherwise"""
+        text = self.to_prometheus() if path.lower().endswith((".prom", ".txt")) else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
@@ -0,0 +1,110 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+DEFAULT_VISIBLE_ROWS = 14
+COLUMNS = (("owner", "Owner", 220), ("assistant", "Assistant", 220), ("status", "Status", 90),
+           ("attempts", "Attempts", 70), ("latency", "Latency ms", 80))
+STATUS_COLORS = {"failed": "red", "remove_failed": "red", "not_found": "orange", "skipped": "gray",
+                 "added": "dark green", "removed": "dark green"}
+
+
+def format_seconds(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes // 60}:{minutes % 60:02d}:{seconds:02d}" if minutes >= 60 else f"{minutes}:{seconds:02d}"
+
+
+class ProgressView(ttk.Frame):
+    """Virtualized table of a RunProgress with a progress bar, throughput and ETA
+
+    The Treeview holds only as many items as fit on screen; scrolling
+    rewrites their values from the rows at the new offset, so redrawing
+    costs the same for 100 rows as for 100,000. refresh() is called from
+    a Tk timer and applies everything that changed since the last call.
+    """
+
+    def __init__(self, parent, visible_rows=DEFAULT_VISIBLE_ROWS, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.visible_rows = visible_rows
+        self.progress = None
+        self.first = 0
+        self._total = 0
+
+        self.tree = ttk.Treeview(self, columns=[name for name, _, _ in COLUMNS], show="headings",
+                                 height=visible_rows, selectmode="none")
+        for name, title, width in COLUMNS:
+            anchor = tk.W if name in ("owner", "assistant", "status") else tk.E
+            self.tree.heading(name, text=title)
+            self.tree.column(name, width=width, anchor=anchor)
+        for status, color in STATUS_COLORS.items():
+            self.tree.tag_configure(status, foreground=color)
+        # Fixed items reused for whatever rows are in view
+        for slot in range(visible_rows):
+            self.tree.insert("", tk.END, iid=str(slot), values=("",) * len(COLUMNS))
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.scroll)
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll("scroll", -1 if event.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda event: self.scroll("scroll", -1, "units"))
+        self.tree.bind("<Button-5>", lambda event: self.scroll("scroll", 1, "units"))
+
+        self.bar = ttk.Progressbar(self, mode="determinate")
+        self.bar.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
+        self.status_label = ttk.Label(self, text="No run yet")
+        self.status_label.grid(row=2, column=0, columnspan=2, sticky=(tk.W,))
+
+    def scroll(self, action, amount, unit=None):
+        """Scrollbar and mouse wheel handler: moveto FRACTION or scroll N units|pages"""
+        if action == "moveto":
+            first = int(float(amount) * self._total)
+        else:
+            step = self.visible_rows if unit == "pages" else 1
+            first = self.first + int(amount) * step
+        first = max(0, min(first, self._total - self.visible_rows))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def render(self):
+        """Write the rows in view into the fixed Treeview items"""
+        rows = self.progress.rows if self.progress is not None else []
+        self._total = len(rows)
+        for slot in range(self.visible_rows):
+            index = self.first + slot
+            if index < self._total:
+                row = rows[index]
+                latency = f"{row.latency * 1000:.0f}" if row.latency is not None else ""
+                values = (row.owner, row.assistant, row.status, row.attempts or "", latency)
+                self.tree.item(str(slot), values=values, tags=(row.status,))
+            else:
+                self.tree.item(str(slot), values=("",) * len(COLUMNS), tags=())
+        if self._total > self.visible_rows:
+            self.scrollbar.set(self.first / self._total, (self.first + self.visible_rows) / self._total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def refresh(self, progress):
+        """Apply the changes of progress (the current RunProgress, or None) in one batch"""
+        if progress is not self.progress:
+            self.progress = progress
+            self.first = 0
+            self.render()
+        if progress is None:
+            return
+
+        changed = progress.drain()
+        total = len(progress)
+        if total != self._total or any(self.first <= index < self.first + self.visible_rows for index in changed):
+            self.render()
+
+        self.bar.configure(maximum=max(total, 1), value=progress.done)
+        if progress.finished is not None:
+            text = f"{progress.done}/{total} pairs in {format_seconds(progress.finished - progress.started)}"
+        else:
+            eta = progress.eta()
+            text = (f"{progress.done}/{total} pairs · {progress.throughput():.1f} pairs/s · "
+                    f"ETA {format_seconds(eta) if eta is not None else '--:--'}")
+        self.status_label.config(text=text)
@@ -0,0 +1,610 @@
+import asyncio
+import collections
+import contextvars
+import os
+import random
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from file_lock import FileLock
+from metrics import response_sizes
+
+
+# Requests per second per Zoom rate-limit category (Pro account limits)
+DEFAULT_RATES = {
+    "light": 30,
+    "medium": 20,
+    "heavy": 10,
+}
+
+DEFAULT_MAX_RETRIES = 5
+BASE_BACKOFF = 0.5       # Seconds before the first retry, doubled on every attempt
+MAX_BACKOFF = 30
+# A longer Retry-After means the daily limit is exhausted; waiting it out is pointless
+MAX_RETRY_AFTER = 300
+
+RETRYABLE_SERVER_STATUSES = (500, 502, 503, 504)
+
+# Request priority classes, most urgent first
+INTERACTIVE = "interactive"
+BULK = "bulk"
+BACKGROUND = "background"
+PRIORITIES = (INTERACTIVE, BULK, BACKGROUND)
+# Seconds between gate checks of a waiting coroutine
+GATE_POLL_INTERVAL = 0.05
+
+# Priority of the requests sent from the current thread or task
+_priority = contextvars.ContextVar("request_priority", default=BULK)
+
+
+class RequestCancelled(Exception):
+    """Raised for bulk and background requests after the run was cancelled"""
+
+    def __init__(self):
+        super().__init__("Run cancelled")
+
+
+def current_priority():
+    return _priority.get()
+
+
+@contextmanager
+def request_priority(priority):
+    """Send the requests made in this block (in this thread or task) with the given priority"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def with_priority(priority, fn):
+    """Wrap fn so its requests have the given priority wherever it runs, e.g. on a pool thread"""
+    def call(*args, **kwargs):
+        with request_priority(priority):
+            return fn(*args, **kwargs)
+    return call
+
+
+def parse_retry_after(value):
+    """Return the Retry-After header as seconds from now, or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at a fixed rate per second"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """Take a token if one is available; otherwise return the seconds to wait first"""
+        with self._lock:
+            return self._reserve(time.monotonic())
+
+    def _reserve(self, now):
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def acquire(self, check=None):
+        """Block until a token is available and take it; returns seconds waited
+
+        check, if given, is called before every wait and may raise to give up.
+        """
+        waited = 0.0
+        while True:
+            delay = self.reserve()
+            if not delay:
+                return waited
+            if check is not None:
+                check()
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self, check=None):
+        """asyncio version of acquire() that sleeps without blocking the event loop"""
+        waited = 0.0
+        while True:
+            delay = self.reserve()
+            if not delay:
+                return waited
+            if check is not None:
+                check()
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def block(self, seconds):
+        """Stop handing out tokens for the given number of seconds"""
+        with self._lock:
+            self._block(time.monotonic(), seconds)
+
+    def _block(self, now, seconds):
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0
+
+
+class SharedTokenBucket(TokenBucket):
+    """TokenBucket whose state lives in a file, so several processes share one rate
+
+    Every reserve() and block() locks the file, loads the token count,
+    last refill and block time, updates them and writes them back. A 429
+    seen by one process therefore pauses all of them. Times are wall-clock,
+    the one clock every process agrees on.
+    """
+
+    STATE = struct.Struct("<ddd")
+
+    def __init__(self, rate, path, burst=None):
+        super().__init__(rate, burst)
+        self.path = path
+        self._file_lock = FileLock(path)
+
+    def _shared(self, update):
+        """Run update(now) on the state as stored in the file and write it back"""
+        with self._lock, self._file_lock:
+            fd = self._file_lock.fd
+            os.lseek(fd, 0, os.SEEK_SET)
+            data = os.read(fd, self.STATE.size)
+            now = time.time()
+            if len(data) == self.STATE.size:
+                self.tokens, self.updated, self.blocked_until = self.STATE.unpack(data)
+            else:
+                self.tokens, self.updated, self.blocked_until = self.capacity, now, 0.0
+            result = update(now)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, self.STATE.pack(self.tokens, self.updated, self.blocked_until))
+            return result
+
+    def reserve(self):
+        return self._shared(self._reserve)
+
+    def block(self, seconds):
+        self._shared(lambda now: self._block(now, seconds))
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that halves on throttling and grows back on success (AIMD)"""
+
+    def __init__(self, max_limit, min_limit=1, increase_after=20):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = self.max_limit
+        self.increase_after = increase_after
+        self.in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self):
+        with self._cond:
+            if self._grow():
+                self._cond.notify()
+
+    def on_throttled(self):
+        with self._cond:
+            self._shrink()
+
+    def _grow(self):
+        self._successes += 1
+        if self._successes >= self.increase_after and self.limit < self.max_limit:
+            self.limit += 1
+            self._successes = 0
+            return True
+        return False
+
+    def _shrink(self):
+        self.limit = max(self.min_limit, self.limit // 2)
+        self._successes = 0
+
+
+class AsyncAdaptiveLimiter(AdaptiveLimiter):
+    """AdaptiveLimiter for coroutines; all methods must run on the event loop thread"""
+
+    def __init__(self, max_limit, min_limit=1, increase_after=20):
+        super().__init__(max_limit, min_limit, increase_after)
+        self._waiters = collections.deque()
+
+    async def acquire(self):
+        while self.in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self):
+        if self._grow():
+            self._wake()
+
+    def on_throttled(self):
+        self._shrink()
+
+    def _wake(self):
+        free = self.limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+class PriorityGate:
+    """Admits requests in priority order and lets a run be paused, resumed or cancelled
+
+    A request waits at the gate while requests of a more urgent class are
+    queued, so interactive lookups overtake a running bulk job and bulk work
+    overtakes background prefetch. pause() holds bulk and background requests
+    at the gate, and cancel() makes them raise RequestCancelled until
+    reset(); both are checked again in leave(), right before sending, and
+    requests already sent finish either way. Interactive requests are never
+    held. Queue depth and wait time are counted per class.
+    """
+
+    def __init__(self):
+        self.paused = False
+        self.cancelled = False
+        self.queued = dict.fromkeys(PRIORITIES, 0)
+        self.admitted = dict.fromkeys(PRIORITIES, 0)
+        self.wait_total = dict.fromkeys(PRIORITIES, 0.0)
+        self.wait_max = dict.fromkeys(PRIORITIES, 0.0)
+        self._cond = threading.Condition()
+
+    def _held(self, priority):
+        """True while a pause holds this class; raises RequestCancelled once it never will go"""
+        if priority == INTERACTIVE:
+            return False
+        if self.cancelled:
+            raise RequestCancelled()
+        return self.paused
+
+    def _check(self, priority):
+        """True if a request of this class may go ahead now"""
+        if self._held(priority):
+            return False
+        return not any(self.queued[p] for p in PRIORITIES[:PRIORITIES.index(priority)])
+
+    def enter(self, priority):
+        """Wait for this class's turn; returns the time the request was queued"""
+        queued = time.monotonic()
+        with self._cond:
+            self.queued[priority] += 1
+            self._wait(priority, self._check)
+        return queued
+
+    async def enter_async(self, priority):
+        """asyncio version of enter() that waits without blocking the event loop"""
+        queued = time.monotonic()
+        with self._cond:
+            self.queued[priority] += 1
+        await self._wait_async(priority, self._check)
+        return queued
+
+    def check(self, priority):
+        """Raise RequestCancelled if the run was cancelled, e.g. while waiting for a rate token"""
+        with self._cond:
+            self._held(priority)
+
+    def leave(self, priority, queued):
+        """Wait out a pause that began while the request was queued, then stop counting it as queued"""
+        with self._cond:
+            self._wait(priority, lambda p: not self._held(p))
+            self._admit(priority, queued)
+
+    async def leave_async(self, priority, queued):
+        await self._wait_async(priority, lambda p: not self._held(p))
+        with self._cond:
+            self._admit(priority, queued)
+
+    def _wait(self, priority, ready):
+        """Wait, holding the condition, until ready(priority); a cancelled request is dequeued"""
+        try:
+            while not ready(priority):
+                self._cond.wait()
+        except BaseException:
+            self._dequeue(priority)
+            raise
+
+    async def _wait_async(self, priority, ready):
+        try:
+            while True:
+                with self._cond:
+                    if ready(priority):
+                        return
+                await asyncio.sleep(GATE_POLL_INTERVAL)
+        except BaseException:
+            with self._cond:
+                self._dequeue(priority)
+            raise
+
+    def _admit(self, priority, queued):
+        waited = time.monotonic() - queued
+        self._dequeue(priority)
+        self.admitted[priority] += 1
+        self.wait_total[priority] += waited
+        self.wait_max[priority] = max(self.wait_max[priority], waited)
+
+    def _dequeue(self, priority):
+        self.queued[priority] -= 1
+        self._cond.notify_all()
+
+    def pause(self):
+        self._set(paused=True)
+
+    def resume(self):
+        self._set(paused=False)
+
+    def cancel(self):
+        """Fail the waiting and later bulk and background requests until reset()"""
+        self._set(cancelled=True, paused=False)
+
+    def reset(self):
+        """Clear a pause or cancel, e.g. when the next run starts"""
+        self._set(cancelled=False, paused=False)
+
+    def _set(self, **state):
+        with self._cond:
+            for name, value in state.items():
+                setattr(self, name, value)
+            self._cond.notify_all()
+
+    def stats(self):
+        """Per class: requests queued now, requests admitted and their average and longest wait"""
+        with self._cond:
+            return {priority: {"queued": self.queued[priority], "admitted": self.admitted[priority],
+                               "wait_avg": self.wait_total[priority] / self.admitted[priority]
+                               if self.admitted[priority] else 0.0,
+                               "wait_max": self.wait_max[priority]}
+                    for priority in PRIORITIES}
+
+
+class RateLimitScheduler:
+    """Runs every API request through per-category token buckets and an adaptive concurrency limit
+
+    429 responses are retried after Retry-After (or a jittered exponential
+    backoff) and pause the whole category, so other workers back off too.
+    Every attempt is recorded in metrics, if given, under its endpoint, and
+    every retry as a "retry" record in events (an EventLog), if given.
+    With shared_dir the buckets are SharedTokenBucket files in that
+    directory, so all processes pointing at it draw from one budget.
+
+    Requests first pass a PriorityGate (pass gate= to share one between
+    schedulers) with the priority set by request_priority(), bulk by
+    default. Interactive requests skip the concurrency limit but not the
+    rate limits.
+    """
+
+    limiter_class = AdaptiveLimiter
+    # Connection-level failures worth retrying
+    transient_errors = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(self, rates=None, max_concurrency=8, max_retries=DEFAULT_MAX_RETRIES, log=None,
+                 metrics=None, events=None, shared_dir=None, gate=None):
+        self.rates = dict(DEFAULT_RATES, **(rates or {}))
+        self.shared_dir = shared_dir
+        if shared_dir:
+            self.buckets = {category: SharedTokenBucket(rate, os.path.join(shared_dir, f"{category}.bucket"))
+                            for category, rate in self.rates.items()}
+        else:
+            self.buckets = {category: TokenBucket(rate) for category, rate in self.rates.items()}
+        self.limiter = self.limiter_class(max_concurrency)
+        self.gate = gate or PriorityGate()
+        self.max_retries = max_retries
+        self.log = log
+        self.metrics = metrics
+        self.events = events
+
+        self.retries = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt):
+        """Jittered exponential backoff delay for a retry attempt"""
+        delay = min(MAX_BACKOFF, BASE_BACKOFF * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+    def bucket(self, category):
+        return self.buckets.get(category) or self.buckets["light"]
+
+    def execute(self, category, send, retry_server_errors=True, endpoint=None):
+        """Call send() under the rate limits, retrying throttled and transient failures"""
+        bucket = self.bucket(category)
+        endpoint = endpoint or category
+        priority = current_priority()
+        limited = priority != INTERACTIVE
+        attempt = 0
+        while True:
+            if attempt and self.metrics is not None:
+                self.metrics.retry(endpoint)
+            # Every attempt passes the gate, so a paused run stops before its retries too
+            queued = self.gate.enter(priority)
+            if limited:
+                self.limiter.acquire()
+            try:
+                try:
+                    bucket.acquire(lambda: self.gate.check(priority))
+                finally:
+                    self.gate.leave(priority, queued)
+                started = time.monotonic()
+                response = send()
+                self._observe(endpoint, response.status_code, queued, started, response)
+            except self.transient_errors as e:
+                self._observe(endpoint, type(e).__name__, queued, started)
+                time.sleep(self._error_retry_delay(e, attempt, retry_server_errors, endpoint))
+                attempt += 1
+                continue
+            finally:
+                if limited:
+                    self.limiter.release()
+
+            delay = self._response_retry_delay(category, bucket, response, attempt, retry_server_errors, endpoint)
+            if delay is None:
+                return response
+            time.sleep(delay)
+            attempt += 1
+
+    def _observe(self, endpoint, status, queued, started, response=None):
+        """Record one attempt's latency, queue wait and size"""
+        if self.metrics is None:
+            return
+        latency = time.monotonic() - started
+        sent, received = response_sizes(response) if response is not None else (0, 0)
+        self.metrics.observe(endpoint, status, latency, started - queued, sent, received)
+
+    def _error_retry_delay(self, error, attempt, retry_server_errors, endpoint=None):
+        """Backoff before retrying a connection error, or re-raise it"""
+        if not retry_server_errors or attempt >= self.max_retries:
+            raise error
+        delay = self.backoff(attempt)
+        self._note_retry(f"{type(error).__name__}, retrying in {delay:.1f}s",
+                         endpoint, attempt, type(error).__name__, delay)
+        return delay
+
+    def _response_retry_delay(self, category, bucket, response, attempt, retry_server_errors, endpoint=None):
+        """Return None to hand the response back, or the seconds to sleep before retrying"""
+        self._observe_headers(bucket, response)
+
+        if response.status_code == 429:
+            self._throttled()
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if attempt >= self.max_retries or (retry_after or 0) > MAX_RETRY_AFTER:
+                return None
+            delay = retry_after if retry_after is not None else self.backoff(attempt)
+            # Everyone in this category waits on the bucket, not just this worker
+            bucket.block(delay)
+            self._note_retry(f"Rate limited ({category}), retrying in {delay:.1f}s",
+                             endpoint or category, attempt, 429, delay)
+            return 0
+
+        if (response.status_code in RETRYABLE_SERVER_STATUSES and retry_server_errors
+                and attempt < self.max_retries):
+            delay = self.backoff(attempt)
+            self._note_retry(f"Server error {response.status_code}, retrying in {delay:.1f}s",
+                             endpoint or category, attempt, response.status_code, delay)
+            return delay
+
+        self._succeeded()
+        return None
+
+    def _throttled(self):
+        self.limiter.on_throttled()
+        with self._lock:
+            self.throttled += 1
+
+    def _succeeded(self):
+        self.limiter.on_success()
+
+    def _observe_headers(self, bucket, response):
+        """Pause a category early when Zoom reports its quota is used up"""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is None or response.status_code == 429:
+            return
+        try:
+            remaining = int(remaining)
+        except ValueError:
+            return
+        if remaining <= 0:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            bucket.block(min(retry_after if retry_after is not None else 1.0, MAX_RETRY_AFTER))
+
+    def _note_retry(self, message, endpoint=None, attempt=0, reason=None, delay=None):
+        with self._lock:
+            self.retries += 1
+        if self.log:
+            self.log(message)
+        if self.events is not None:
+            self.events.emit("retry", endpoint=endpoint, attempt=attempt + 1, reason=reason,
+                             delay=round(delay, 3) if delay is not None else None)
+
+    def stats(self):
+        """Return retry and throttling counters"""
+        with self._lock:
+            return {"retries": self.retries, "throttled": self.throttled,
+                    "concurrency_limit": self.limiter.limit}
+
+
+class AsyncRateLimitScheduler(RateLimitScheduler):
+    """RateLimitScheduler for coroutines; send() must be a coroutine function"""
+
+    limiter_class = AsyncAdaptiveLimiter
+
+    def __init__(self, rates=None, max_concurrency=100, max_retries=DEFAULT_MAX_RETRIES,
+                 log=None, transient_errors=(), metrics=None, events=None, shared_dir=None, gate=None):
+        super().__init__(rates, max_concurrency, max_retries, log, metrics, events, shared_dir, gate)
+        self.transient_errors = tuple(transient_errors) + (asyncio.TimeoutError,)
+
+    async def execute(self, category, send, retry_server_errors=True, endpoint=None):
+        """Await send() under the rate limits, retrying throttled and transient failures"""
+        bucket = self.bucket(category)
+        endpoint = endpoint or category
+        priority = current_priority()
+        limited = priority != INTERACTIVE
+        attempt = 0
+        while True:
+            if attempt and self.metrics is not None:
+                self.metrics.retry(endpoint)
+            queued = await self.gate.enter_async(priority)
+            if limited:
+                await self.limiter.acquire()
+            try:
+                try:
+                    await bucket.acquire_async(lambda: self.gate.check(priority))
+                finally:
+                    await self.gate.leave_async(priority, queued)
+                started = time.monotonic()
+                response = await send()
+                self._observe(endpoint, response.status_code, queued, started, response)
+            except self.transient_errors as e:
+                self._observe(endpoint, type(e).__name__, queued, started)
+                await asyncio.sleep(self._error_retry_delay(e, attempt, retry_server_errors, endpoint))
+                attempt += 1
+                continue
+            finally:
+                if limited:
+                    self.limiter.release()
+
+            delay = self._response_retry_delay(category, bucket, response, attempt, retry_server_errors, endpoint)
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
+            attempt += 1
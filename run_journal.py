@@ -0,0 +1,145 @@
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+
+# Outcomes are written in batches: after this many records or this many seconds
+DEFAULT_FSYNC_EVERY = 200
+DEFAULT_FSYNC_INTERVAL = 1.0
+
+# Statuses that mean a pair needs no further work
+DONE_STATUSES = ("added", "present")
+
+
+class RunJournal:
+    """Append-only JSONL journal of a run's planned pairs and their outcomes
+
+    plan() records the pairs a run is about to write and is synced at once;
+    record() appends each PairResult as it completes and is synced in
+    batches, so a crash loses at most the last batch. Those pairs are simply
+    run again on resume and, with skip_existing, show up as "present".
+    """
+
+    def __init__(self, path, fsync_every=DEFAULT_FSYNC_EVERY, fsync_interval=DEFAULT_FSYNC_INTERVAL):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        # target -> {assistant: None}, in planned order
+        self.plans = {}
+        # (owner, assistant) pairs, lowercased, whose outcome needs no retry
+        self.done = set()
+        # Lowercased emails of users that do not exist; their pairs are not retried
+        self.missing = set()
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._last_sync = time.monotonic()
+
+        needs_newline = self._load() if os.path.exists(path) else False
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        if needs_newline:
+            # The last line was cut off by a crash; start a fresh one
+            self._file.write("\n")
+
+    @classmethod
+    def create(cls, directory, **kwargs):
+        """Start a new journal file named after the current time"""
+        name = datetime.now().strftime("run-%Y%m%d-%H%M%S-%f.jsonl")
+        return cls(os.path.join(directory, name), **kwargs)
+
+    @classmethod
+    def latest_pending(cls, directory):
+        """Open the newest journal in directory that still has pending pairs, or None"""
+        for path in sorted(glob.glob(os.path.join(directory, "run-*.jsonl")), reverse=True):
+            journal = cls(path)
+            if journal.pending_count():
+                return journal
+            journal.close()
+        return None
+
+    def _load(self):
+        """Replay an existing journal; returns True when it ends mid-line"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for line in content.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("type") == "plan":
+                assistants = self.plans.setdefault(entry["target"], {})
+                for email in entry["assistants"]:
+                    assistants[email] = None
+            elif entry.get("type") == "pair" and entry.get("status") in DONE_STATUSES:
+                self.done.add((entry["owner"].lower(), entry["assistant"].lower()))
+            elif entry.get("type") == "missing":
+                self.missing.add(entry["email"].lower())
+        return bool(content) and not content.endswith("\n")
+
+    def plan(self, target, assistant_emails):
+        """Record the pairs about to be written and sync them before any write happens"""
+        with self._lock:
+            assistants = self.plans.setdefault(target, {})
+            new = [email for email in assistant_emails if email not in assistants]
+            if not new:
+                return
+            for email in new:
+                assistants[email] = None
+            self._buffer.append({"type": "plan", "target": target, "assistants": new})
+            self._sync()
+
+    def record(self, result):
+        """Append a PairResult; safe to call from any worker thread"""
+        with self._lock:
+            if result.status in DONE_STATUSES:
+                self.done.add((result.owner_email.lower(), result.assistant_email.lower()))
+            self._buffer.append({"type": "pair", "owner": result.owner_email,
+                                 "assistant": result.assistant_email,
+                                 "status": result.status, "error": result.error})
+            if (len(self._buffer) >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+
+    def record_missing(self, email):
+        """Note that a user was not found; batched like record()"""
+        with self._lock:
+            if email.lower() in self.missing:
+                return
+            self.missing.add(email.lower())
+            self._buffer.append({"type": "missing", "email": email})
+
+    def _sync(self):
+        if self._buffer:
+            self._file.write("".join(json.dumps(entry) + "\n" for entry in self._buffer))
+            self._buffer = []
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def pending(self):
+        """(target, [assistants]) for every planned pair not yet done in both directions
+
+        Pairs with a user that was not found are left out.
+        """
+        for target, assistants in self.plans.items():
+            owner = target.lower()
+            if owner in self.missing:
+                continue
+            todo = [email for email in assistants if email.lower() not in self.missing
+                    and ((owner, email.lower()) not in self.done or (email.lower(), owner) not in self.done)]
+            if todo:
+                yield target, todo
+
+    def pending_count(self):
+        return sum(len(assistants) for _, assistants in self.pending())
+
+    def close(self):
+        """Write and sync anything still buffered"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync()
+            self._file.close()
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import deque
+
+
+# Completions kept to measure live throughput over
+THROUGHPUT_WINDOW = 10.0
+
+PENDING = "pending"
+
+
+class ProgressRow:
+    """One direction of a planned pair as shown in the progress table"""
+
+    __slots__ = ("owner", "assistant", "status", "attempts", "latency", "error")
+
+    def __init__(self, owner, assistant):
+        self.owner = owner
+        self.assistant = assistant
+        self.status = PENDING
+        self.attempts = 0
+        self.latency = None
+        self.error = None
+
+
+class RunProgress:
+    """Per-pair progress of a run, fed through the same calls as a RunJournal
+
+    Passed to the engine in place of the journal: plan() adds a row for
+    both directions of every pair, record() and record_missing() update
+    rows, and each call is forwarded to the wrapped journal, if any.
+    Workers only mark rows as changed; the UI collects the changes in
+    batches with drain().
+    """
+
+    def __init__(self, journal=None):
+        self.journal = journal
+        self.rows = []
+        self.started = time.monotonic()
+        self.done = 0
+        self.finished = None
+        self._index = {}
+        # Lowercased email -> indexes of the rows it appears in, to mark missing users
+        self._by_email = {}
+        self._changed = set()
+        self._completions = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _row(self, owner, assistant):
+        key = (owner.lower(), assistant.lower())
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.rows)
+            self.rows.append(ProgressRow(owner, assistant))
+            for email in key:
+                self._by_email.setdefault(email, []).append(index)
+            self._changed.add(index)
+        return index
+
+    def _finish(self, index, status, error=None, attempts=0, latency=None):
+        row = self.rows[index]
+        if row.status == PENDING:
+            self.done += 1
+            self._completions.append(time.monotonic())
+        row.status, row.error, row.attempts, row.latency = status, error, attempts, latency
+        self._changed.add(index)
+
+    def plan(self, target, assistant_emails):
+        if self.journal is not None:
+            self.journal.plan(target, assistant_emails)
+        with self._lock:
+            for email in assistant_emails:
+                self._row(target, email)
+                self._row(email, target)
+
+    def record(self, result):
+        if self.journal is not None:
+            self.journal.record(result)
+        with self._lock:
+            index = self._row(result.owner_email, result.assistant_email)
+            self._finish(index, result.status, result.error, result.attempts, result.latency)
+
+    def record_missing(self, email):
+        if self.journal is not None:
+            self.journal.record_missing(email)
+        with self._lock:
+            for index in self._by_email.get(email.lower(), ()):
+                if self.rows[index].status == PENDING:
+                    self._finish(index, "not_found", f"User not found: {email}")
+
+    def finish(self):
+        """Mark the rows the run never reached (e.g. after a failed lookup) as skipped"""
+        with self._lock:
+            for index, row in enumerate(self.rows):
+                if row.status == PENDING:
+                    row.status = "skipped"
+                    self.done += 1
+                    self._changed.add(index)
+            self.finished = time.monotonic()
+
+    def drain(self):
+        """Indexes of the rows changed since the last call"""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+    def throughput(self):
+        """Pairs completed per second over the last THROUGHPUT_WINDOW seconds"""
+        now = time.monotonic()
+        with self._lock:
+            while self._completions and now - self._completions[0] > THROUGHPUT_WINDOW:
+                self._completions.popleft()
+            recent = len(self._completions)
+        span = min(THROUGHPUT_WINDOW, now - self.started)
+        return recent / span if span > 0 else 0.0
+
+    def eta(self):
+        """Seconds until every planned pair is done at the current rate, or None"""
+        rate = self.throughput()
+        remaining = len(self.rows) - self.done
+        if not remaining:
+            return 0.0
+        return remaining / rate if rate > 0 else None
@@ -0,0 +1,136 @@
+import json
+import os
+import re
+import sys
+
+
+# Config and cache files live next to the application
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(APP_DIR, "config.py")
+TOKEN_CACHE_FILE = os.path.join(APP_DIR, ".token_cache.json")
+USER_CACHE_FILE = os.path.join(APP_DIR, ".user_cache.json")
+LOG_DIR = os.path.join(APP_DIR, "logs")
+JOURNAL_DIR = os.path.join(APP_DIR, "journals")
+EVENT_LOG_DIR = os.path.join(APP_DIR, "events")
+
+
+class Settings:
+    """Values read from config.py, with defaults for everything optional
+
+    The defaults live in the modules that use them, which pull in requests;
+    they are imported here rather than at module level so the paths above
+    can be read (e.g. by the GUI before its window appears) without that cost.
+    """
+
+    def __init__(self):
+        from user_cache import DEFAULT_TTL, DEFAULT_NEGATIVE_TTL
+        from assistant_engine import (DEFAULT_MAX_WORKERS, DEFAULT_BATCH_SIZE, DEFAULT_ENGINE,
+                                      DEFAULT_ASYNC_CONCURRENCY, DEFAULT_DIRECTORY_TTL)
+        from event_log import DEFAULT_MAX_BYTES, DEFAULT_BACKUPS
+        from log_sink import DEFAULT_MAX_LINES
+        from zoom_client import API_BASE_URL, OAUTH_BASE_URL
+
+        self.client_id = ""
+        self.client_secret = ""
+        self.api_base_url = API_BASE_URL
+        self.oauth_base_url = OAUTH_BASE_URL
+        self.user_cache_ttl = DEFAULT_TTL
+        self.user_cache_negative_ttl = DEFAULT_NEGATIVE_TTL
+        self.max_workers = DEFAULT_MAX_WORKERS
+        self.batch_size = DEFAULT_BATCH_SIZE
+        self.rate_limits = {}
+        self.engine = DEFAULT_ENGINE
+        self.async_concurrency = DEFAULT_ASYNC_CONCURRENCY
+        self.log_max_lines = DEFAULT_MAX_LINES
+        self.skip_existing = True
+        self.prefetch_directory = False
+        self.directory_ttl = DEFAULT_DIRECTORY_TTL
+        self.event_log = True
+        self.event_log_max_bytes = DEFAULT_MAX_BYTES
+        self.event_log_backups = DEFAULT_BACKUPS
+        # Directory of rate-limit budget files shared with other processes, or None
+        self.rate_budget_dir = None
+
+
+def load_settings():
+    """Load configuration from config.py if it exists"""
+    settings = Settings()
+
+    try:
+        # Add the app directory to path to import config
+        if APP_DIR not in sys.path:
+            sys.path.insert(0, APP_DIR)
+
+        import config
+        settings.client_id = getattr(config, 'CLIENT_ID', settings.client_id)
+        settings.client_secret = getattr(config, 'CLIENT_SECRET', settings.client_secret)
+        settings.api_base_url = getattr(config, 'API_BASE_URL', settings.api_base_url)
+        settings.oauth_base_url = getattr(config, 'OAUTH_BASE_URL', settings.oauth_base_url)
+        settings.user_cache_ttl = getattr(config, 'USER_CACHE_TTL', settings.user_cache_ttl)
+        settings.user_cache_negative_ttl = getattr(config, 'USER_CACHE_NEGATIVE_TTL', settings.user_cache_negative_ttl)
+        settings.max_workers = getattr(config, 'MAX_WORKERS', settings.max_workers)
+        settings.batch_size = getattr(config, 'BATCH_SIZE', settings.batch_size)
+        settings.rate_limits = getattr(config, 'RATE_LIMITS', settings.rate_limits)
+        settings.engine = getattr(config, 'ENGINE', settings.engine)
+        settings.async_concurrency = getattr(config, 'ASYNC_CONCURRENCY', settings.async_concurrency)
+        settings.log_max_lines = getattr(config, 'LOG_MAX_LINES', settings.log_max_lines)
+        settings.skip_existing = getattr(config, 'SKIP_EXISTING', settings.skip_existing)
+        settings.prefetch_directory = getattr(config, 'PREFETCH_DIRECTORY', settings.prefetch_directory)
+        settings.directory_ttl = getattr(config, 'DIRECTORY_TTL', settings.directory_ttl)
+        settings.event_log = getattr(config, 'EVENT_LOG', settings.event_log)
+        settings.event_log_max_bytes = getattr(config, 'EVENT_LOG_MAX_BYTES', settings.event_log_max_bytes)
+        settings.event_log_backups = getattr(config, 'EVENT_LOG_BACKUPS', settings.event_log_backups)
+        settings.rate_budget_dir = getattr(config, 'RATE_BUDGET_DIR', settings.rate_budget_dir)
+
+        if settings.client_id and settings.client_secret:
+            print("Configuration loaded from config.py")
+    except ImportError:
+        print("No config.py found, using manual configuration")
+    except Exception as e:
+        print(f"Error loading config: {e}")
+
+    return settings
+
+
+NEW_CONFIG_HEADER = """# Zoom Assistant Manager Configuration Template
+# Copy this file to config.py and fill in your actual values
+
+# Zoom OAuth App Credentials
+# Get these from your Zoom App in the Zoom Marketplace
+"""
+
+
+def save_credentials(client_id, client_secret, path=CONFIG_FILE):
+    """Set CLIENT_ID and CLIENT_SECRET in config.py, keeping every other line as it is
+
+    The assignments are replaced where they are, or appended if missing;
+    a missing file is created. The file is replaced atomically.
+    """
+    import tempfile
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except FileNotFoundError:
+        content = NEW_CONFIG_HEADER
+    for name, value in (("CLIENT_ID", client_id), ("CLIENT_SECRET", client_secret)):
+        # json.dumps of a str is also a valid Python string literal
+        line = f"{name} = {json.dumps(value)}"
+        pattern = re.compile(rf"^{name}\s*=.*$", re.MULTILINE)
+        if pattern.search(content):
+            content = pattern.sub(lambda _: line, content, count=1)
+        else:
+            if content and not content.endswith("\n"):
+                content += "\n"
+            content += f"{line}\n"
+
+    directory = os.path.dirname(os.path.abspath(path))
+    # mkstemp creates the file readable only by you, which suits the client secret
+    fd, temp_path = tempfile.mkstemp(prefix=".config-", suffix=".py", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
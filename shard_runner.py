@@ -0,0 +1,123 @@
+import json
+import os
+import subprocess
+import sys
+import zlib
+from datetime import datetime
+
+from email_input import InputReport, normalize_pairs
+from headless import OK_STATUSES, ResultWriter, log_message, read_pairs
+from settings import APP_DIR, JOURNAL_DIR, load_settings
+
+
+ENTRY_POINT = os.path.join(APP_DIR, "zoom_assistant_manager.py")
+
+
+def shard_of(owner, shards):
+    """Shard index of an owner email, stable across processes and runs"""
+    return zlib.crc32(owner.encode("utf-8")) % shards
+
+
+def partition_pairs(pairs, directory, shards):
+    """Stream pairs into shard-N.jsonl files in directory, each owner's pairs in one file
+
+    Returns [(path, pair count)] of the shards that received pairs.
+    """
+    paths = [os.path.join(directory, f"shard-{index}.jsonl") for index in range(shards)]
+    counts = [0] * shards
+    files = [open(path, 'w', encoding='utf-8') for path in paths]
+    try:
+        for target, assistant in pairs:
+            index = shard_of(target, shards)
+            files[index].write(json.dumps({"target": target, "assistant": assistant}) + "\n")
+            counts[index] += 1
+    finally:
+        for f in files:
+            f.close()
+    written = []
+    for path, count in zip(paths, counts):
+        if count:
+            written.append((path, count))
+        else:
+            os.remove(path)
+    return written
+
+
+def worker_command(args, shard_path, rate_budget):
+    """Command line of one worker: a headless run of the shard with the parent's engine options"""
+    root = os.path.splitext(shard_path)[0]
+    command = [sys.executable, ENTRY_POINT, "run", "--input", shard_path, "--output", f"{root}.results.jsonl",
+               "--rate-budget", rate_budget, "--chunk-size", str(args.chunk_size)]
+    if args.dry_run:
+        command.append("--dry-run")
+    else:
+        command += ["--journal", f"{root}.journal.jsonl"]
+    for option in ("workers", "engine", "batch_size"):
+        value = getattr(args, option)
+        if value:
+            command += [f"--{option.replace('_', '-')}", str(value)]
+    for flag in ("no_skip_existing", "prefetch_directory", "quiet"):
+        if getattr(args, flag):
+            command.append(f"--{flag.replace('_', '-')}")
+    if args.metrics:
+        base, ext = os.path.splitext(os.path.abspath(args.metrics))
+        command += ["--metrics", f"{base}.{os.path.basename(root)}{ext}"]
+    return command
+
+
+def merge_results(shards, writer):
+    """Copy every shard's results into writer"""
+    for path, _ in shards:
+        results_path = f"{os.path.splitext(path)[0]}.results.jsonl"
+        if not os.path.exists(results_path):
+            continue
+        with open(results_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    writer.write(record["owner"], record["assistant"], record["status"], record.get("error"))
+
+
+def run_sharded(args):
+    """Partition the pairs by owner, run each shard in its own process and merge the results
+
+    The workers share the token cache and one rate budget directory, so
+    together they stay within the account's API limits.
+    """
+    output = args.output or f"{os.path.splitext(args.input)[0] if args.input != '-' else 'stdin'}.results.jsonl"
+    directory = os.path.join(JOURNAL_DIR, datetime.now().strftime("shards-%Y%m%d-%H%M%S-%f"))
+    os.makedirs(directory)
+    rate_budget = args.rate_budget or load_settings().rate_budget_dir or os.path.join(directory, "rate")
+
+    report = InputReport()
+    shards = partition_pairs(normalize_pairs(read_pairs(args.input, args.format), report), directory,
+                             max(1, args.processes))
+    if report.filtered:
+        log_message(f"Input: {report.summary()}")
+    if not shards:
+        log_message("No pairs to run")
+        return 0
+    log_message(f"Running {report.accepted} pairs in {len(shards)} processes "
+                f"({', '.join(str(count) for _, count in shards)} pairs); shard files in {directory}")
+
+    processes = [subprocess.Popen(worker_command(args, path, rate_budget)) for path, _ in shards]
+    try:
+        codes = [process.wait() for process in processes]
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        log_message(f"Interrupted; resume each shard with: resume --journal {directory}/shard-N.journal.jsonl")
+        return 130
+
+    writer = ResultWriter(output)
+    try:
+        merge_results(shards, writer)
+    finally:
+        writer.close()
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(writer.counts.items()))
+    log_message(f"All shards completed! {summary or 'no pairs'}")
+    log_message(f"Results written to {output}")
+    if any(code == 2 for code in codes):
+        log_message("Some shards could not start; see their messages above")
+        return 2
+    return 0 if set(writer.counts) <= OK_STATUSES else 1
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one
+
+    The first caller for a key runs the call; callers that arrive while it
+    is in flight wait for its result (or exception) instead of repeating
+    it. Nothing is cached: once the call finishes the next caller runs it
+    again. Saved calls are counted, and recorded per endpoint in metrics
+    if given.
+    """
+
+    def __init__(self, metrics=None):
+        self.metrics = metrics
+        self.calls = 0
+        self.saved = 0
+        self._lock = threading.Lock()
+        # key -> Future of the call in flight
+        self._inflight = {}
+
+    def do(self, key, fn, endpoint=None):
+        """Return fn(), sharing the result with concurrent callers for the same key"""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.calls += 1
+            else:
+                self.saved += 1
+        if not leader:
+            if self.metrics is not None and endpoint is not None:
+                self.metrics.coalesced(endpoint)
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._forget(key)
+            future.set_exception(e)
+            raise
+        self._forget(key)
+        future.set_result(result)
+        return result
+
+    def _forget(self, key):
+        # Forgotten before the result is published so later callers start a fresh call
+        with self._lock:
+            del self._inflight[key]
+
+    def stats(self):
+        return {'calls': self.calls, 'saved': self.saved}
+
+
+class AsyncSingleFlight(SingleFlight):
+    """SingleFlight for coroutines on one event loop"""
+
+    async def do(self, key, coro_fn, endpoint=None):
+        """Await coro_fn(), sharing the result with concurrent callers for the same key"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(coro_fn())
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self.calls += 1
+        else:
+            self.saved += 1
+            if self.metrics is not None and endpoint is not None:
+                self.metrics.coalesced(endpoint)
+        # Shielded so one cancelled caller does not cancel the call for the others
+        return await asyncio.shield(task)
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(TESTS_DIR)
+sys.path[:0] = [APP_DIR, os.path.join(APP_DIR, "benchmarks")]
+
+
+@pytest.fixture
+def mock_api():
+    """A mock Zoom API on a free port"""
+    from mock_zoom import start_server
+
+    server = start_server(latency=0.0)
+    yield server
+    server.shutdown()
+    server.server_close()
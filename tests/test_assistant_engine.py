@@ -0,0 +1,91 @@
+import pytest
+
+from assistant_engine import AssistantEngine
+from user_cache import UserIDCache
+from zoom_client import ZoomClient
+
+ASSISTANTS = [f"user{i}@example.com" for i in range(1, 9)]
+
+
+def make_engine(cls, mock_api):
+    client = ZoomClient("token", base_url=mock_api.base_url)
+    return cls(client, UserIDCache(None), log=lambda message: None, batch_size=len(ASSISTANTS))
+
+
+def engine_classes():
+    yield AssistantEngine
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        return
+    from async_engine import AsyncAssistantEngine
+    yield AsyncAssistantEngine
+
+
+@pytest.mark.parametrize("cls", list(engine_classes()))
+def test_missing_owner_fails_the_batch_in_one_request(cls, mock_api):
+    engine = make_engine(cls, mock_api)
+    outcome = engine.add_assistants_batch("no-such-owner", ASSISTANTS)
+    engine.close()
+
+    assert set(outcome) == set(ASSISTANTS)
+    assert all("404" in error for error in outcome.values())
+    assert mock_api.state.calls["POST v2"] == 1
+
+
+@pytest.mark.parametrize("cls", list(engine_classes()))
+def test_bad_assistant_is_isolated_by_bisecting(cls, mock_api):
+    engine = make_engine(cls, mock_api)
+    emails = ASSISTANTS[:3] + ["nobody@invalid.example"] + ASSISTANTS[3:]
+    outcome = engine.add_assistants_batch("u0", emails)
+    engine.close()
+
+    assert [email for email, error in outcome.items() if error] == ["nobody@invalid.example"]
+    assert mock_api.state.calls["POST v2"] > 1
+
+
+def run_and_mesh(cls, mock_api):
+    mock_api.state.reset()
+    lines = []
+    client = ZoomClient("token", base_url=mock_api.base_url)
+    engine = cls(client, UserIDCache(None), log=lines.append, batch_size=3)
+    results = [
+        engine.run("user1@example.com", ASSISTANTS[1:] + ["ghost@nowhere.invalid"]),
+        engine.run_mesh(["user20@example.com", "user21@example.com", "ghost@nowhere.invalid", "user22@example.com"]),
+    ]
+    engine.close()
+    return lines, [[tuple(result)[:5] for result in pairs] for pairs in results]
+
+
+@pytest.mark.skipif(len(list(engine_classes())) < 2, reason="aiohttp is not installed")
+def test_engines_report_the_same_run_and_mesh(mock_api):
+    threaded, coroutine = (run_and_mesh(cls, mock_api) for cls in engine_classes())
+
+    assert threaded == coroutine
+    assert "Warning: Assistant email not found: ghost@nowhere.invalid" in threaded[0]
+
+
+@pytest.mark.parametrize("cls", list(engine_classes()))
+def test_mesh_resolves_members_from_the_prefetched_directory(cls, mock_api):
+    mock_api.state.directory_size = 50
+    client = ZoomClient("token", base_url=mock_api.base_url)
+    engine = cls(client, UserIDCache(None), log=lambda message: None, skip_existing=False, prefetch_directory=True)
+    results = engine.run_mesh(ASSISTANTS[:4])
+    engine.close()
+
+    assert [result.status for result in results] == ["added"] * 12
+    # One page of GET /users instead of one GET /users/{email} per member
+    assert mock_api.state.calls["GET v2"] == 1
+
+
+@pytest.mark.parametrize("cls", list(engine_classes()))
+def test_sync_resolves_owners_from_the_prefetched_directory(cls, mock_api):
+    mock_api.state.directory_size = 50
+    client = ZoomClient("token", base_url=mock_api.base_url)
+    engine = cls(client, UserIDCache(None), log=lambda message: None, prefetch_directory=True)
+    results = engine.sync({email: [] for email in ASSISTANTS[:4]}, dry_run=True)
+    engine.close()
+
+    assert results == []
+    # One page of GET /users and one assistant list per owner, no GET /users/{email}
+    assert mock_api.state.calls["GET v2"] == 1 + 4
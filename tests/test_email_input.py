@@ -0,0 +1,50 @@
+import pytest
+
+from email_input import InputReport, normalize_email, normalize_emails, normalize_pairs, split_entries
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("User@Example.com", "user@example.com"),
+    ("  user@example.com  ", "user@example.com"),
+    ("<user@example.com>", "user@example.com"),
+    ('"user@example.com"', "user@example.com"),
+    ("mailto:user@example.com", "user@example.com"),
+    ("USER2@example.com;", "user2@example.com"),
+    ("user2@example.com,", "user2@example.com"),
+    (" user2@example.com ; ", "user2@example.com"),
+    ("'<User2@Example.com>';", "user2@example.com"),
+    ("mailto:user2@example.com;", "user2@example.com"),
+])
+def test_normalize_email(raw, expected):
+    assert normalize_email(raw) == expected
+
+
+def test_outlook_and_csv_entries_are_accepted():
+    report = InputReport()
+    entries = ["USER2@example.com;", "user3@example.com,", "<user4@example.com>;", "user2@example.com"]
+    assert list(normalize_emails(entries, report=report)) == [
+        "user2@example.com", "user3@example.com", "user4@example.com"]
+    assert (report.accepted, report.duplicates, report.malformed) == (3, 1, 0)
+
+
+def test_split_entries_handles_pasted_lists():
+    lines = ["a@example.com; b@example.com,c@example.com", "Name <d@example.com>"]
+    assert list(split_entries(lines)) == ["a@example.com", "b@example.com", "c@example.com", "d@example.com"]
+
+
+def test_split_entries_mixes_bracketed_and_plain_addresses():
+    lines = ["Alice <a@example.com>; bob@example.com, carol@example.com",
+             '"Doe, Jane" <jane@example.com>, dan@example.com eve@example.com']
+    assert list(split_entries(lines)) == ["a@example.com", "bob@example.com", "carol@example.com",
+                                          "jane@example.com", "dan@example.com", "eve@example.com"]
+
+    report = InputReport()
+    assert len(list(normalize_emails(split_entries(lines[:1]), report=report))) == 3
+    assert report.summary() == "3 accepted"
+
+
+def test_normalize_pairs_drops_self_pairs_and_reverse_duplicates():
+    report = InputReport()
+    pairs = [("a@example.com;", "B@example.com"), ("b@example.com", "a@example.com"), ("a@example.com", "a@example.com")]
+    assert list(normalize_pairs(pairs, report)) == [("a@example.com", "b@example.com")]
+    assert (report.duplicates, report.self_assigned) == (1, 1)
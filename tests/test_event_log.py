@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+
+from conftest import APP_DIR
+from event_log import EventLog, aggregate, event_files, read_events
+
+WRITER = """
+import sys
+from event_log import EventLog
+log = EventLog(sys.argv[1], max_bytes=20000, backups=1000)
+log.begin_run("run")
+for n in range(500):
+    log.emit("pair", status="added", n=n)
+log.end_run()
+log.close()
+"""
+
+
+def test_processes_sharing_a_directory_keep_every_record(tmp_path):
+    writers = [subprocess.Popen([sys.executable, "-c", WRITER, str(tmp_path)], cwd=APP_DIR) for _ in range(4)]
+    assert [writer.wait() for writer in writers] == [0] * 4
+
+    files = event_files(str(tmp_path))
+    assert len(files) > 4
+    for path in files:
+        with open(path) as f:
+            for line in f:
+                json.loads(line)
+    records = list(read_events(str(tmp_path)))
+    assert len(records) == 4 * 502
+    assert len({record["run"] for record in records}) == 4
+
+
+def test_rotation_within_one_log(tmp_path):
+    log = EventLog(str(tmp_path), max_bytes=2000, backups=2)
+    run_id = log.begin_run("run")
+    for n in range(200):
+        log.emit("pair", status="added", n=n)
+    log.close()
+    assert len(event_files(str(tmp_path))) == 3
+    summary = aggregate(read_events(str(tmp_path), run_id))
+    assert 0 < summary["events"]["pair"]["added"]["count"] < 200
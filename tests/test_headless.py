@@ -0,0 +1,74 @@
+import json
+import time
+
+import headless
+import token_cache
+from run_journal import RunJournal
+from settings import Settings
+
+
+def test_run_without_a_login_leaves_no_journal(tmp_path, monkeypatch):
+    journals = tmp_path / "journals"
+    monkeypatch.setattr(headless, "JOURNAL_DIR", str(journals))
+    monkeypatch.setattr(token_cache, "load_token", lambda: None)
+    pairs = tmp_path / "pairs.csv"
+    pairs.write_text("owner@example.com,assistant@example.com\n")
+
+    assert headless.main(["run", "--input", str(pairs), "--output", str(tmp_path / "results.jsonl")]) == 2
+    assert not journals.exists() or not list(journals.iterdir())
+
+
+def test_resume_of_a_missing_journal_fails_without_creating_it(tmp_path):
+    path = tmp_path / "typo.jsonl"
+
+    assert headless.main(["resume", "--journal", str(path)]) == 2
+    assert not path.exists()
+
+
+def test_resume_closes_the_journal_when_the_engine_fails(tmp_path, monkeypatch):
+    closed = []
+
+    class Journal(headless.RunJournal):
+        def close(self):
+            closed.append(self.path)
+            super().close()
+
+    monkeypatch.setattr(headless, "RunJournal", Journal)
+    monkeypatch.setattr(token_cache, "load_token", lambda: None)
+    path = tmp_path / "run.jsonl"
+    path.write_text('{"type": "plan", "target": "user1@example.com", "assistants": ["user2@example.com"]}\n')
+
+    assert headless.main(["resume", "--journal", str(path), "--output", str(tmp_path / "results.jsonl")]) == 2
+    assert closed == [str(path)]
+
+
+def test_resume_finishes_only_the_pending_pairs(tmp_path, monkeypatch, mock_api):
+    settings = Settings()
+    settings.api_base_url = mock_api.base_url
+    settings.event_log = False
+    monkeypatch.setattr(headless, "load_settings", lambda: settings)
+    monkeypatch.setattr(headless, "USER_CACHE_FILE", str(tmp_path / "user_cache.json"))
+    monkeypatch.setattr(headless, "TOKEN_CACHE_FILE", str(tmp_path / "token_cache.json"))
+    monkeypatch.setattr(token_cache, "load_token",
+                        lambda: {"access_token": "token", "refresh_token": None, "expires_at": time.time() + 3600})
+    path = tmp_path / "run.jsonl"
+    path.write_text(
+        '{"type": "plan", "target": "user1@example.com", '
+        '"assistants": ["user2@example.com", "user3@example.com", "user4@example.com"]}\n'
+        '{"type": "pair", "owner": "user1@example.com", "assistant": "user2@example.com", "status": "added"}\n'
+        '{"type": "pair", "owner": "user2@example.com", "assistant": "user1@example.com", "status": "added"}\n'
+        '{"type": "pair", "owner": "user1@example.com", "assistant": "user3@example.com", "status": "added"}\n'
+        '{"type": "pair", "owner": "user3@example.com", "assis')
+    output = tmp_path / "results.jsonl"
+
+    assert headless.main(["resume", "--journal", str(path), "--output", str(output)]) == 0
+
+    written = [json.loads(line) for line in output.read_text().splitlines()]
+    assert {(row["owner"], row["assistant"]) for row in written} == {
+        ("user1@example.com", "user3@example.com"), ("user3@example.com", "user1@example.com"),
+        ("user1@example.com", "user4@example.com"), ("user4@example.com", "user1@example.com")}
+    # One bulk add of user3 and user4 to user1, one add of user1 to each; user2's pairs are not retried
+    assert mock_api.state.calls["POST v2"] == 3
+    journal = RunJournal(str(path))
+    journal.close()
+    assert journal.pending_count() == 0
@@ -0,0 +1,193 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from rate_limiter import (BACKGROUND, BULK, INTERACTIVE, MAX_RETRY_AFTER, AsyncRateLimitScheduler, PriorityGate,
+                          RateLimitScheduler, RequestCancelled, request_priority)
+from zoom_client import ZoomClient
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def start_lookup(client, email, priority=None):
+    """Look email up on another thread, bulk unless priority is given; returns (thread, outcome dict)"""
+    outcome = {}
+
+    def lookup():
+        try:
+            if priority is None:
+                outcome["user"] = client.get_user(email)
+            else:
+                with request_priority(priority):
+                    outcome["user"] = client.get_user(email)
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=lookup, daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+def test_interactive_get_does_not_join_paused_bulk_get(mock_api):
+    client = ZoomClient("token", base_url=mock_api.base_url)
+    gate = client.scheduler.gate
+    gate.pause()
+    thread, outcome = start_lookup(client, "user1@example.com")
+    wait_until(lambda: gate.stats()["bulk"]["queued"] == 1)
+
+    interactive, interactive_outcome = start_lookup(client, "user1@example.com", INTERACTIVE)
+    interactive.join(5)
+    assert interactive_outcome.get("user", {}).get("email") == "user1@example.com"
+    assert thread.is_alive()
+
+    gate.cancel()
+    thread.join(5)
+    assert isinstance(outcome.get("error"), RequestCancelled)
+    with request_priority(INTERACTIVE):
+        assert client.get_user("user1@example.com")["email"] == "user1@example.com"
+    client.close()
+
+
+def test_cancelled_gate_fails_bulk_requests_until_reset(mock_api):
+    client = ZoomClient("token", base_url=mock_api.base_url)
+    client.scheduler.gate.cancel()
+    with pytest.raises(RequestCancelled):
+        client.get_user("user1@example.com")
+    client.scheduler.gate.reset()
+    assert client.get_user("user1@example.com")["email"] == "user1@example.com"
+    client.close()
+
+
+class Response:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def scripted(*responses):
+    """send() that returns the given responses in turn, then 200s"""
+    queue = list(responses)
+    return lambda: queue.pop(0) if queue else Response()
+
+
+def test_429_waits_for_retry_after_and_halves_the_concurrency_limit():
+    scheduler = RateLimitScheduler({"light": 1000}, max_concurrency=8)
+    started = time.monotonic()
+    response = scheduler.execute("light", scripted(Response(429, {"Retry-After": "0.3"})))
+    elapsed = time.monotonic() - started
+
+    assert response.status_code == 200
+    assert 0.3 <= elapsed < 1.0
+    assert scheduler.stats() == {"retries": 1, "throttled": 1, "concurrency_limit": 4}
+
+
+def test_async_429_waits_for_retry_after_and_halves_the_concurrency_limit():
+    scheduler = AsyncRateLimitScheduler({"light": 1000}, max_concurrency=8)
+    send = scripted(Response(429, {"Retry-After": "0.3"}))
+
+    async def send_async():
+        return send()
+
+    started = time.monotonic()
+    response = asyncio.run(scheduler.execute("light", send_async))
+
+    assert response.status_code == 200
+    assert 0.3 <= time.monotonic() - started < 1.0
+    assert scheduler.stats() == {"retries": 1, "throttled": 1, "concurrency_limit": 4}
+
+
+def test_429_with_a_retry_after_past_the_limit_is_returned_at_once():
+    scheduler = RateLimitScheduler({"light": 1000})
+    response = scheduler.execute("light", scripted(Response(429, {"Retry-After": str(MAX_RETRY_AFTER + 1)})))
+
+    assert response.status_code == 429
+    assert scheduler.stats()["retries"] == 0
+
+
+def test_concurrency_limit_recovers_one_step_per_run_of_successes():
+    scheduler = RateLimitScheduler({"light": 1000}, max_concurrency=8)
+    scheduler.execute("light", scripted(Response(429, {"Retry-After": "0"}), Response(429, {"Retry-After": "0"})))
+    assert scheduler.limiter.limit == 2
+
+    # The retry that succeeded counts as the first success
+    for _ in range(scheduler.limiter.increase_after - 2):
+        scheduler.execute("light", scripted())
+    assert scheduler.limiter.limit == 2
+    scheduler.execute("light", scripted())
+    assert scheduler.limiter.limit == 3
+
+
+def test_in_flight_requests_stay_within_the_concurrency_limit():
+    scheduler = RateLimitScheduler({"light": 1000}, max_concurrency=2)
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+
+    def send():
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(0.05)
+        with lock:
+            state["in_flight"] -= 1
+        return Response()
+
+    def burst():
+        state["peak"] = 0
+        threads = [threading.Thread(target=scheduler.execute, args=("light", send)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        return state["peak"]
+
+    assert burst() == 2
+    scheduler.execute("light", scripted(Response(429, {"Retry-After": "0"})))
+    assert burst() == 1
+
+
+def test_mock_api_429s_are_retried_after_retry_after(mock_api):
+    # 6 lookups per one-second window; the client's own pacing is out of the way
+    mock_api.state.rate_limit = 4
+    client = ZoomClient("token", base_url=mock_api.base_url,
+                        scheduler=RateLimitScheduler({"light": 1000}, max_concurrency=8))
+    started = time.monotonic()
+    users = [client.get_user(f"user{i}@example.com") for i in range(12)]
+    elapsed = time.monotonic() - started
+    stats = client.scheduler.stats()
+    client.close()
+
+    assert [user["id"] for user in users] == [f"u{i}" for i in range(12)]
+    assert stats["throttled"] >= 1
+    # The mock sends Retry-After: 1
+    assert elapsed >= 1.0
+    assert stats["concurrency_limit"] <= 4
+    assert mock_api.state.calls["GET v2"] == 12 + stats["throttled"]
+
+
+def test_gate_admits_bulk_before_background_after_a_pause():
+    gate = PriorityGate()
+    gate.pause()
+    order = []
+
+    def request(priority):
+        queued = gate.enter(priority)
+        order.append(priority)
+        gate.leave(priority, queued)
+
+    threads = [threading.Thread(target=request, args=(priority,)) for priority in (BACKGROUND, BULK)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: gate.stats()[BULK]["queued"] == 1 and gate.stats()[BACKGROUND]["queued"] == 1)
+    request(INTERACTIVE)
+    gate.resume()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == [INTERACTIVE, BULK, BACKGROUND]
@@ -0,0 +1,66 @@
+import json
+
+from assistant_engine import pair_result
+from run_journal import RunJournal
+
+PLAN = {"type": "plan", "target": "user1@example.com",
+        "assistants": ["user2@example.com", "user3@example.com", "user4@example.com", "ghost@nowhere.invalid"]}
+
+
+def pair(owner, assistant, status="added"):
+    return {"type": "pair", "owner": owner, "assistant": assistant, "status": status, "error": None}
+
+
+def write_journal(path, entries, torn=""):
+    path.write_text("".join(json.dumps(entry) + "\n" for entry in entries) + torn)
+
+
+def test_pending_lists_pairs_not_done_in_both_directions(tmp_path):
+    path = tmp_path / "run.jsonl"
+    write_journal(path, [
+        PLAN,
+        pair("user1@example.com", "user2@example.com"),
+        pair("user2@example.com", "user1@example.com", "present"),
+        pair("user1@example.com", "user3@example.com"),
+        pair("user3@example.com", "user1@example.com", "failed"),
+        {"type": "missing", "email": "ghost@nowhere.invalid"},
+    ])
+    journal = RunJournal(str(path))
+    journal.close()
+
+    assert list(journal.pending()) == [("user1@example.com", ["user3@example.com", "user4@example.com"])]
+    assert journal.pending_count() == 2
+
+
+def test_torn_last_line_is_skipped_and_the_next_record_starts_a_new_line(tmp_path):
+    path = tmp_path / "run.jsonl"
+    write_journal(path, [PLAN, pair("user1@example.com", "user2@example.com")],
+                  torn='{"type": "pair", "owner": "user2@example.com", "assis')
+    journal = RunJournal(str(path), fsync_every=1)
+    assert journal.pending_count() == 4
+    journal.record(pair_result("user2@example.com", "user1@example.com", "added"))
+    journal.close()
+
+    lines = path.read_text().splitlines()
+    assert lines[2].endswith('"assis')
+    assert json.loads(lines[3])["owner"] == "user2@example.com"
+    journal = RunJournal(str(path))
+    journal.close()
+    assert journal.pending_count() == 3
+
+
+def test_replay_merges_plans_and_outcomes_across_reopens(tmp_path):
+    path = tmp_path / "run.jsonl"
+    journal = RunJournal(str(path), fsync_every=1)
+    journal.plan("user1@example.com", ["user2@example.com"])
+    journal.record(pair_result("user1@example.com", "user2@example.com", "added"))
+    journal.close()
+
+    journal = RunJournal(str(path), fsync_every=1)
+    journal.plan("user1@example.com", ["user2@example.com", "user3@example.com"])
+    journal.record(pair_result("user2@example.com", "user1@example.com", "added"))
+    journal.close()
+
+    journal = RunJournal(str(path))
+    journal.close()
+    assert list(journal.pending()) == [("user1@example.com", ["user3@example.com"])]
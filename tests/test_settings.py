@@ -0,0 +1,32 @@
+import runpy
+
+from settings import save_credentials
+
+
+def test_save_credentials_keeps_other_settings(tmp_path):
+    path = tmp_path / "config.py"
+    path.write_text('# My setup\nCLIENT_ID = "old"\nCLIENT_SECRET = "old-secret"\n'
+                    'API_BASE_URL = "http://127.0.0.1:18080/v2"\nMAX_WORKERS = 4\n'
+                    "RATE_LIMITS = {'light': 40}\n")
+    save_credentials("new-id", 'se"cret', str(path))
+
+    config = runpy.run_path(str(path))
+    assert config["CLIENT_ID"] == "new-id"
+    assert config["CLIENT_SECRET"] == 'se"cret'
+    assert config["API_BASE_URL"] == "http://127.0.0.1:18080/v2"
+    assert config["MAX_WORKERS"] == 4
+    assert config["RATE_LIMITS"] == {"light": 40}
+    assert path.read_text().startswith("# My setup\n")
+
+
+def test_save_credentials_adds_missing_keys_and_files(tmp_path):
+    path = tmp_path / "config.py"
+    path.write_text("ENGINE = 'asyncio'")
+    save_credentials("id", "secret", str(path))
+    config = runpy.run_path(str(path))
+    assert (config["ENGINE"], config["CLIENT_ID"], config["CLIENT_SECRET"]) == ("asyncio", "id", "secret")
+
+    new_path = tmp_path / "new_config.py"
+    save_credentials("id", "secret", str(new_path))
+    config = runpy.run_path(str(new_path))
+    assert (config["CLIENT_ID"], config["CLIENT_SECRET"]) == ("id", "secret")
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from singleflight import AsyncSingleFlight, SingleFlight
+
+
+def run_concurrently(flight, fn, callers=5):
+    """Call flight.do("key", fn) from several threads; returns their results or exceptions"""
+    outcomes = [None] * callers
+
+    def call(index):
+        try:
+            outcomes[index] = flight.do("key", fn)
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def leader_call(result=None, error=None):
+    """fn that blocks until released and counts how often it ran"""
+    started, release, runs = threading.Event(), threading.Event(), []
+
+    def fn():
+        runs.append(1)
+        started.set()
+        release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    return fn, started, release, runs
+
+
+def wait_for_waiters(flight, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while flight.stats()["saved"] < count:
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    fn, started, release, runs = leader_call(result={"id": "u1"})
+    threads, outcomes = run_concurrently(flight, fn)
+    started.wait(5)
+    wait_for_waiters(flight, 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(runs) == 1
+    assert outcomes == [{"id": "u1"}] * 5
+    assert flight.stats() == {"calls": 1, "saved": 4}
+    # Nothing is cached: the next caller runs the call again
+    assert flight.do("key", lambda: "fresh") == "fresh"
+
+
+def test_an_error_reaches_every_waiter():
+    flight = SingleFlight()
+    error = ConnectionError("offline")
+    fn, started, release, runs = leader_call(error=error)
+    threads, outcomes = run_concurrently(flight, fn)
+    started.wait(5)
+    wait_for_waiters(flight, 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(runs) == 1
+    assert outcomes == [error] * 5
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+
+def test_async_callers_share_one_call_and_its_error():
+    async def scenario():
+        flight = AsyncSingleFlight()
+        runs = []
+
+        async def lookup():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            return {"id": "u1"}
+
+        async def failing():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            raise ConnectionError("offline")
+
+        shared = await asyncio.gather(*(flight.do("key", lookup) for _ in range(5)))
+        failed = await asyncio.gather(*(flight.do("other", failing) for _ in range(5)), return_exceptions=True)
+        return flight, runs, shared, failed
+
+    flight, runs, shared, failed = asyncio.run(scenario())
+
+    assert len(runs) == 2
+    assert shared == [{"id": "u1"}] * 5
+    assert all(isinstance(outcome, ConnectionError) for outcome in failed) and len(set(map(id, failed))) == 1
+    assert flight.stats() == {"calls": 2, "saved": 8}
+
+
+def test_cancelling_one_async_caller_does_not_cancel_the_call():
+    async def scenario():
+        flight = AsyncSingleFlight()
+
+        async def lookup():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", lookup))
+        second = asyncio.ensure_future(flight.do("key", lookup))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
@@ -0,0 +1,94 @@
+import pytest
+
+from assistant_engine import summarize
+from test_assistant_engine import engine_classes
+from user_cache import UserIDCache
+from zoom_client import ZoomClient
+
+
+def make_engine(cls, mock_api, lines=None):
+    client = ZoomClient("token", base_url=mock_api.base_url)
+    log = lines.append if lines is not None else (lambda message: None)
+    return cls(client, UserIDCache(None), log=log, batch_size=2)
+
+
+@pytest.mark.parametrize("cls", list(engine_classes()))
+def test_missing_owner_is_reported_in_the_results(cls, mock_api):
+    lines = []
+    engine = make_engine(cls, mock_api, lines)
+    results = engine.sync({"ghost@nowhere.invalid": ["user1@example.com", "user2@example.com"],
+                           "nobody@nowhere.invalid": []})
+    engine.close()
+
+    assert [(result.owner_email, result.assistant_email, result.status) for result in results] == [
+        ("ghost@nowhere.invalid", "user1@example.com", "not_found"),
+        ("ghost@nowhere.invalid", "user2@example.com", "not_found"),
+        ("nobody@nowhere.invalid", "", "not_found"),
+    ]
+    assert not any(result.success for result in results)
+    assert "Warning: Owner email not found: ghost@nowhere.invalid" in lines
+    assert summarize(results) == "0 added, 0 failed, 3 not found"
+
+
+def seed(mock_api, user_id, *numbers):
+    mock_api.state.assistants[user_id] = {f"u{n}": {"id": f"u{n}", "email": f"user{n}@example.com"}
+                                          for n in numbers}
+
+
+def assistants_of(mock_api, user_id):
+    return sorted(a["email"] for a in mock_api.state.assistants.get(user_id, {}).values())
+
+
+def statuses(results):
+    return {result.assistant_email: result.status for result in results}
+
+
+@pytest.mark.parametrize("cls", list(engine_classes()))
+def test_sync_removes_only_the_unlisted_assistants(cls, mock_api):
+    seed(mock_api, "u1", 2, 3, 4)
+    engine = make_engine(cls, mock_api)
+    results = engine.sync({"user1@example.com": ["user2@example.com", "user5@example.com"]})
+    engine.close()
+
+    assert statuses(results) == {"user2@example.com": "present", "user5@example.com": "added",
+                                 "user3@example.com": "removed", "user4@example.com": "removed"}
+    assert assistants_of(mock_api, "u1") == ["user2@example.com", "user5@example.com"]
+    assert mock_api.state.calls["DELETE v2"] == 2
+
+
+@pytest.mark.parametrize("cls", list(engine_classes()))
+def test_sync_with_an_empty_list_removes_all_in_one_request(cls, mock_api):
+    seed(mock_api, "u1", 2, 3)
+    engine = make_engine(cls, mock_api)
+    results = engine.sync({"user1@example.com": []})
+    engine.close()
+
+    assert statuses(results) == {"user2@example.com": "removed", "user3@example.com": "removed"}
+    assert assistants_of(mock_api, "u1") == []
+    assert mock_api.state.calls["DELETE v2"] == 1
+
+
+@pytest.mark.parametrize("cls", list(engine_classes()))
+def test_sync_keeps_unlisted_assistants_without_remove(cls, mock_api):
+    seed(mock_api, "u1", 2, 3)
+    engine = make_engine(cls, mock_api)
+    results = engine.sync({"user1@example.com": ["user4@example.com"]}, remove=False)
+    engine.close()
+
+    assert statuses(results) == {"user4@example.com": "added"}
+    assert assistants_of(mock_api, "u1") == ["user2@example.com", "user3@example.com", "user4@example.com"]
+    assert mock_api.state.calls["DELETE v2"] == 0
+
+
+@pytest.mark.parametrize("cls", list(engine_classes()))
+def test_dry_run_sync_sends_no_writes(cls, mock_api):
+    seed(mock_api, "u1", 2, 3)
+    engine = make_engine(cls, mock_api)
+    results = engine.sync({"user1@example.com": ["user2@example.com", "user4@example.com"]}, dry_run=True)
+    engine.close()
+
+    assert statuses(results) == {"user2@example.com": "present", "user4@example.com": "planned",
+                                 "user3@example.com": "planned_removal"}
+    assert assistants_of(mock_api, "u1") == ["user2@example.com", "user3@example.com"]
+    assert mock_api.state.calls["DELETE v2"] == 0
+    assert mock_api.state.calls["POST v2"] == 0
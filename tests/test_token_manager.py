@@ -0,0 +1,43 @@
+import time
+
+import headless
+import token_cache
+from settings import Settings
+from token_manager import TokenManager
+from zoom_client import ZoomClient
+
+
+class FailingClient(ZoomClient):
+    def refresh_access_token(self, client_id, client_secret, refresh_token):
+        raise ConnectionError("offline")
+
+
+def test_failed_background_refresh_without_an_expiry_does_not_raise():
+    tokens = TokenManager(FailingClient("token"), "id", "secret", log=lambda message: None)
+    tokens.set_tokens("token", "refresh-token", None)
+    tokens._refresh_in_background()
+    tokens.stop()
+
+    assert tokens._timer is None
+
+
+def test_failed_background_refresh_retries_while_the_token_is_valid():
+    tokens = TokenManager(FailingClient("token"), "id", "secret", log=lambda message: None)
+    tokens.set_tokens("token", "refresh-token", time.time() + 3600)
+    tokens._refresh_in_background()
+    retry = tokens._timer
+    tokens.stop()
+
+    assert retry is not None and retry.interval == 60
+
+
+def test_headless_run_with_a_null_cached_expiry_asks_for_a_new_login(tmp_path, monkeypatch):
+    settings = Settings()
+    settings.event_log = False
+    monkeypatch.setattr(headless, "load_settings", lambda: settings)
+    monkeypatch.setattr(headless, "JOURNAL_DIR", str(tmp_path / "journals"))
+    monkeypatch.setattr(token_cache, "load_token", lambda: {"access_token": "token", "expires_at": None})
+    pairs = tmp_path / "pairs.csv"
+    pairs.write_text("user1@example.com,user2@example.com\n")
+
+    assert headless.main(["run", "--input", str(pairs), "--output", str(tmp_path / "results.jsonl")]) == 2
@@ -0,0 +1,57 @@
+import json
+import threading
+
+from user_cache import UserIDCache
+
+
+def test_flush_keeps_entries_of_other_caches_on_the_same_file(tmp_path):
+    path = str(tmp_path / "users.json")
+    first, second = UserIDCache(path), UserIDCache(path)
+    first.put("a@example.com", "A")
+    second.put("b@example.com", "B")
+    second.put_missing("gone@example.com")
+    first.flush()
+    second.flush()
+
+    cache = UserIDCache(path)
+    assert cache.lookup("a@example.com") == (True, "A")
+    assert cache.lookup("b@example.com") == (True, "B")
+    assert cache.lookup("gone@example.com") == (True, None)
+
+
+def test_concurrent_flushes_lose_nothing(tmp_path):
+    path = str(tmp_path / "users.json")
+    caches = [UserIDCache(path) for _ in range(4)]
+
+    def fill(index, cache):
+        for n in range(50):
+            cache.put(f"user{index}-{n}@example.com", f"{index}-{n}")
+            cache.flush()
+
+    threads = [threading.Thread(target=fill, args=item) for item in enumerate(caches)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(path) as f:
+        users = json.load(f)["users"]
+    assert len(users) == 200
+    assert not [name for name in tmp_path.iterdir() if name.name.startswith(".user_cache-")]
+
+
+def test_failed_flush_is_retried_by_the_next_one(tmp_path, monkeypatch):
+    path = str(tmp_path / "users.json")
+    cache = UserIDCache(path)
+    cache.put("a@example.com", "A")
+    write = cache._write
+
+    def fail(users):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(cache, "_write", fail)
+    cache.flush()
+    monkeypatch.setattr(cache, "_write", write)
+    cache.flush()
+
+    assert UserIDCache(path).lookup("a@example.com") == (True, "A")
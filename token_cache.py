@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from file_lock import FileLock
+from settings import TOKEN_CACHE_FILE
+
+
+# Writes go to a temporary file that replaces the cache in one step, so a
+# reader in another process sees the old or the new token, never half of
+# one. Writers and token refreshes also hold <cache>.lock, so only one
+# process at a time rotates the refresh token.
+
+
+@contextmanager
+def locked(path=TOKEN_CACHE_FILE):
+    """Hold the cache's lock file; one process at a time writes or refreshes the token"""
+    lock = FileLock(path + ".lock")
+    try:
+        with lock:
+            yield
+    finally:
+        lock.close()
+
+
+def read_token(path=TOKEN_CACHE_FILE):
+    """Return the cached token data as stored, or None"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_token(token_data, path=TOKEN_CACHE_FILE):
+    """Atomically replace the cache file; the caller holds locked(path)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".token_cache-", dir=directory)
+    try:
+        # mkstemp creates the file readable only by you: the refresh token stays valid for months
+        with os.fdopen(fd, 'w') as f:
+            json.dump(token_data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def load_token(path=TOKEN_CACHE_FILE):
+    """Return the cached token data if it is still valid or can be refreshed, else None"""
+    try:
+        token_data = read_token(path)
+        if token_data is not None:
+            expires_at = token_data.get('expires_at')
+            if expires_at and time.time() < expires_at:
+                print("Cached token loaded and is still valid")
+                return token_data
+
+            if token_data.get('refresh_token'):
+                print("Cached token expired, it will be refreshed")
+                return token_data
+
+            print("Cached token expired")
+            clear_token(path)
+    except Exception as e:
+        print(f"Error loading cached token: {e}")
+    return None
+
+
+def save_token(token_data, path=TOKEN_CACHE_FILE):
+    """Save token data to the cache file"""
+    try:
+        with locked(path):
+            write_token(token_data, path)
+        print("Token cached successfully")
+    except Exception as e:
+        print(f"Error saving token cache: {e}")
+
+
+def clear_token(path=TOKEN_CACHE_FILE):
+    """Remove the cache file"""
+    try:
+        with locked(path):
+            if os.path.exists(path):
+                os.remove(path)
+                print("Token cache cleared")
+    except Exception as e:
+        print(f"Error clearing token cache: {e}")
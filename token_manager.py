@@ -0,0 +1,187 @@
+import threading
+import time
+
+import token_cache
+
+
+# Refresh this many seconds before the access token expires
+REFRESH_MARGIN = 300
+# Wait before retrying a failed background refresh
+REFRESH_RETRY_DELAY = 60
+
+
+class TokenManager:
+    """Owns the OAuth tokens and keeps the client's access token fresh
+
+    A background timer refreshes the access token shortly before it
+    expires, and clients call refresh() after a 401. Refreshes are
+    single-flight: concurrent callers queue on one lock, and whoever gets it
+    after a refresh already happened just picks up the new token.
+
+    With cache_path, the token cache file is shared with other processes:
+    refreshes hold its lock, take over a newer token another process has
+    already saved instead of refreshing again (Zoom rotates the refresh
+    token, so a second refresh with the old one would fail), and save the
+    new token before releasing it.
+    """
+
+    def __init__(self, client, client_id="", client_secret="", log=print, on_refresh=None,
+                 margin=REFRESH_MARGIN, events=None, cache_path=None):
+        self.client = client
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.log = log
+        # Called with the token data after every successful refresh, e.g. to save it
+        self.on_refresh = on_refresh
+        self.margin = margin
+        # Refreshes are recorded as "auth" records in this EventLog, if given
+        self.events = events
+        self.cache_path = cache_path
+        self.refresh_token = None
+        self.expires_at = None
+        self._lock = threading.Lock()
+        self._timer = None
+        client.token_manager = self
+
+    @property
+    def access_token(self):
+        return self.client.access_token
+
+    def token_data(self):
+        return {
+            'access_token': self.access_token,
+            'refresh_token': self.refresh_token,
+            'expires_at': self.expires_at,
+        }
+
+    def set_tokens(self, access_token, refresh_token=None, expires_at=None):
+        """Install new tokens and schedule the next proactive refresh"""
+        with self._lock:
+            self.client.access_token = access_token
+            if refresh_token:
+                self.refresh_token = refresh_token
+            self.expires_at = expires_at
+        self._schedule()
+
+    def clear(self):
+        """Forget all tokens and stop refreshing"""
+        self.stop()
+        with self._lock:
+            self.client.access_token = None
+            self.refresh_token = None
+            self.expires_at = None
+
+    def refresh(self, stale_token=None):
+        """Exchange the refresh token for a new access token; returns True on success
+
+        stale_token is the access token a failed request used. If it has
+        already been replaced by another thread's refresh, nothing is sent.
+        """
+        adopted = False
+        with self._lock:
+            if stale_token is not None and self.client.access_token != stale_token:
+                return bool(self.client.access_token)
+            if self.cache_path is None:
+                data = self._refresh()
+            else:
+                with token_cache.locked(self.cache_path):
+                    data = self._adopt_cached()
+                    adopted = data is not None
+                    if not adopted:
+                        data = self._refresh()
+                        if data is not None:
+                            self._save(data)
+            if data is None:
+                return False
+
+        if adopted:
+            self.log("Access token taken from the shared token cache")
+            self._emit("adopt")
+        else:
+            self.log("Access token refreshed")
+            self._emit("refresh")
+        if self.on_refresh is not None:
+            self.on_refresh(data)
+        self._schedule()
+        return True
+
+    def _refresh(self):
+        """Send the refresh request; returns the new token data, or None after logging why"""
+        if not self.refresh_token or not self.client_id:
+            return None
+        try:
+            response = self.client.refresh_access_token(self.client_id, self.client_secret,
+                                                        self.refresh_token)
+            result = response.json()
+        except Exception as e:
+            self.log(f"Token refresh error: {str(e)}")
+            self._emit("refresh_failed", error=str(e))
+            return None
+        if response.status_code != 200:
+            reason = result.get('reason') or result.get('error', 'Unknown error')
+            self.log(f"Token refresh failed: {reason}")
+            self._emit("refresh_failed", error=reason, status=response.status_code)
+            return None
+
+        self.client.access_token = result["access_token"]
+        # Zoom rotates refresh tokens; the old one stops working
+        self.refresh_token = result.get("refresh_token", self.refresh_token)
+        self.expires_at = time.time() + result.get("expires_in", 3600)
+        return self.token_data()
+
+    def _adopt_cached(self):
+        """Switch to a newer token another process saved; returns its data, or None"""
+        try:
+            cached = token_cache.read_token(self.cache_path) or {}
+        except ValueError:
+            return None
+        expires_at = cached.get('expires_at') or 0
+        if (not cached.get('access_token') or cached['access_token'] == self.client.access_token
+                or expires_at <= max(self.expires_at or 0, time.time())):
+            return None
+        self.client.access_token = cached['access_token']
+        self.refresh_token = cached.get('refresh_token') or self.refresh_token
+        self.expires_at = expires_at
+        return self.token_data()
+
+    def _save(self, data):
+        """Write the new tokens into the shared cache, keeping its other fields (e.g. email)"""
+        try:
+            try:
+                cached = token_cache.read_token(self.cache_path) or {}
+            except ValueError:
+                cached = {}
+            token_cache.write_token(dict(cached, **data), self.cache_path)
+        except OSError as e:
+            self.log(f"Error saving token cache: {e}")
+
+    def _emit(self, action, **fields):
+        if self.events is not None:
+            self.events.emit("auth", action=action, **fields)
+
+    def _schedule(self, delay=None):
+        self.stop()
+        # clear() and refreshes on other threads may change these meanwhile
+        with self._lock:
+            refresh_token, expires_at = self.refresh_token, self.expires_at
+        if not refresh_token or not expires_at:
+            return
+        if delay is None:
+            delay = max(0, expires_at - self.margin - time.time())
+        self._timer = threading.Timer(delay, self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self):
+        if self.refresh():
+            return
+        with self._lock:
+            retry = self.refresh_token and (self.expires_at or 0) > time.time()
+        if retry:
+            self._schedule(REFRESH_RETRY_DELAY)
+
+    def stop(self):
+        """Cancel the background refresh timer"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,164 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from file_lock import FileLock
+
+
+DEFAULT_TTL = 24 * 3600          # Resolved user IDs are trusted for a day
+DEFAULT_NEGATIVE_TTL = 10 * 60   # "User not found" answers expire much sooner
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class UserIDCache:
+    """Email to user ID cache with an in-memory LRU layer backed by a JSON file
+
+    A cached value of None records that the API answered 404 for that email
+    (negative caching); it uses the shorter negative TTL. Several processes
+    (shard workers) may share the file: flush() merges what is on disk into
+    its own entries under <path>.lock before replacing the file.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # email -> (user_id, expires_at), most recently used last
+        self._memory = OrderedDict()
+        # Entries read from disk that have not been promoted to memory yet
+        self._disk = {}
+        # Changes not yet written by flush()
+        self._changes = 0
+
+        self.load()
+
+    @staticmethod
+    def _key(email):
+        return email.strip().lower()
+
+    def load(self):
+        """Load the on-disk layer, dropping expired entries"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            entries = self._read(time.time())
+            with self._lock:
+                self._disk = entries
+        except Exception as e:
+            print(f"Error loading user cache: {e}")
+
+    def _read(self, now):
+        """Unexpired entries of the cache file as {email: (user_id, expires_at)}"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        return {email: (entry[0], entry[1]) for email, entry in data.get("users", {}).items() if entry[1] > now}
+
+    def lookup(self, email):
+        """Return (hit, user_id); user_id is None for a cached 404"""
+        key = self._key(email)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                entry = self._disk.pop(key, None)
+                if entry is not None:
+                    self._store(key, entry)
+            if entry is not None and entry[1] > now:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                del self._memory[key]
+                self._changes += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, email, user_id):
+        """Cache a resolved user ID"""
+        with self._lock:
+            self._store(self._key(email), (user_id, time.time() + self.ttl))
+
+    def put_missing(self, email):
+        """Cache a 404 answer for an email"""
+        with self._lock:
+            self._store(self._key(email), (None, time.time() + self.negative_ttl))
+
+    def _store(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        self._changes += 1
+        # Evict least recently used entries back to the disk layer
+        while len(self._memory) > self.max_entries:
+            old_key, old_entry = self._memory.popitem(last=False)
+            self._disk[old_key] = old_entry
+
+    def flush(self):
+        """Write both layers to disk if anything changed, keeping entries other processes wrote"""
+        if not self.path:
+            return
+        with self._lock:
+            changes = self._changes
+            if not changes:
+                return
+            now = time.time()
+            users = {k: v for k, v in self._disk.items() if v[1] > now}
+            users.update({k: v for k, v in self._memory.items() if v[1] > now})
+        lock = FileLock(f"{self.path}.lock")
+        try:
+            with lock:
+                # The entry that expires later is the more recent answer
+                for email, entry in self._read(now).items():
+                    if email not in users or entry[1] > users[email][1]:
+                        users[email] = entry
+                self._write({email: list(entry) for email, entry in users.items()})
+        except Exception as e:
+            # Still counted as unsaved, so the next flush tries again
+            print(f"Error saving user cache: {e}")
+            return
+        finally:
+            lock.close()
+        with self._lock:
+            # Changes made while writing stay unsaved
+            self._changes = max(0, self._changes - changes)
+
+    def _write(self, users):
+        """Atomically replace the cache file; the caller holds its lock"""
+        fd, temp_path = tempfile.mkstemp(prefix=".user_cache-", dir=os.path.dirname(os.path.abspath(self.path)))
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"users": users}, f)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def clear(self):
+        """Drop all cached entries and remove the cache file"""
+        with self._lock:
+            self._memory.clear()
+            self._disk.clear()
+            self._changes = 0
+        try:
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+        except Exception as e:
+            print(f"Error clearing user cache: {e}")
+
+    def stats(self):
+        """Return hit/miss counters"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "entries": len(self._memory) + len(self._disk)}
@@ -0,0 +1,162 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import endpoint_name
+from rate_limiter import RateLimitScheduler, current_priority
+from singleflight import SingleFlight
+
+
+API_BASE_URL = "https://api.zoom.us/v2"
+OAUTH_BASE_URL = "https://zoom.us/oauth"
+
+# Connections kept open per host; sized so every worker can hold one
+DEFAULT_POOL_SIZE = 10
+# Largest page GET /users returns
+USERS_PAGE_SIZE = 300
+
+
+class ZoomAPIError(Exception):
+    """Raised when the Zoom API answers with a non-success status code"""
+
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+        super().__init__(f"API error: {status_code} - {text}")
+
+
+class ZoomClient:
+    """Zoom REST API client sharing one keep-alive session across all calls"""
+
+    def __init__(self, access_token=None, base_url=API_BASE_URL,
+                 oauth_base_url=OAUTH_BASE_URL, pool_size=DEFAULT_POOL_SIZE, scheduler=None):
+        self.access_token = access_token
+        self.base_url = base_url
+        self.oauth_base_url = oauth_base_url
+        self.pool_size = pool_size
+        # Set by a TokenManager; used to refresh the token once after a 401
+        self.token_manager = None
+        # Every REST call is paced by Zoom's per-category rate limits
+        self.scheduler = scheduler or RateLimitScheduler(max_concurrency=pool_size)
+        # Concurrent identical GETs (e.g. workers resolving the same email) share one request
+        self.inflight = SingleFlight(self.scheduler.metrics)
+
+        # One pooled session so a batch reuses warm TCP+TLS connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+    def request(self, method, path, category="light", **kwargs):
+        """Send an authenticated request to the REST API and return the response
+
+        category is the endpoint's Zoom rate-limit category ("light",
+        "medium" or "heavy"). Throttled requests are retried by the scheduler,
+        and a 401 is retried once after the token manager refreshes the token.
+        A GET identical to one already in flight with the same priority waits
+        for that one's response, so an interactive call never waits behind a
+        paused or cancelled bulk one.
+        """
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        if method == "GET" and set(kwargs) <= {"params"}:
+            key = (url, tuple(sorted((kwargs.get("params") or {}).items())), current_priority())
+            return self.inflight.do(key, lambda: self._request(method, url, path, category, **kwargs),
+                                    endpoint_name(method, path))
+        return self._request(method, url, path, category, **kwargs)
+
+    def _request(self, method, url, path, category, **kwargs):
+        extra_headers = kwargs.pop("headers", None) or {}
+
+        def send():
+            # Build headers per attempt so a retry picks up the current token
+            headers = {"Content-Type": "application/json"}
+            if self.access_token:
+                headers["Authorization"] = f"Bearer {self.access_token}"
+            headers.update(extra_headers)
+            return self.session.request(method, url, headers=headers, **kwargs)
+
+        # Adding an assistant is not retried on 5xx in case the first attempt went through
+        options = {"retry_server_errors": method != "POST", "endpoint": endpoint_name(method, path)}
+        token = self.access_token
+        response = self.scheduler.execute(category, send, **options)
+        if response.status_code == 401 and self.token_manager is not None and self.token_manager.refresh(token):
+            response = self.scheduler.execute(category, send, **options)
+        return response
+
+    def request_json(self, method, path, ok_statuses=(200,), **kwargs):
+        """Send a request and return the decoded body, raising ZoomAPIError on failure"""
+        response = self.request(method, path, **kwargs)
+        if response.status_code not in ok_statuses:
+            raise ZoomAPIError(response.status_code, response.text)
+        if response.status_code == 204 or not response.content:
+            return {}
+        return response.json()
+
+    # OAuth device flow
+
+    def request_device_code(self, client_id, client_secret):
+        """Start the device flow and return the raw response"""
+        return self.session.post(
+            f"{self.oauth_base_url}/devicecode",
+            params={"client_id": client_id},
+            auth=(client_id, client_secret),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+
+    def request_token(self, data):
+        """Post to the token endpoint and return the raw response"""
+        return self.session.post(f"{self.oauth_base_url}/token", data=data)
+
+    def refresh_access_token(self, client_id, client_secret, refresh_token):
+        """Exchange a refresh token for a new access token and return the raw response"""
+        return self.session.post(
+            f"{self.oauth_base_url}/token",
+            data={"grant_type": "refresh_token", "refresh_token": refresh_token},
+            auth=(client_id, client_secret),
+        )
+
+    # Users and assistants
+
+    def get_me(self):
+        """Get the authenticated user's profile"""
+        return self.request_json("GET", "/users/me")
+
+    def get_user(self, email):
+        """Get a user's profile by email address or user ID"""
+        return self.request_json("GET", f"/users/{email}")
+
+    def list_users(self, page_number=1, page_size=USERS_PAGE_SIZE, status="active"):
+        """Get one page of the account's users; page_count in the body gives the total"""
+        params = {"status": status, "page_size": page_size, "page_number": page_number}
+        return self.request_json("GET", "/users", category="medium", params=params)
+
+    def list_assistants(self, user_id):
+        """List the assistants of a user, following next_page_token if the list is paged"""
+        assistants, params = [], None
+        while True:
+            data = self.request_json("GET", f"/users/{user_id}/assistants", category="medium", params=params)
+            assistants.extend(data.get("assistants", []))
+            if not data.get("next_page_token"):
+                return assistants
+            params = {"next_page_token": data["next_page_token"]}
+
+    def delete_assistant(self, user_id, assistant_id):
+        """Remove one assistant from a user"""
+        return self.request_json("DELETE", f"/users/{user_id}/assistants/{assistant_id}", category="medium",
+                                 ok_statuses=(204,))
+
+    def delete_assistants(self, user_id):
+        """Remove all assistants from a user"""
+        return self.request_json("DELETE", f"/users/{user_id}/assistants", category="medium",
+                                 ok_statuses=(204,))
+
+    def add_assistants(self, user_id, assistant_emails):
+        """Add one or more assistants to a user in a single request"""
+        data = {
+            "assistants": [{"email": email} for email in assistant_emails]
+        }
+        return self.request_json("POST", f"/users/{user_id}/assistants", category="medium",
+                                 ok_statuses=(200, 201, 204), json=data)
@@ -0,0 +1,1080 @@
+import tkinter as tk
+from tkinter import ttk, scrolledtext, messagebox, filedialog
+import threading
+import time
+from datetime import datetime
+import os
+
+# Only what the window needs is imported up front. The API stack (requests,
+# the engines, headless writers) is imported by load_backend() and in the
+# methods that use it, after the window is on screen.
+from email_input import InputReport, is_valid_email, normalize_email, normalize_emails, read_entries, split_entries
+from settings import (EVENT_LOG_DIR, JOURNAL_DIR, LOG_DIR, TOKEN_CACHE_FILE, USER_CACHE_FILE, load_settings,
+                      save_credentials)
+from log_sink import LogSink, DRAIN_INTERVAL_MS
+from progress_view import ProgressView
+from run_progress import RunProgress
+from run_journal import RunJournal
+import token_cache
+
+
+# How often the API stats table is redrawn
+STATS_INTERVAL_MS = 1000
+# How often pair status changes are applied to the progress table
+PROGRESS_INTERVAL_MS = 250
+# Runs with at least this many pairs bring the Progress tab to the front
+PROGRESS_TAB_MIN_PAIRS = 100
+
+
+class ZoomAssistantManager:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Zoom Assistant Manager")
+        self.root.geometry("800x820")
+        
+        # Workers only enqueue log lines; the Tk main loop drains them in batches.
+        # The widget keeps the newest lines, the full log goes to logs/.
+        history_file = datetime.now().strftime("session-%Y%m%d-%H%M%S.log")
+        self.log_sink = LogSink(os.path.join(LOG_DIR, history_file))
+        
+        # Set up by load_backend() once the window is showing; until then the
+        # buttons that need them stay disabled
+        self.settings = None
+        self.client_id = ""
+        self.client_secret = ""
+        self.events = None
+        self.engine = None
+        self.client = None
+        self.user_cache = None
+        self.token_manager = None
+        self.authenticated_email = None
+        # Only one run at a time: runs share the priority gate and the progress view
+        self.run_active = False
+        
+        self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.start_backend()
+        
+    def start_backend(self):
+        """Load the backend on a worker thread, with Configure disabled until it is done"""
+        self.configure_button.config(state="disabled")
+        self.auth_status_label.config(text="Loading...", foreground="gray")
+        # Importing the API stack and reading config.py and the token cache
+        # happen off the UI thread, so the window appears right away
+        threading.Thread(target=self.load_backend, daemon=True).start()
+        
+    def load_backend(self):
+        """Read config.py, build the engine and load the cached token, then enable the UI
+
+        If any step fails, backend_failed() reports it on the UI thread.
+        """
+        try:
+            self.build_backend()
+        except Exception as e:
+            # Undo a partial load, so trying again starts clean
+            if self.token_manager is not None:
+                self.token_manager.stop()
+            if self.events is not None:
+                self.events.close()
+                self.events = None
+            self.root.after(0, self.backend_failed, e)
+            return
+        self.root.after(0, self.backend_ready)
+        
+    def build_backend(self):
+        """The steps of load_backend(); raises if one of them fails"""
+        from assistant_engine import create_engine
+        from event_log import EventLog
+        from token_manager import TokenManager
+        
+        self.load_config()
+        self.log_sink.max_lines = self.settings.log_max_lines
+        
+        # Structured records of lookups, writes, retries and auth for each run,
+        # written to events/ by a background thread
+        if self.settings.event_log:
+            self.events = EventLog(EVENT_LOG_DIR, self.settings.event_log_max_bytes,
+                                   self.settings.event_log_backups)
+        
+        # Worker pool engine for lookups and assistant writes. Every call goes
+        # through one shared, pooled Zoom API client; resolved user IDs are
+        # cached next to the token cache.
+        try:
+            engine = create_engine(self.settings, self.log_message, USER_CACHE_FILE, self.events)
+        except RuntimeError as e:
+            print(f"{e}; using the threads engine")
+            self.settings.engine = "threads"
+            engine = create_engine(self.settings, self.log_message, USER_CACHE_FILE, self.events)
+        self.client = engine.client
+        self.user_cache = engine.user_cache
+        
+        # Refreshes the access token in the background and after a 401, sharing
+        # the token cache with headless runs started alongside the GUI
+        self.token_manager = TokenManager(self.client, self.client_id, self.client_secret,
+                                          self.log_message, on_refresh=self.token_refreshed,
+                                          events=self.events, cache_path=TOKEN_CACHE_FILE)
+        
+        # Load cached token if available
+        self.load_cached_token()
+        
+        # Published last: the UI treats a set engine as "ready"
+        self.engine = engine
+        
+    def backend_failed(self, error):
+        """Show why the backend could not load; Configure stays usable to fix it and try again"""
+        self.log_message(f"Could not start: {str(error)}")
+        self.auth_status_label.config(text="Setup failed (see log)", foreground="red")
+        self.configure_button.config(state="normal")
+        
+    def backend_ready(self):
+        """Enable the controls that need the engine and show the cached login"""
+        from assistant_engine import ENGINES
+        
+        self.engine_var.set(self.settings.engine)
+        self.engine_combo.config(values=ENGINES, state="readonly")
+        self.auth_button.config(state="normal")
+        self.configure_button.config(state="normal")
+        self.update_auth_status()
+        
+    def close(self):
+        """Write out the event and session logs, then close the window"""
+        if self.token_manager is not None:
+            self.token_manager.stop()
+        if self.events is not None:
+            self.events.close()
+        self.log_sink.close()
+        self.root.destroy()
+        
+    def emit(self, event, **fields):
+        """Record a structured event when the event log is enabled"""
+        if self.events is not None:
+            self.events.emit(event, **fields)
+            
+    def begin_run(self, kind, **fields):
+        """Start a new run ID in the event log for the operation that follows
+
+        A pause or cancel left over from the previous run is cleared.
+        """
+        self.client.scheduler.gate.reset()
+        if self.events is not None:
+            self.events.begin_run(kind, engine=self.settings.engine, **fields)
+        
+    def load_config(self):
+        """Load configuration from config.py if it exists"""
+        self.settings = load_settings()
+        self.client_id = self.settings.client_id
+        self.client_secret = self.settings.client_secret
+            
+    def load_cached_token(self):
+        """Load cached access token if available and not expired"""
+        token_data = token_cache.load_token()
+        if token_data:
+            # An expired token with a refresh token is refreshed right away in the background
+            self.token_manager.set_tokens(token_data.get('access_token'), token_data.get('refresh_token'),
+                                          token_data.get('expires_at'))
+            self.authenticated_email = token_data.get('email')
+            self.emit("auth", action="token_loaded", email=self.authenticated_email)
+            
+    def save_cached_token(self):
+        """Save access token to cache file"""
+        token_cache.save_token({
+            'access_token': self.access_token,
+            'refresh_token': self.token_manager.refresh_token,
+            'expires_at': self.token_expires_at,
+            'email': self.authenticated_email
+        })
+            
+    def clear_cached_token(self):
+        """Clear cached token file"""
+        token_cache.clear_token()
+        
+    def token_refreshed(self, token_data):
+        """Show a refreshed token's new expiry; the token manager has already saved it"""
+        self.root.after(0, self.update_auth_status)
+            
+    @property
+    def token_expires_at(self):
+        return self.token_manager.expires_at
+    
+    @token_expires_at.setter
+    def token_expires_at(self, value):
+        self.token_manager.expires_at = value
+            
+    @property
+    def access_token(self):
+        """Access token used by the shared API client"""
+        return self.client.access_token
+        
+    @access_token.setter
+    def access_token(self, value):
+        self.client.access_token = value
+        
+    def create_widgets(self):
+        # Main frame
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Configure grid weights
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        
+        # Authentication section
+        auth_frame = ttk.LabelFrame(main_frame, text="Authentication", padding="5")
+        auth_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        auth_frame.columnconfigure(2, weight=1)
+        
+        self.auth_button = ttk.Button(auth_frame, text="Authenticate", command=self.authenticate, state="disabled")
+        self.auth_button.grid(row=0, column=0, padx=(0, 10))
+        
+        self.configure_button = ttk.Button(auth_frame, text="Configure", command=self.show_config_modal,
+                                           state="disabled")
+        self.configure_button.grid(row=0, column=1, padx=(0, 10))
+        
+        self.auth_status_label = ttk.Label(auth_frame, text="Loading...", foreground="gray")
+        self.auth_status_label.grid(row=0, column=2, sticky=(tk.W,))
+        
+        # User input section
+        input_frame = ttk.LabelFrame(main_frame, text="User Management", padding="5")
+        input_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        input_frame.columnconfigure(1, weight=1)
+        
+        ttk.Label(input_frame, text="Target User Email:").grid(row=0, column=0, sticky=(tk.W,), padx=(0, 5))
+        self.target_user_entry = ttk.Entry(input_frame, width=40)
+        self.target_user_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=2)
+        
+        ttk.Label(input_frame, text="Assistant Emails (one per line):").grid(row=1, column=0, sticky=(tk.W, tk.N), padx=(0, 5))
+        self.assistants_text = scrolledtext.ScrolledText(input_frame, width=40, height=6)
+        self.assistants_text.grid(row=1, column=1, sticky=(tk.W, tk.E), pady=2)
+        
+        # Fill the list from a text or CSV file (an email column is picked from the header)
+        ttk.Button(input_frame, text="Load File...", command=self.load_emails).grid(row=1, column=0, sticky=(tk.W, tk.S), pady=2)
+        
+        # Buttons frame
+        buttons_frame = ttk.Frame(input_frame)
+        buttons_frame.grid(row=2, column=1, sticky=(tk.E,), pady=(10, 0))
+        
+        # Engine selector
+        ttk.Label(buttons_frame, text="Engine:").grid(row=0, column=0, padx=(0, 5))
+        self.engine_var = tk.StringVar()
+        self.engine_combo = ttk.Combobox(buttons_frame, textvariable=self.engine_var, state="disabled", width=8)
+        self.engine_combo.grid(row=0, column=1, padx=(0, 10))
+        self.engine_combo.bind("<<ComboboxSelected>>", self.change_engine)
+        
+        # Dry run checkbox: report planned writes without making them
+        self.dry_run_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(buttons_frame, text="Dry run", variable=self.dry_run_var).grid(row=0, column=2, padx=(0, 10))
+        
+        # Assistants button
+        self.assistants_button = ttk.Button(buttons_frame, text="Assistants", command=self.show_assistants, state="disabled")
+        self.assistants_button.grid(row=0, column=3, padx=(0, 5))
+        
+        # Proceed button
+        self.proceed_button = ttk.Button(buttons_frame, text="Proceed", command=self.process_assistants, state="disabled")
+        self.proceed_button.grid(row=0, column=4, padx=(0, 5))
+        
+        # Mesh button: make every listed user an assistant of every other
+        self.mesh_button = ttk.Button(buttons_frame, text="Mesh", command=self.process_mesh, state="disabled")
+        self.mesh_button.grid(row=0, column=5, padx=(0, 5))
+        
+        # Resume button: finish the pending pairs of an interrupted run
+        self.resume_button = ttk.Button(buttons_frame, text="Resume", command=self.resume_run, state="disabled")
+        self.resume_button.grid(row=0, column=6)
+        
+        # Report button: export the assistants of the target and every listed user
+        self.report_button = ttk.Button(buttons_frame, text="Report...", command=self.report_assistants, state="disabled")
+        self.report_button.grid(row=1, column=5, padx=(0, 5), pady=(5, 0))
+        
+        # Sync button: make owners' assistants match a desired-state file
+        self.sync_button = ttk.Button(buttons_frame, text="Sync...", command=self.sync_file, state="disabled")
+        self.sync_button.grid(row=1, column=6, pady=(5, 0))
+        
+        # Pause and Cancel: hold or stop the running operation between requests
+        self.pause_button = ttk.Button(buttons_frame, text="Pause", command=self.toggle_pause, state="disabled")
+        self.pause_button.grid(row=1, column=3, padx=(0, 5), pady=(5, 0))
+        
+        self.cancel_button = ttk.Button(buttons_frame, text="Cancel", command=self.cancel_run, state="disabled")
+        self.cancel_button.grid(row=1, column=4, padx=(0, 5), pady=(5, 0))
+        
+        # Log and per-pair progress, one tab each
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
+        main_frame.rowconfigure(2, weight=1)
+        
+        log_frame = ttk.Frame(self.notebook, padding="5")
+        self.notebook.add(log_frame, text="Process Log")
+        log_frame.columnconfigure(0, weight=1)
+        log_frame.rowconfigure(0, weight=1)
+        
+        self.log_text = scrolledtext.ScrolledText(log_frame, width=70, height=15)
+        self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Clear log button
+        ttk.Button(log_frame, text="Clear Log", command=self.clear_log).grid(row=1, column=0, sticky=(tk.E,), pady=(5, 0))
+        
+        # Progress tab: one row per planned pair, redrawn only where visible
+        self.progress_view = ProgressView(self.notebook, padding="5")
+        self.notebook.add(self.progress_view, text="Progress")
+        # Set by worker threads when a run starts; picked up by refresh_progress
+        self.run_progress = None
+        
+        # API stats section: per-endpoint latency, status and retry counters
+        stats_frame = ttk.LabelFrame(main_frame, text="API Stats", padding="5")
+        stats_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E))
+        stats_frame.columnconfigure(0, weight=1)
+        
+        columns = ("calls", "p50", "p95", "p99", "errors", "retries", "saved", "wait", "kb")
+        self.stats_tree = ttk.Treeview(stats_frame, columns=columns, height=4)
+        self.stats_tree.heading("#0", text="Endpoint")
+        self.stats_tree.column("#0", width=220)
+        for column, title in zip(columns, ("Calls", "p50 ms", "p95 ms", "p99 ms", "Errors", "Retries",
+                                           "Saved", "Wait ms", "KB")):
+            self.stats_tree.heading(column, text=title)
+            self.stats_tree.column(column, width=60, anchor=tk.E)
+        self.stats_tree.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        
+        # Requests waiting per priority class and how long they waited
+        self.queue_label = ttk.Label(stats_frame, text="", wraplength=560)
+        self.queue_label.grid(row=2, column=0, sticky=(tk.W,), pady=(5, 0))
+        
+        ttk.Button(stats_frame, text="Export Stats", command=self.export_stats).grid(row=1, column=0, sticky=(tk.E,), pady=(5, 0))
+        
+        self.root.after(DRAIN_INTERVAL_MS, self.drain_log)
+        self.root.after(STATS_INTERVAL_MS, self.refresh_stats)
+        self.root.after(PROGRESS_INTERVAL_MS, self.refresh_progress)
+        
+    def log_message(self, message):
+        """Add a timestamped message to the log; safe to call from any thread"""
+        self.log_sink.write(message)
+        
+    def drain_log(self):
+        """Move queued log lines into the widget in one batch, keeping it bounded"""
+        try:
+            lines, dropped = self.log_sink.drain()
+            if lines:
+                if dropped:
+                    lines.insert(0, f"... {dropped} earlier lines in {self.log_sink.history_path}")
+                self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+                
+                # Trim the oldest lines beyond the limit
+                line_count = int(self.log_text.index("end-1c").split(".")[0]) - 1
+                excess = line_count - self.log_sink.max_lines
+                if excess > 0:
+                    self.log_text.delete("1.0", f"{excess + 1}.0")
+                self.log_text.see(tk.END)
+        finally:
+            self.root.after(DRAIN_INTERVAL_MS, self.drain_log)
+        
+    def change_engine(self, event=None):
+        """Switch between the threaded and asyncio request engines"""
+        from assistant_engine import build_engine
+        
+        kind = self.engine_var.get()
+        if kind == self.settings.engine:
+            return
+        previous = self.settings.engine
+        self.settings.engine = kind
+        try:
+            engine = build_engine(self.settings, self.client, self.user_cache, self.log_message)
+        except RuntimeError as e:
+            self.settings.engine = previous
+            self.engine_var.set(previous)
+            messagebox.showerror("Error", str(e))
+            return
+        self.engine.detach()
+        self.engine = engine
+        self.log_message(f"Using {kind} engine")
+        
+    def refresh_stats(self):
+        """Redraw the API stats table from the current metrics"""
+        try:
+            if self.engine is None:
+                return
+            self.stats_tree.delete(*self.stats_tree.get_children())
+            for endpoint, stats in self.client.scheduler.metrics.snapshot().items():
+                errors = sum(count for status, count in stats['statuses'].items() if not status.startswith("2"))
+                latency = stats['latency']
+                self.stats_tree.insert("", tk.END, text=endpoint, values=(
+                    stats['count'],
+                    f"{latency['p50'] * 1000:.0f}", f"{latency['p95'] * 1000:.0f}", f"{latency['p99'] * 1000:.0f}",
+                    errors, stats['retries'], stats['coalesced'],
+                    f"{stats['queue_wait_avg'] * 1000:.0f}",
+                    f"{(stats['bytes_sent'] + stats['bytes_received']) / 1024:.0f}",
+                ))
+            gate = self.client.scheduler.gate
+            queues = " · ".join(f"{priority}: {queue['queued']} queued, wait avg {queue['wait_avg'] * 1000:.0f} ms"
+                                f" / max {queue['wait_max'] * 1000:.0f} ms"
+                                for priority, queue in gate.stats().items())
+            self.queue_label.config(text=f"{queues}{' (paused)' if gate.paused else ''}")
+        finally:
+            self.root.after(STATS_INTERVAL_MS, self.refresh_stats)
+            
+    def refresh_progress(self):
+        """Apply the current run's pair updates to the progress table in one batch"""
+        try:
+            progress = self.run_progress
+            if progress is not None and progress is not self.progress_view.progress \
+                    and len(progress) >= PROGRESS_TAB_MIN_PAIRS:
+                self.notebook.select(self.progress_view)
+            self.progress_view.refresh(progress)
+        finally:
+            self.root.after(PROGRESS_INTERVAL_MS, self.refresh_progress)
+            
+    def export_stats(self):
+        """Save the API metrics as JSON or Prometheus text"""
+        if self.engine is None:
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self.root, initialdir=LOG_DIR, defaultextension=".json",
+            initialfile=datetime.now().strftime("metrics-%Y%m%d-%H%M%S.json"),
+            filetypes=[("JSON", "*.json"), ("Prometheus text", "*.prom")])
+        if not path:
+            return
+        try:
+            self.client.scheduler.metrics.dump(path)
+            self.log_message(f"API stats written to {path}")
+        except Exception as e:
+            self.log_message(f"Error writing API stats: {str(e)}")
+            
+    def clear_log(self):
+        """Clear the log text area"""
+        self.log_text.delete(1.0, tk.END)
+        
+    def show_config_modal(self):
+        """Show configuration modal for CLIENT_ID and CLIENT_SECRET"""
+        # Create modal window
+        config_window = tk.Toplevel(self.root)
+        config_window.title("Configuration")
+        config_window.geometry("400x200")
+        config_window.transient(self.root)
+        config_window.grab_set()
+        
+        # Center the window
+        config_window.update_idletasks()
+        x = (config_window.winfo_screenwidth() // 2) - (400 // 2)
+        y = (config_window.winfo_screenheight() // 2) - (200 // 2)
+        config_window.geometry(f"400x200+{x}+{y}")
+        
+        # Main frame
+        main_frame = ttk.Frame(config_window, padding="20")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        config_window.columnconfigure(0, weight=1)
+        config_window.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        
+        # CLIENT_ID field
+        ttk.Label(main_frame, text="Client ID:").grid(row=0, column=0, sticky=(tk.W,), padx=(0, 10), pady=(0, 10))
+        client_id_entry = ttk.Entry(main_frame, width=30)
+        client_id_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=(0, 10))
+        client_id_entry.insert(0, self.client_id)
+        
+        # CLIENT_SECRET field
+        ttk.Label(main_frame, text="Client Secret:").grid(row=1, column=0, sticky=(tk.W,), padx=(0, 10), pady=(0, 20))
+        client_secret_entry = ttk.Entry(main_frame, width=30, show="*")
+        client_secret_entry.grid(row=1, column=1, sticky=(tk.W, tk.E), pady=(0, 20))
+        client_secret_entry.insert(0, self.client_secret)
+        
+        # Buttons frame
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.grid(row=2, column=0, columnspan=2, pady=(10, 0))
+        
+        def save_config():
+            """Save configuration and close modal"""
+            new_client_id = client_id_entry.get().strip()
+            new_client_secret = client_secret_entry.get().strip()
+            
+            if not new_client_id or not new_client_secret:
+                messagebox.showerror("Error", "Both Client ID and Client Secret are required")
+                return
+            
+            if self.save_config_to_file(new_client_id, new_client_secret):
+                self.client_id = new_client_id
+                self.client_secret = new_client_secret
+                self.log_message("Configuration saved successfully")
+                config_window.destroy()
+                if self.engine is None:
+                    # The backend failed to load; try again with the new settings
+                    self.start_backend()
+                    return
+                self.token_manager.client_id = new_client_id
+                self.token_manager.client_secret = new_client_secret
+            else:
+                messagebox.showerror("Error", "Failed to save configuration")
+        
+        def cancel_config():
+            """Close modal without saving"""
+            config_window.destroy()
+        
+        # Save button
+        ttk.Button(buttons_frame, text="Save", command=save_config).grid(row=0, column=0, padx=(0, 10))
+        
+        # Cancel button
+        ttk.Button(buttons_frame, text="Cancel", command=cancel_config).grid(row=0, column=1)
+        
+        # Focus on first field
+        client_id_entry.focus()
+        
+    def save_config_to_file(self, client_id, client_secret):
+        """Save CLIENT_ID and CLIENT_SECRET to config.py, keeping its other settings"""
+        try:
+            save_credentials(client_id, client_secret)
+            return True
+        except Exception as e:
+            print(f"Error saving config: {e}")
+            return False
+        
+    def authenticate(self):
+        """Start the OAuth device flow authentication"""        
+        if not self.client_id or not self.client_secret:
+            messagebox.showerror("Error", "Please configure Client ID and Client Secret using the Configure button")
+            return
+            
+        self.log_message("Starting OAuth device flow authentication...")
+        threading.Thread(target=self.device_flow_auth, daemon=True).start()
+        
+    def device_flow_auth(self):
+        """Perform OAuth device flow authentication"""
+        import webbrowser
+        
+        try:
+            # Step 1: Get device code
+            self.log_message("Requesting device code...")
+            response = self.client.request_device_code(self.client_id, self.client_secret)
+            
+            if response.status_code != 200:
+                self.log_message(f"Error getting device code: {response.text}")
+                return
+                
+            device_info = response.json()
+            device_code = device_info["device_code"]
+            user_code = device_info["user_code"]
+            verification_uri = device_info["verification_uri"]
+            interval = device_info.get("interval", 5)
+            
+            self.log_message(f"Device code obtained. User code: {user_code}")
+            self.log_message(f"Opening browser to: {verification_uri}")
+            
+            # Open browser for user to enter code
+            webbrowser.open(verification_uri)
+            
+            # Step 2: Poll for access token
+            token_data = {
+                "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
+                "device_code": device_code,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret
+            }
+            
+            self.log_message("Waiting for user authorization...")
+            
+            # Poll for token
+            max_attempts = 60  # 5 minutes max
+            for attempt in range(max_attempts):
+                time.sleep(interval)
+                
+                token_response = self.client.request_token(token_data)
+                token_result = token_response.json()
+                
+                if token_response.status_code == 200:
+                    # Calculate token expiration time
+                    expires_in = token_result.get("expires_in", 3600)  # Default 1 hour
+                    # Keep the refresh token so long runs survive expiry
+                    self.token_manager.set_tokens(token_result["access_token"], token_result.get("refresh_token"),
+                                                  time.time() + expires_in)
+                    
+                    self.log_message("Authentication successful!")
+                    self.emit("auth", action="device_flow")
+                    
+                    # Get user info
+                    self.get_user_info()
+                    
+                    # Save token to cache
+                    self.save_cached_token()
+                    break
+                elif token_result.get("error") == "authorization_pending":
+                    self.log_message(f"Waiting for authorization... (attempt {attempt + 1}/{max_attempts})")
+                elif token_result.get("error") == "slow_down":
+                    interval += 5
+                    self.log_message("Slowing down polling...")
+                else:
+                    self.log_message(f"Authentication failed: {token_result.get('error_description', 'Unknown error')}")
+                    self.emit("auth", action="device_flow_failed", error=token_result.get('error'))
+                    break
+            else:
+                self.log_message("Authentication timed out")
+                self.emit("auth", action="device_flow_failed", error="timeout")
+                
+        except Exception as e:
+            self.log_message(f"Authentication error: {str(e)}")
+            self.emit("auth", action="device_flow_failed", error=str(e))
+            
+    def get_user_info(self):
+        """Get authenticated user information"""
+        from rate_limiter import INTERACTIVE, request_priority
+        from zoom_client import ZoomAPIError
+        
+        try:
+            with request_priority(INTERACTIVE):
+                user_info = self.client.get_me()
+            self.authenticated_email = user_info.get("email", "Unknown")
+            
+            # Update UI on main thread
+            self.root.after(0, self.update_auth_status)
+            self.log_message(f"Authenticated as: {self.authenticated_email}")
+        except ZoomAPIError as e:
+            self.log_message(f"Failed to get user info: {e.text}")
+        except Exception as e:
+            self.log_message(f"Error getting user info: {str(e)}")
+            
+    def update_auth_status(self):
+        """Update authentication status in UI"""
+        if self.authenticated_email and self.token_expires_at:
+            # Format expiration time
+            expires_datetime = datetime.fromtimestamp(self.token_expires_at)
+            expires_str = expires_datetime.strftime("%Y-%m-%d %H:%M:%S")
+            
+            # Check if token is about to expire (within 30 minutes)
+            time_remaining = self.token_expires_at - time.time()
+            if time_remaining < 1800:  # 30 minutes
+                status_text = f"Authenticated as: {self.authenticated_email} (expires: {expires_str}) ⚠️"
+                color = "orange"
+            else:
+                status_text = f"Authenticated as: {self.authenticated_email} (expires: {expires_str})"
+                color = "green"
+                
+            self.auth_status_label.config(text=status_text, foreground=color)
+            self.assistants_button.config(state="normal")
+        elif self.authenticated_email:
+            self.auth_status_label.config(text=f"Authenticated as: {self.authenticated_email}", foreground="green")
+            self.assistants_button.config(state="normal")
+        else:
+            self.auth_status_label.config(text="Not authenticated", foreground="red")
+            self.assistants_button.config(state="disabled")
+        self.update_run_buttons()
+            
+    def is_token_valid(self):
+        """Check if the current token is valid and not expired
+
+        An expired token that can be refreshed counts as valid: it is
+        refreshed on a background thread, so the window never waits on the
+        OAuth server or another process's refresh. Requests that still get a
+        401 wait for that refresh before retrying.
+        """
+        if not self.access_token:
+            return False
+        if self.token_expires_at and time.time() >= self.token_expires_at:
+            if self.token_manager.refresh_token:
+                threading.Thread(target=self.refresh_expired_token, args=(self.access_token,), daemon=True).start()
+                return True
+            self.token_expired()
+            return False
+        return True
+        
+    def refresh_expired_token(self, stale_token):
+        """Refresh an expired token; signs out on the main thread if that fails"""
+        if not self.token_manager.refresh(stale_token):
+            self.root.after(0, self.token_expired)
+            
+    def token_expired(self):
+        """Forget a token that can no longer be used"""
+        self.log_message("Token has expired, please re-authenticate")
+        self.clear_cached_token()
+        self.token_manager.clear()
+        self.authenticated_email = None
+        self.update_auth_status()
+            
+    def show_assistants(self):
+        """Show all assistants of the target user"""
+        if not self.is_token_valid():
+            messagebox.showerror("Error", "Please authenticate first")
+            return
+            
+        target_email = self.target_user_entry.get().strip()
+        if not target_email:
+            messagebox.showerror("Error", "Please enter target user email")
+            return
+            
+        self.log_message(f"Fetching assistants for: {target_email}")
+        
+        # Run in separate thread to avoid blocking UI
+        threading.Thread(target=self.fetch_assistants, args=(target_email,), daemon=True).start()
+        
+    def fetch_assistants(self, target_email):
+        """Fetch and display assistants for the target user, ahead of any running bulk requests"""
+        from rate_limiter import INTERACTIVE, request_priority
+        from zoom_client import ZoomAPIError
+        
+        try:
+            with request_priority(INTERACTIVE):
+                # Get target user ID
+                target_user_id = self.get_user_id_by_email(target_email)
+                if not target_user_id:
+                    self.log_message(f"Failed to get user ID for {target_email}")
+                    return
+                    
+                # Get assistants for the user
+                assistants = self.client.list_assistants(target_user_id)
+            
+            if assistants:
+                self.log_message(f"Assistants for {target_email}:")
+                for i, assistant in enumerate(assistants, 1):
+                    email = assistant.get("email", "N/A")
+                    self.log_message(f"  {i}. {email}")
+            else:
+                self.log_message(f"No assistants found for {target_email}")
+                
+        except ZoomAPIError as e:
+            self.log_message(f"Failed to get assistants for {target_email}: {e.status_code} - {e.text}")
+        except Exception as e:
+            self.log_message(f"Error fetching assistants: {str(e)}")
+        finally:
+            self.user_cache.flush()
+            
+    def load_emails(self):
+        """Replace the assistant list with the normalized emails of a file"""
+        path = filedialog.askopenfilename(
+            title="Load assistant emails",
+            filetypes=[("Email lists", "*.txt *.csv"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        report = InputReport()
+        target_email = normalize_email(self.target_user_entry.get())
+        try:
+            emails = list(normalize_emails(read_entries(path), [target_email] if target_email else [], report))
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not read {os.path.basename(path)}: {str(e)}")
+            return
+        self.assistants_text.delete(1.0, tk.END)
+        self.assistants_text.insert(1.0, "\n".join(emails))
+        self.log_message(f"Loaded {os.path.basename(path)}: {report.summary()}")
+        
+    def read_email_list(self, exclude=()):
+        """Normalized emails from the assistant list, logging anything filtered out"""
+        report = InputReport()
+        lines = self.assistants_text.get(1.0, tk.END).splitlines()
+        emails = list(normalize_emails(split_entries(lines), exclude, report))
+        if report.filtered:
+            self.log_message(f"Assistant list: {report.summary()}")
+        return emails
+        
+    def process_assistants(self):
+        """Process adding assistants to users"""
+        if not self.is_token_valid():
+            messagebox.showerror("Error", "Please authenticate first")
+            return
+            
+        target_email = normalize_email(self.target_user_entry.get())
+        assistants_text = self.assistants_text.get(1.0, tk.END).strip()
+        
+        if not target_email or not assistants_text:
+            messagebox.showerror("Error", "Please enter both target user email and assistant emails")
+            return
+            
+        if not is_valid_email(target_email):
+            messagebox.showerror("Error", f"Invalid target user email: {target_email}")
+            return
+            
+        # Malformed, duplicate and self entries are dropped before any request is made
+        assistant_emails = self.read_email_list([target_email])
+        
+        if not assistant_emails:
+            messagebox.showerror("Error", "Please enter at least one valid assistant email")
+            return
+            
+        self.log_message(f"Starting process for target user: {target_email}")
+        self.log_message(f"Assistant emails: {', '.join(assistant_emails)}")
+        dry_run = self.dry_run_var.get()
+        if dry_run:
+            self.log_message("Dry run: no changes will be made")
+        
+        # Run in separate thread to avoid blocking UI
+        self.start_run(self.execute_assistant_management, target_email, assistant_emails, dry_run)
+        
+    def execute_assistant_management(self, target_email, assistant_emails, dry_run=False):
+        """Execute the assistant management process"""
+        from assistant_engine import summarize
+        
+        # Planned pairs and outcomes are journaled so an interrupted run can be resumed
+        journal = None if dry_run else RunJournal.create(JOURNAL_DIR)
+        progress = self.run_progress = RunProgress(journal)
+        self.begin_run("run", target=target_email, assistants=len(assistant_emails), dry_run=dry_run)
+        try:
+            progress.plan(target_email, assistant_emails)
+            # Lookups, Step 1 and Step 2 run concurrently; the log keeps sequential order.
+            # Pairs that already exist are skipped.
+            results = self.engine.run(target_email, assistant_emails, dry_run, progress)
+            if results is None:
+                return
+                
+            self.log_message(f"Process completed! {summarize(results)}")
+            
+        except Exception as e:
+            self.log_message(f"Process error: {str(e)}")
+        finally:
+            progress.finish()
+            self.finish_run(journal)
+            
+    def process_mesh(self):
+        """Make the target user and every listed user assistants of each other"""
+        if not self.is_token_valid():
+            messagebox.showerror("Error", "Please authenticate first")
+            return
+            
+        target_email = normalize_email(self.target_user_entry.get())
+        if target_email and not is_valid_email(target_email):
+            messagebox.showerror("Error", f"Invalid target user email: {target_email}")
+            return
+        member_emails = self.read_email_list()
+        if target_email:
+            member_emails = [target_email] + [email for email in member_emails if email != target_email]
+        
+        if len(member_emails) < 2:
+            messagebox.showerror("Error", "Please enter at least two member emails")
+            return
+            
+        self.log_message(f"Starting mesh for: {', '.join(member_emails)}")
+        dry_run = self.dry_run_var.get()
+        if dry_run:
+            self.log_message("Dry run: no changes will be made")
+        
+        self.start_run(self.execute_mesh, member_emails, dry_run)
+        
+    def execute_mesh(self, member_emails, dry_run=False):
+        """Run the mesh operation, journaled like a regular run"""
+        from assistant_engine import summarize
+        
+        journal = None if dry_run else RunJournal.create(JOURNAL_DIR)
+        progress = self.run_progress = RunProgress(journal)
+        self.begin_run("mesh", members=len(member_emails), dry_run=dry_run)
+        try:
+            for email in member_emails:
+                progress.plan(email, [other for other in member_emails if other != email])
+            results = self.engine.run_mesh(member_emails, dry_run, progress)
+            self.log_message(f"Process completed! {summarize(results)}")
+            
+        except Exception as e:
+            self.log_message(f"Process error: {str(e)}")
+        finally:
+            progress.finish()
+            self.finish_run(journal)
+            
+    def resume_run(self):
+        """Finish the pending and failed pairs of the newest interrupted run"""
+        if not self.is_token_valid():
+            messagebox.showerror("Error", "Please authenticate first")
+            return
+            
+        self.start_run(self.execute_resume)
+        
+    def execute_resume(self):
+        """Run only the pairs a journal still has pending"""
+        from assistant_engine import summarize
+        
+        journal = RunJournal.latest_pending(JOURNAL_DIR)
+        if journal is None:
+            self.log_message("No interrupted run to resume")
+            return
+            
+        self.log_message(f"Resuming {os.path.basename(journal.path)}: {journal.pending_count()} pairs pending")
+        results = []
+        pending = list(journal.pending())
+        progress = self.run_progress = RunProgress(journal)
+        self.begin_run("resume", journal=os.path.basename(journal.path))
+        try:
+            for target_email, assistant_emails in pending:
+                progress.plan(target_email, assistant_emails)
+            for target_email, assistant_emails in pending:
+                self.log_message(f"Starting process for target user: {target_email}")
+                results.extend(self.engine.run(target_email, assistant_emails, journal=progress) or [])
+                
+            self.log_message(f"Process completed! {summarize(results)}")
+            
+        except Exception as e:
+            self.log_message(f"Process error: {str(e)}")
+        finally:
+            progress.finish()
+            self.finish_run(journal)
+            
+    def report_assistants(self):
+        """Export the assistant lists of the target user and every listed user"""
+        if not self.is_token_valid():
+            messagebox.showerror("Error", "Please authenticate first")
+            return
+            
+        target_email = normalize_email(self.target_user_entry.get())
+        owners = ([target_email] if is_valid_email(target_email) else []) + self.read_email_list([target_email])
+        if not owners:
+            messagebox.showerror("Error", "Please enter the users to report on")
+            return
+            
+        path = filedialog.asksaveasfilename(
+            title="Save assistant report",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json"), ("JSON Lines", "*.jsonl")],
+        )
+        if not path:
+            return
+            
+        self.start_run(self.execute_report, owners, path)
+        
+    def execute_report(self, owners, path):
+        """Read every owner's assistants concurrently, streaming rows to the report file"""
+        from headless import InventoryWriter
+        
+        summary = None
+        self.begin_run("inventory", owners=len(owners))
+        try:
+            writer = InventoryWriter(path)
+            try:
+                summary = self.engine.inventory(owners, writer.write_rows)
+            finally:
+                writer.close({"summary": summary.as_dict()} if summary is not None else None)
+            self.log_message(f"Inventory: {summary}")
+            self.log_message(f"Report written to {path}")
+            
+        except Exception as e:
+            self.log_message(f"Report error: {str(e)}")
+        finally:
+            self.finish_run()
+            
+    def sync_file(self):
+        """Pick a desired-state file and sync every owner in it"""
+        if not self.is_token_valid():
+            messagebox.showerror("Error", "Please authenticate first")
+            return
+            
+        path = filedialog.askopenfilename(
+            title="Sync desired state",
+            filetypes=[("Desired state", "*.json *.csv *.jsonl"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        from headless import read_state
+        try:
+            state = read_state(path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not read {os.path.basename(path)}: {str(e)}")
+            return
+            
+        self.log_message(f"Starting sync from {os.path.basename(path)}")
+        dry_run = self.dry_run_var.get()
+        if dry_run:
+            self.log_message("Dry run: no changes will be made")
+        
+        self.start_run(self.execute_sync, state, dry_run)
+        
+    def execute_sync(self, state, dry_run=False):
+        """Add the missing and remove the unlisted assistants of every owner"""
+        from assistant_engine import summarize
+        
+        self.begin_run("sync", owners=len(state), dry_run=dry_run)
+        try:
+            results = self.engine.sync(state, dry_run)
+            self.log_message(f"Process completed! {summarize(results)}")
+            
+        except Exception as e:
+            self.log_message(f"Process error: {str(e)}")
+        finally:
+            self.finish_run()
+            
+    def start_run(self, target, *args):
+        """Run target(*args) on a worker thread as the active run
+
+        The buttons that start runs and the engine selector are disabled
+        until it returns; Pause and Cancel are enabled meanwhile.
+        """
+        self.run_active = True
+        self.update_run_buttons()
+        
+        def run():
+            try:
+                target(*args)
+            finally:
+                self.root.after(0, self.run_ended)
+                
+        threading.Thread(target=run, daemon=True).start()
+        
+    def run_ended(self):
+        self.run_active = False
+        self.update_run_buttons()
+        
+    def update_run_buttons(self):
+        """Enable the run buttons when signed in and idle, and Pause and Cancel during a run"""
+        idle = "normal" if self.authenticated_email and not self.run_active else "disabled"
+        for button in (self.proceed_button, self.mesh_button, self.resume_button, self.sync_button,
+                       self.report_button):
+            button.config(state=idle)
+        if self.engine is None:
+            return
+        self.engine_combo.config(state="disabled" if self.run_active else "readonly")
+        gate = self.client.scheduler.gate
+        running = "normal" if self.run_active and not gate.cancelled else "disabled"
+        self.pause_button.config(text="Continue" if gate.paused else "Pause", state=running)
+        self.cancel_button.config(state=running)
+        
+    def toggle_pause(self):
+        """Hold the run's remaining requests, or let them continue"""
+        gate = self.client.scheduler.gate
+        if gate.paused:
+            gate.resume()
+            self.update_run_buttons()
+            self.log_message("Run continued")
+            self.emit("control", action="continue")
+        else:
+            gate.pause()
+            self.update_run_buttons()
+            self.log_message("Run paused; requests already sent will finish")
+            self.emit("control", action="pause")
+            
+    def cancel_run(self):
+        """Stop the run before its next request; unfinished pairs stay pending in the journal"""
+        self.client.scheduler.gate.cancel()
+        self.update_run_buttons()
+        self.log_message("Cancelling run; requests already sent will finish")
+        self.emit("control", action="cancel")
+        
+    def finish_run(self, journal=None):
+        """Close the run's journal and log cache and rate-limit statistics"""
+        gate = self.client.scheduler.gate
+        if gate.cancelled:
+            self.log_message("Run cancelled")
+        gate.reset()
+        if self.events is not None:
+            self.events.end_run()
+        if journal is not None:
+            journal.close()
+            pending = journal.pending_count()
+            if pending:
+                self.log_message(f"{pending} pairs still pending; click Resume to retry them")
+        stats = self.user_cache.stats()
+        self.log_message(f"User ID cache: {stats['hits']} hits, {stats['misses']} misses")
+        stats = self.client.scheduler.stats()
+        if stats['throttled']:
+            self.log_message(f"Rate limited {stats['throttled']} times, {stats['retries']} retries")
+        saved = self.client.scheduler.metrics.total('coalesced')
+        if saved:
+            self.log_message(f"{saved} duplicate lookups shared an in-flight request")
+        self.user_cache.flush()
+            
+    def get_user_id_by_email(self, email):
+        """Get user ID by email address"""
+        user_id, error = self.engine.resolve_user_id(email)
+        if error:
+            self.log_message(error)
+        return user_id
+            
+    def add_assistant(self, user_id, assistant_email):
+        """Add an assistant to a user"""
+        self.client.add_assistants(user_id, [assistant_email])
+
+
+def main():
+    root = tk.Tk()
+    app = ZoomAssistantManager(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()